@@ -0,0 +1,316 @@
+"""
+Benchmark the generator over synthetic django projects.
+
+Each project is generated in a temporary directory and benchmarked in its own process (django can only be set up once
+per process). The timings of each phase are printed and recorded as JSON, e.g.,
+
+    python benchmarks/bench_generator.py --models 10,100,1000 --output results.json
+    python benchmarks/bench_generator.py --compare results.json
+
+The serializer_fields phase instantiates the generated serializers and builds their fields (as DRF does for each
+request), e.g., to compare fields = '__all__' with --features explicit_fields.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, SRC_PATH)
+
+APP_NAME = "benchapp"
+PROJECT_NAME = "benchproj"
+FEATURES = ["sparse", "conditional", "cache", "bulk", "explicit_fields"]
+
+SETTINGS = f'''
+SECRET_KEY = "benchmark"
+INSTALLED_APPS = [
+    "django.contrib.contenttypes",
+    "django.contrib.auth",
+    "{APP_NAME}",
+]
+DATABASES = {{"default": {{"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}}}
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+USE_TZ = True
+'''
+
+
+def get_models_source(n_models, relation_density, seed=0):
+    """
+    Get the source of a models.py with the given number of models
+    :param n_models:
+    :param relation_density: the probability of a model to have a relation to each of the previous 3 models
+    :param seed: the random seed (the same seed gives the same models)
+    :return: str
+    """
+    rnd = random.Random(seed)
+    lines = ["from django.db import models\n\n"]
+    for i in range(n_models):
+        lines.append(f"\nclass Model{i}(models.Model):\n")
+        lines.append("    name = models.CharField(max_length=100, db_index=True)\n")
+        lines.append("    description = models.TextField(blank=True)\n")
+        lines.append("    price = models.DecimalField(max_digits=10, decimal_places=2, default=0)\n")
+        lines.append("    created = models.DateTimeField(auto_now_add=True)\n")
+        lines.append("    updated = models.DateTimeField(auto_now=True)\n")
+        for j in range(max(0, i - 3), i):
+            if rnd.random() >= relation_density:
+                continue
+            if rnd.random() < 0.25:
+                lines.append(f"    rel{j} = models.ManyToManyField(Model{j}, blank=True, related_name='m2m{i}')\n")
+            else:
+                lines.append(f"    rel{j} = models.ForeignKey(Model{j}, null=True, on_delete=models.SET_NULL, "
+                             f"related_name='fk{i}')\n")
+        lines.append("\n")
+    return "".join(lines)
+
+
+def make_dirs(path, depth, breadth, files):
+    """
+    Create a tree of directories with empty python files
+    :param path:
+    :param depth: the depth of the tree
+    :param breadth: the number of sub directories of each directory
+    :param files: the number of files in each directory
+    :return:
+    """
+    os.makedirs(path, exist_ok=True)
+    for i in range(files):
+        with open(os.path.join(path, f"module{i}.py"), "w") as f:
+            f.write("")
+    if depth > 0:
+        for i in range(breadth):
+            make_dirs(os.path.join(path, f"dir{i}"), depth - 1, breadth, files)
+
+
+def make_project(root, n_models, relation_density=0.5, depth=3, seed=0):
+    """
+    Create a synthetic django project with a single app
+    :param root: the project directory
+    :param n_models:
+    :param relation_density: see get_models_source
+    :param depth: the depth of the other directories of the project (e.g., libraries, docs and node_modules)
+    :param seed:
+    :return: (app path, settings path)
+    """
+    project_path = os.path.join(root, PROJECT_NAME)
+    app_path = os.path.join(root, APP_NAME)
+    os.makedirs(project_path)
+    os.makedirs(app_path)
+    for path in [project_path, app_path]:
+        with open(os.path.join(path, "__init__.py"), "w") as f:
+            f.write("")
+    settings_path = os.path.join(project_path, "settings.py")
+    with open(settings_path, "w") as f:
+        f.write(SETTINGS)
+    with open(os.path.join(app_path, "models.py"), "w") as f:
+        f.write(get_models_source(n_models, relation_density, seed=seed))
+    make_dirs(os.path.join(root, "lib"), depth, breadth=3, files=3)
+    make_dirs(os.path.join(root, "docs"), depth, breadth=2, files=2)
+    make_dirs(os.path.join(root, "node_modules"), depth, breadth=4, files=5)
+    return app_path, settings_path
+
+
+def timed(timings, name, func, *args, **kwargs):
+    """
+    Run the function (silencing its output) and record its duration in seconds
+    :param timings: dict of the durations per phase
+    :param name: the phase
+    :param func:
+    :return: the result of the function
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        duration = time.perf_counter() - start
+    timings.setdefault(name, []).append(duration)
+    return result
+
+
+def load_module(name, fpath):
+    """
+    Load the generated code of a file as a module
+    :param name: the module name
+    :param fpath:
+    :return: module
+    """
+    spec = importlib.util.spec_from_file_location(name, fpath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_serializers_fields(serializer_classes):
+    """
+    Instantiate each serializer and build its fields
+    :param serializer_classes:
+    :return: the number of fields of each serializer
+    """
+    return [len(serializer_class().fields) for serializer_class in serializer_classes]
+
+
+def run_phases(root, repeat=3, features=None):
+    """
+    Time each phase of the generator over the project (in the current process)
+    :param root: the project directory created by make_project
+    :param repeat: the number of times the cheap phases are repeated
+    :param features: the generation options to enable (see FEATURES)
+    :return: dict of the durations per phase
+    """
+    from django_rest_gen import apigen
+    options = {f: True for f in features or []}
+    explicit_fields = options.pop("explicit_fields", False)
+    timings = dict()
+    for _ in range(repeat):
+        timed(timings, "guess_app_path", apigen.guess_app_path, curr_path=root, use_cache=False)
+        timed(timings, "guess_settings_path", apigen.guess_settings_path, curr_path=root, use_cache=False)
+    app_path = os.path.join(root, APP_NAME)
+    settings_path = os.path.join(root, PROJECT_NAME, "settings.py")
+    models_obj = timed(timings, "load_models", apigen.load_models, python_path=root,
+                       models_fpath=os.path.join(app_path, "models.py"), settings_fpath=settings_path)
+    out_path = os.path.join(root, "out")
+    os.makedirs(out_path)
+    for _ in range(repeat):
+        classes = timed(timings, "get_classes", apigen.get_classes, models_obj)
+        timed(timings, "write_serializers", apigen.write_serializers, classes, os.path.join(out_path, "serializers.py"),
+              app_path, sparse=options.get("sparse", False), explicit_fields=explicit_fields, overwrite=True)
+        timed(timings, "write_views", apigen.write_views, classes, os.path.join(out_path, "views.py"), app_path,
+              overwrite=True, **options)
+        timed(timings, "write_urls", apigen.write_urls, classes, app_path, os.path.join(out_path, "urls.py"),
+              bulk=options.get("bulk", False), overwrite=True)
+        timed(timings, "write_admin", apigen.write_admin, classes, app_path, os.path.join(out_path, "admin.py"),
+              overwrite=True)
+        timed(timings, "write_signals", apigen.write_signals, classes, app_path, os.path.join(out_path, "signals.py"),
+              overwrite=True)
+        timed(timings, "write_dummy", apigen.write_dummy, classes, app_path, os.path.join(out_path, "dummygen.py"),
+              overwrite=True)
+    serializers_module = load_module(f"{APP_NAME}.serializers", os.path.join(out_path, "serializers.py"))
+    serializer_classes = [getattr(serializers_module, f"{c[0]}Serializer") for c in classes]
+    for _ in range(repeat):
+        timed(timings, "serializer_fields", build_serializers_fields, serializer_classes)
+    return timings
+
+
+def summarize(timings):
+    """
+    Get the min, median and max duration (in milliseconds) of each phase
+    :param timings: dict of the durations per phase
+    :return: dict
+    """
+    summary = dict()
+    for name, durations in timings.items():
+        summary[name] = {
+            "min_ms": round(min(durations) * 1000, 3),
+            "median_ms": round(statistics.median(durations) * 1000, 3),
+            "max_ms": round(max(durations) * 1000, 3),
+            "runs": len(durations),
+        }
+    return summary
+
+
+def run_case(n_models, relation_density, depth, repeat, features):
+    """
+    Create the project and benchmark it in a new process
+    :return: dict with the case parameters and the summary of the phases
+    """
+    with tempfile.TemporaryDirectory() as root:
+        make_project(root, n_models, relation_density=relation_density, depth=depth)
+        cmd = [sys.executable, os.path.abspath(__file__), "--run-project", root, "--repeat", str(repeat),
+               "--features", ",".join(features)]
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC_PATH, os.environ.get("PYTHONPATH", "")]))
+        output = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env).stdout
+    return {"models": n_models, "relation_density": relation_density, "depth": depth, "features": features,
+            "phases": json.loads(output.strip().splitlines()[-1])}
+
+
+def get_environment():
+    """
+    Get the versions the benchmark ran with
+    :return: dict
+    """
+    import django
+    try:
+        from importlib.metadata import version
+        package_version = version("django-rest-gen")
+    except Exception:
+        package_version = None
+    return {"python": platform.python_version(), "django": django.get_version(), "platform": platform.platform(),
+            "django_rest_gen": package_version, "date": datetime.now(timezone.utc).isoformat()}
+
+
+def compare(results, baseline):
+    """
+    Print the ratio of the median duration of each phase to the baseline results
+    :param results:
+    :param baseline:
+    :return:
+    """
+    baseline_cases = {(c["models"], c["relation_density"], c["depth"], tuple(c["features"])): c
+                      for c in baseline["cases"]}
+    for case in results["cases"]:
+        key = (case["models"], case["relation_density"], case["depth"], tuple(case["features"]))
+        if key not in baseline_cases:
+            continue
+        print(f"\n{case['models']} models (density {case['relation_density']}, depth {case['depth']}):")
+        for name, phase in case["phases"].items():
+            old = baseline_cases[key]["phases"].get(name)
+            if not old or not old["median_ms"]:
+                continue
+            ratio = phase["median_ms"] / old["median_ms"]
+            flag = "  <-- slower" if ratio > 1.2 else ""
+            print(f"  {name:<22}{old['median_ms']:>12.3f} ms{phase['median_ms']:>12.3f} ms{ratio:>8.2f}x{flag}")
+
+
+def print_results(results):
+    for case in results["cases"]:
+        print(f"\n{case['models']} models (density {case['relation_density']}, depth {case['depth']}):")
+        for name, phase in case["phases"].items():
+            print(f"  {name:<22}{phase['median_ms']:>12.3f} ms (min {phase['min_ms']:.3f}, max {phase['max_ms']:.3f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark django-rest-gen over synthetic projects")
+    parser.add_argument("--models", default="10,100,1000", help="The number of models of each project")
+    parser.add_argument("--relation-density", type=float, default=0.5,
+                        help="The probability of a model to have a relation to each of the previous 3 models")
+    parser.add_argument("--depth", type=int, default=3, help="The depth of the other directories of the projects")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of runs of each phase")
+    parser.add_argument("--features", default="", help=f"The generation options to enable ({','.join(FEATURES)})")
+    parser.add_argument("--output", help="The path of the JSON results")
+    parser.add_argument("--compare", help="The path of JSON results to compare with (e.g., of the previous release)")
+    parser.add_argument("--run-project", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    features = [f.strip() for f in args.features.split(",") if f.strip()]
+    for feature in features:
+        if feature not in FEATURES:
+            parser.error(f"Unknown feature: {feature}")
+
+    if args.run_project:
+        print(json.dumps(summarize(run_phases(args.run_project, repeat=args.repeat, features=features))))
+        return
+
+    cases = []
+    for n_models in [int(n) for n in args.models.split(",") if n.strip()]:
+        cases.append(run_case(n_models, args.relation_density, args.depth, args.repeat, features))
+    results = {"environment": get_environment(), "cases": cases}
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved in {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import argparse
 import os
 from . import apigen
+from . import utils
+from . import scanner
 
 
 def main():
@@ -12,11 +14,125 @@ def main():
                         help="Whether to overwrite existing files if any")
     parser.add_argument('--dummy', action='store_true',
                         help="Whether to generate dummy data generator")
+    parser.add_argument('--dummy-count', type=int, default=10,
+                        help="The default number of rows per model of the dummy data generator")
+    parser.add_argument('--dummy-count-per-model', default="",
+                        help="The number of rows of specific models of the dummy data generator (e.g., Book=100000)")
+    parser.add_argument('--dummy-batch-size', type=int, default=1000,
+                        help="The batch size of the inserts of the dummy data generator")
+    parser.add_argument('--relation-depth', type=int, default=0,
+                        help="The maximum relation depth to follow with select_related in the views (default: 0, "
+                             "the serializers only read the foreign key ids)")
+    parser.add_argument('--pagination', choices=['cursor', 'nocount', 'estimated'], default=None,
+                        help="The pagination of the generated list views (default: the project settings). nocount "
+                             "skips the COUNT query and estimated returns the planner estimate for large tables")
+    parser.add_argument('--pagination-per-model', default="",
+                        help="The pagination of specific models (e.g., Book=estimated,Event=cursor)")
+    parser.add_argument('--count-threshold', type=int, default=10000,
+                        help="The number of rows above which the estimated pagination returns the planner estimate "
+                             "(PostgreSQL) instead of counting the rows")
+    parser.add_argument('--page-size', type=int, default=100, help="The default page size of the list views")
+    parser.add_argument('--max-page-size', type=int, default=1000,
+                        help="The maximum page size a client can ask for using ?page_size=")
+    parser.add_argument('--sparse', action='store_true',
+                        help="Whether to support sparse fieldsets using ?fields= and ?omit=")
+    parser.add_argument('--explicit-fields', action='store_true',
+                        help="Whether the serializers declare the fields resolved from the models instead of "
+                             "fields = '__all__' (skips the model introspection of each serializer instance)")
+    parser.add_argument('--conditional', action='store_true',
+                        help="Whether to support conditional GET (ETag/Last-Modified) for models with an auto_now "
+                             "or a version field")
+    parser.add_argument('--cache', action='store_true',
+                        help="Whether to cache the responses of GET requests (invalidated using signals)")
+    parser.add_argument('--cache-ttl', type=int, default=60, help="The default cache timeout in seconds")
+    parser.add_argument('--cache-ttl-per-model', default="",
+                        help="The cache timeout of specific models (e.g., Book=300,Author=3600)")
+    parser.add_argument('--bulk', action='store_true',
+                        help="Whether to generate bulk create/update/delete views")
+    parser.add_argument('--bulk-batch-size', type=int, default=500, help="The batch size of the bulk writes")
+    parser.add_argument('--filters', action='store_true',
+                        help="Whether the list views can be filtered (exact and range lookups) on the indexed fields")
+    parser.add_argument('--async', dest='async_views', action='store_true',
+                        help="Whether to generate async list, detail and root views using the async ORM "
+                             "(Django >= 4.1, adrf is used if installed)")
+    parser.add_argument('--fast-list', action='store_true',
+                        help="Whether the list views render the rows fetched using values() instead of the serializers")
+    parser.add_argument('--export', action='store_true',
+                        help="Whether to generate /export/ views streaming all the rows as NDJSON or a JSON array")
+    parser.add_argument('--export-chunk-size', type=int, default=2000,
+                        help="The number of rows fetched (and serialized) at once by the export views")
+    parser.add_argument('--batch', action='store_true',
+                        help="Whether to generate /batch/?ids=1,2,3 views fetching several rows in a single query")
+    parser.add_argument('--batch-max-size', type=int, default=100, help="The maximum number of ids of a batch")
+    parser.add_argument('--replicas', default="",
+                        help="The read replica database aliases (e.g., replica1,replica2) the GET and HEAD requests "
+                             "read from in a round-robin. A routers.py is generated to add to DATABASE_ROUTERS")
+    parser.add_argument('--replica-weights', default="",
+                        help="The weight of each replica (e.g., replica1=3,replica2=1) for a weighted random choice "
+                             "instead of round-robin")
+    parser.add_argument('--tuned-admin', action='store_true',
+                        help="Whether to register ModelAdmins tuned for large tables (indexed columns, raw id and "
+                             "autocomplete widgets, no full counts) instead of the default ones")
+    parser.add_argument('--admin-per-page', type=int, default=100,
+                        help="The number of rows per page of the tuned admin changelists")
+    parser.add_argument('--tests', action='store_true',
+                        help="Whether to generate tests_api.py that fails if the number of queries of the endpoints "
+                             "grows with the number of rows")
+    parser.add_argument('--loadtest', action='store_true',
+                        help="Whether to generate loadtest.py that measures the latency of the list and detail routes")
+    parser.add_argument('--index-advisor', action='store_true',
+                        help="Whether to report the fields used for ordering, cursor pagination, conditional GET and "
+                             "joins that are not indexed")
+    parser.add_argument('--index-migration', action='store_true',
+                        help="Whether to write a migration adding the missing indexes (implies --index-advisor)")
+    parser.add_argument('--prune', default="",
+                        help="Extra directory names to skip when detecting the paths (e.g., data,docs)")
+    parser.add_argument('--max-depth', type=int, default=scanner.DEFAULT_MAX_DEPTH,
+                        help="The maximum directory depth to look into when detecting the paths")
+    parser.add_argument('--no-scan-cache', action='store_true',
+                        help="Do not reuse the cached project scan when detecting the paths")
+    parser.add_argument('--apps', default="",
+                        help="Generate the code for the given app labels (e.g., blog,shop) setting up django once")
+    parser.add_argument('--all-apps', action='store_true',
+                        help="Generate the code for all the apps inside the project setting up django once")
+    parser.add_argument('--static', action='store_true',
+                        help="Parse the models source code instead of importing them (no settings or django setup)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only regenerate the marked regions of the models that changed since the last run")
+    parser.add_argument('--diff', action='store_true',
+                        help="Only print the unified diff of the generated files against the current ones (dry run)")
     args = parser.parse_args()
+    model_options = dict()
+    for name, value_type, choices in [("pagination_per_model", str, list(apigen.PAGINATION_CLASSES)),
+                                      ("cache_ttl_per_model", int, None), ("replica_weights", int, None),
+                                      ("dummy_count_per_model", int, None)]:
+        try:
+            model_options[name] = utils.parse_model_options(getattr(args, name), value_type, choices=choices)
+        except Exception as e:
+            parser.error(f"argument --{name.replace('_', '-')}: {e}")
     print(f"args: {args}")
     base_path = os.path.abspath('.')
     apigen.workflow(python_path=base_path, settings_fpath=args.settings, app_path=args.apppath,
-                    overwrite=args.overwrite, dummy=args.dummy)
+                    overwrite=args.overwrite, dummy=args.dummy, relation_depth=args.relation_depth,
+                    pagination=args.pagination, paginations=model_options["pagination_per_model"],
+                    page_size=args.page_size, max_page_size=args.max_page_size, count_threshold=args.count_threshold,
+                    sparse=args.sparse, explicit_fields=args.explicit_fields, conditional=args.conditional,
+                    cache=args.cache, cache_ttl=args.cache_ttl,
+                    cache_ttls=model_options["cache_ttl_per_model"], bulk=args.bulk,
+                    bulk_batch_size=args.bulk_batch_size, filters=args.filters, async_views=args.async_views,
+                    fast_list=args.fast_list, export=args.export, export_chunk_size=args.export_chunk_size,
+                    batch=args.batch, batch_max_size=args.batch_max_size,
+                    replicas=[r.strip() for r in args.replicas.split(",") if r.strip()],
+                    replica_weights=model_options["replica_weights"],
+                    tuned_admin=args.tuned_admin, admin_per_page=args.admin_per_page, tests=args.tests,
+                    loadtest=args.loadtest, dummy_count=args.dummy_count,
+                    dummy_counts=model_options["dummy_count_per_model"],
+                    dummy_batch_size=args.dummy_batch_size, index_advisor=args.index_advisor,
+                    index_migration=args.index_migration,
+                    prune=scanner.DEFAULT_PRUNE + [p.strip() for p in args.prune.split(",") if p.strip()],
+                    max_depth=args.max_depth, scan_cache=not args.no_scan_cache,
+                    apps=[a.strip() for a in args.apps.split(",") if a.strip()], all_apps=args.all_apps,
+                    static=args.static, incremental=args.incremental, diff=args.diff)
 
 
 main()
@@ -2,7 +2,16 @@ import inspect
 import sys
 import importlib
 import os
+from functools import partial
 from . import utils
+from . import introspect
+from . import snippets
+from . import scanner
+from . import incremental as incremental_regions
+from . import render
+from . import declarations as field_declarations
+from . import indexes
+from . import static as static_models
 import django
 from django.db import models
 
@@ -18,19 +27,51 @@ def get_classes(models_obj):
 
     # Filter Models
     # classes = [(c[0], c[1]._meta.verbose_name_plural.title()) for c in clsmembers if issubclass(c[1], models.Model)]
-    classes = [(c[0], c[1]._meta.verbose_name_plural.title(), c[1]._meta.verbose_name.title()) for c in clsmembers if issubclass(c[1], models.Model)]
+    classes = [(c[0], c[1]._meta.verbose_name_plural.title(), c[1]._meta.verbose_name.title(), c[1])
+               for c in clsmembers if issubclass(c[1], models.Model)]
 
-    print(f"classes: {classes}")
+    print(f"classes: {[c[:3] for c in classes]}")
     return classes
 
 
-def load_models(python_path, models_fpath, settings_fpath):
+def get_app_classes(app_config):
     """
-    Load models from the django project and returns the module object
+    Get the classes of the given django app (in the same format as get_classes)
+    :param app_config: django AppConfig
+    :return: list of classes
+    """
+    classes = [(m.__name__, m._meta.verbose_name_plural.title(), m._meta.verbose_name.title(), m)
+               for m in app_config.get_models()]
+    print(f"{app_config.label} classes: {[c[:3] for c in classes]}")
+    return classes
+
+
+def get_app_configs(python_path, app_labels=None):
+    """
+    Get the django apps to generate the code for
+    :param python_path: the project directory. If no labels are given, the apps inside it are returned
+    :param app_labels: list of app labels (or names)
+    :return: list of AppConfig
+    """
+    from django.apps import apps
+    if app_labels:
+        configs = {c.label: c for c in apps.get_app_configs()}
+        configs.update({c.name: c for c in apps.get_app_configs()})
+        missing = [label for label in app_labels if label not in configs]
+        if missing:
+            raise Exception(f"Unknown apps: {', '.join(missing)}")
+        return [configs[label] for label in app_labels]
+    project_path = os.path.abspath(python_path) + os.sep
+    return [c for c in apps.get_app_configs() if os.path.abspath(c.path).startswith(project_path)
+            and "site-packages" not in c.path and "dist-packages" not in c.path]
+
+
+def setup_django(python_path, settings_fpath):
+    """
+    Add the project to the python path and setup django
     :param python_path:
-    :param models_fpath:
     :param settings_fpath:
-    :return: models.py module object
+    :return:
     """
     # Add path
     sys.path = [python_path] + sys.path
@@ -45,6 +86,17 @@ def load_models(python_path, models_fpath, settings_fpath):
     os.environ["DJANGO_SETTINGS_MODULE"] = proj_settings
     django.setup()
 
+
+def load_models(python_path, models_fpath, settings_fpath):
+    """
+    Load models from the django project and returns the module object
+    :param python_path:
+    :param models_fpath:
+    :param settings_fpath:
+    :return: models.py module object
+    """
+    setup_django(python_path=python_path, settings_fpath=settings_fpath)
+
     stops = models_fpath.split(os.sep)
     app_name = stops[-2]
     parts = stops[-1].split(".")
@@ -56,18 +108,64 @@ def load_models(python_path, models_fpath, settings_fpath):
     return models_obj
 
 
-def write_class_serializer(class_name, fpath, write=False):
+def get_class_serializer(class_name, sparse=False, model=None, explicit_fields=False):
+    """
+    Get the serializer code of the given class
+    :param class_name:
+    :param sparse: whether to support sparse fieldsets (?fields= and ?omit=)
+    :param model: the model class (required by explicit_fields)
+    :param explicit_fields: whether to declare the fields resolved from the model instead of fields = '__all__', so
+    ModelSerializer does not introspect the model each time it is instantiated. The serializers with fields that can
+    not be declared use fields = '__all__'
+    :return: str
+    """
+    bases = "serializers.ModelSerializer"
+    if sparse:
+        bases = "SparseFieldsMixin, " + bases
+    declarations = field_declarations.get_serializer_fields(model) if explicit_fields else None
+    if declarations is not None:
+        content = f"\nclass {class_name}Serializer({bases}):\n"
+        content += "".join(f"    {name} = {code}\n" for name, code in declarations)
+        content += f"""
+    class Meta:
+        model = {class_name}
+        fields = {[name for name, _ in declarations]}
+
+    def get_fields(self):
+        # the fields are declared: skip the model introspection of ModelSerializer
+        return serializers.Serializer.get_fields(self)\n\n"""
+        return content
+    content = f"""\nclass {class_name}Serializer({bases}):\n
+    class Meta:
+        model = {class_name}
+        fields = '__all__'\n\n"""
+    return content
+
+
+def get_serializers_helpers(sparse=False):
+    """
+    Get the helper code required by the generated serializers
+    :param sparse: whether to support sparse fieldsets (?fields= and ?omit=)
+    :return: list of code snippets
+    """
+    helpers = []
+    if sparse:
+        helpers.append(snippets.SPARSE_FIELDS_SERIALIZER)
+    return helpers
+
+
+def write_class_serializer(class_name, fpath, write=False, sparse=False, model=None, explicit_fields=False):
     """
     Write a serializer for the given class
     :param class_name:
     :param fpath:
     :param write:
+    :param sparse: whether to support sparse fieldsets (?fields= and ?omit=)
+    :param model: the model class (required by explicit_fields)
+    :param explicit_fields: whether to declare the fields resolved from the model instead of fields = '__all__'
     :return:
     """
-    content = f"""\nclass {class_name}Serializer(serializers.ModelSerializer):\n
-    class Meta:
-        model = {class_name}
-        fields = '__all__'\n\n"""
+    content = get_class_serializer(class_name, sparse=sparse, model=model, explicit_fields=explicit_fields)
     if write:
         with open(fpath, "a") as f:
             f.write(content)
@@ -75,35 +173,323 @@ def write_class_serializer(class_name, fpath, write=False):
         print(content)
 
 
-def write_serializers(classes, serializers_path, app_path):
+def get_serializers_regions(classes, app_name, sparse=False, explicit_fields=False):
+    """
+    Get the regions of serializers.py
+    :param classes:
+    :param app_name:
+    :param sparse: whether to support sparse fieldsets (?fields= and ?omit=)
+    :param explicit_fields: whether to declare the fields resolved from the models instead of fields = '__all__'
+    :return: list of (region name, function returning the region content)
+    """
+    imports = snippets.EXPLICIT_FIELDS_SERIALIZER_IMPORTS if explicit_fields else None
+    header = get_serializers_imports(app_name, imports=imports) + "".join(get_serializers_helpers(sparse=sparse))
+    regions = [("@header", partial(str, header))]
+    for c in classes:
+        regions.append((c[0], partial(get_class_serializer, c[0], sparse=sparse, model=introspect.get_class_model(c),
+                                      explicit_fields=explicit_fields)))
+    return regions
+
+
+def write_serializers(classes, serializers_path, app_path, sparse=False, explicit_fields=False, app_name=None,
+                      overwrite=False, diff=False):
     """
     Write serializers for all provided classes
     :param classes:
     :param serializers_path:
     :param app_path:
+    :param sparse: whether to support sparse fieldsets (?fields= and ?omit=)
+    :param explicit_fields: whether to declare the fields resolved from the models instead of fields = '__all__'
+    :param app_name: the app module name used in the imports (default: guessed from the app path)
+    :param overwrite: whether to replace the file if it is not empty
+    :param diff: whether to only print the diff against the current file
     :return:
     """
     empty = utils.empty_fpath(serializers_path)
-    # add_serializers_imports(serializers_path=serializers_path, app_name=app_path, write=empty)
-    add_serializers_imports(serializers_path=serializers_path, app_name=get_app_name(app_path), write=empty)
-    for c in classes:
-        write_class_serializer(class_name=c[0], fpath=serializers_path, write=empty)
+    regions = get_serializers_regions(classes, app_name or get_app_name(app_path), sparse=sparse,
+                                      explicit_fields=explicit_fields)
+    render.write_file(serializers_path, render.join_regions(regions), write=empty or overwrite, diff=diff)
+
+
+def get_queryset_code(class_name, select_related=None, prefetch_related=None):
+    """
+    Get the queryset expression of the given class
+    :param class_name:
+    :param select_related: list of select_related paths
+    :param prefetch_related: list of prefetch_related lookups
+    :return: str
+    """
+    content = f"{class_name}.objects"
+    if select_related:
+        content += ".select_related(%s)" % ", ".join([f"'{r}'" for r in select_related])
+    if prefetch_related:
+        content += ".prefetch_related(%s)" % ", ".join([f"'{r}'" for r in prefetch_related])
+    if not select_related and not prefetch_related:
+        content += ".all()"
+    return content
+
+
+PAGINATION_CLASSES = {
+    "cursor": "CursorPagination",
+    "nocount": "CountFreePagination",
+    "estimated": "EstimatedCountPagination",
+}
+
+
+def get_pagination_class_name(class_name, pagination="cursor"):
+    """
+    Get the name of the generated pagination class of the given class
+    :param class_name:
+    :param pagination: "cursor", "nocount" or "estimated"
+    :return: str
+    """
+    return class_name + PAGINATION_CLASSES[pagination]
+
+
+def get_class_pagination(class_name, model=None, page_size=100, max_page_size=1000, pagination="cursor",
+                         count_threshold=10000):
+    """
+    Get the pagination class of the given class. The ordering of the cursor pagination is picked from the model fields
+    :param class_name:
+    :param model: the model class
+    :param page_size:
+    :param max_page_size:
+    :param pagination: "cursor", "nocount" (no count, the next page is detected by fetching one more row) or
+    "estimated" (the count is estimated by the query planner above count_threshold rows)
+    :param count_threshold: the number of rows above which the estimated count is used
+    :return: str
+    """
+    pagination_class_name = get_pagination_class_name(class_name, pagination)
+    if pagination != "cursor":
+        content = f"""\nclass {pagination_class_name}({PAGINATION_CLASSES[pagination]}):
+    page_size = {page_size}
+    max_page_size = {max_page_size}"""
+        if pagination == "estimated":
+            content += f"\n    count_threshold = {count_threshold}"
+        return content + "\n\n"
+    ordering = introspect.get_cursor_ordering(model)
+    content = f"""\nclass {pagination_class_name}(pagination.CursorPagination):
+    ordering = '{ordering}'
+    page_size = {page_size}
+    page_size_query_param = 'page_size'
+    max_page_size = {max_page_size}\n\n"""
+    return content
 
 
-def write_class_view(class_name, fpath, write=False):
+def get_class_view(class_name, model=None, relation_depth=0, pagination=None, page_size=100, max_page_size=1000,
+                   sparse=False, conditional=False, cache=False, cache_ttl=60, bulk=False, bulk_batch_size=500,
+                   filters=False, async_views=False, fast_list=False, export=False, export_chunk_size=2000,
+                   count_threshold=10000, batch=False, batch_max_size=100, replica=False):
+    """
+    Get the views code of a single class
+    :param class_name:
+    :param model: the model class. If given, related objects are fetched with select_related/prefetch_related
+    :param relation_depth: the maximum relation depth to follow for select_related (0 to disable)
+    :param pagination: None (the default pagination from the settings), "cursor", "nocount" or "estimated"
+    :param page_size: the default page size of the list view
+    :param max_page_size: the maximum page size a client can ask for
+    :param sparse: whether to only fetch the columns asked for using ?fields= and ?omit=
+    :param conditional: whether to support conditional GET (ETag/Last-Modified) if the model has an auto_now or a
+    version field
+    :param cache: whether to cache the responses of GET requests
+    :param cache_ttl: the cache timeout (in seconds) of the responses
+    :param bulk: whether to generate the bulk create/update/delete view
+    :param bulk_batch_size: the batch size of the bulk writes
+    :param filters: whether the list view can be filtered on the indexed fields
+    :param async_views: whether to generate async list and detail views (the other view options do not apply)
+    :param fast_list: whether the list view renders the rows fetched using values() instead of the serializer
+    :param export: whether to generate the streaming export view
+    :param export_chunk_size: the number of rows fetched (and serialized) at once by the export view
+    :param count_threshold: the number of rows above which the estimated pagination returns the estimated count
+    :param batch: whether to generate the batch retrieve view (?ids=)
+    :param batch_max_size: the maximum number of ids of a batch
+    :param replica: whether the GET and HEAD requests read from a replica (see routers.py)
+    :return: str
+    """
+    select_related, prefetch_related = introspect.get_queryset_relations(model, max_depth=relation_depth)
+    queryset = get_queryset_code(class_name, select_related=select_related, prefetch_related=prefetch_related)
+    # the views appended after the other views of the class
+    extra_views = [get_class_export_view(class_name, queryset, export_chunk_size)] if export else []
+    if async_views:
+        if batch:
+            extra_views.append(get_class_batch_view(class_name, queryset, batch_max_size=batch_max_size,
+                                                    replica=replica))
+        return get_class_async_view(class_name, queryset, page_size=page_size, max_page_size=max_page_size,
+                                    bulk=bulk, cache=cache, bulk_batch_size=bulk_batch_size) + "".join(extra_views)
+    content = ""
+    list_extra = ""
+    detail_extra = ""
+    # first, so the cached and the conditional responses are read from the replica as well
+    mixins = "ReplicaReadMixin, " if replica else ""
+    last_modified_field = introspect.get_last_modified_field(model)
+    version_field = introspect.get_version_field(model)
+    if conditional and (last_modified_field or version_field):
+        mixins += "ConditionalGetMixin, "
+        if last_modified_field:
+            detail_extra += f"\n    last_modified_field = '{last_modified_field}'"
+        if version_field:
+            detail_extra += f"\n    version_field = '{version_field}'"
+        list_extra += detail_extra
+    if cache:
+        mixins += "CacheResponseMixin, "
+        detail_extra += f"\n    cache_timeout = {cache_ttl}"
+        list_extra += f"\n    cache_timeout = {cache_ttl}"
+    if sparse:
+        mixins += "SparseFieldsQuerysetMixin, "
+    if pagination:
+        content += get_class_pagination(class_name, model=model, page_size=page_size, max_page_size=max_page_size,
+                                        pagination=pagination, count_threshold=count_threshold)
+        list_extra += f"\n    pagination_class = {get_pagination_class_name(class_name, pagination)}"
+    list_mixins = mixins
+    if filters and model is not None:
+        list_mixins = "IndexedFilterMixin, " + mixins
+        list_extra += f"\n    filter_fields = {introspect.get_filter_fields(model)}"
+    if fast_list:
+        list_mixins += "ValuesListMixin, "
+    content += f"""\nclass {class_name}List({list_mixins}generics.ListCreateAPIView):
+    queryset = {queryset}
+    serializer_class = {class_name}Serializer{list_extra}\n\n
+class {class_name}Detail({mixins}generics.RetrieveUpdateDestroyAPIView):
+    queryset = {queryset}
+    serializer_class = {class_name}Serializer{detail_extra}\n\n"""
+    if bulk:
+        filter_fields = introspect.get_filter_fields(model) if filters and model is not None else None
+        content += get_class_bulk_view(class_name, queryset, cache=cache, bulk_batch_size=bulk_batch_size,
+                                       filter_fields=filter_fields)
+    if batch:
+        content += get_class_batch_view(class_name, queryset, cache=cache, cache_ttl=cache_ttl, sparse=sparse,
+                                        batch_max_size=batch_max_size, replica=replica)
+    return content + "".join(extra_views)
+
+
+def get_class_batch_view(class_name, queryset, cache=False, cache_ttl=60, sparse=False, batch_max_size=100,
+                         replica=False):
+    """
+    Get the batch retrieve view code of a single class
+    :param class_name:
+    :param queryset: the queryset code (the same select_related/prefetch_related as the list view)
+    :param cache: whether to cache the responses
+    :param cache_ttl: the cache timeout (in seconds) of the responses
+    :param sparse: whether to only fetch the columns asked for using ?fields= and ?omit=
+    :param batch_max_size: the maximum number of ids of a batch
+    :param replica: whether to read from a replica (see routers.py)
+    :return: str
+    """
+    mixins = "ReplicaReadMixin, " if replica else ""
+    extra = ""
+    if cache:
+        mixins += "CacheResponseMixin, "
+        extra += f"\n    cache_timeout = {cache_ttl}"
+    if sparse:
+        mixins += "SparseFieldsQuerysetMixin, "
+    return f"""
+class {class_name}Batch({mixins}BatchRetrieveMixin, generics.GenericAPIView):
+    queryset = {queryset}
+    serializer_class = {class_name}Serializer
+    batch_max_size = {batch_max_size}{extra}\n\n"""
+
+
+def get_class_export_view(class_name, queryset, export_chunk_size=2000):
+    """
+    Get the streaming export view code of a single class
+    :param class_name:
+    :param queryset: the queryset code
+    :param export_chunk_size: the number of rows fetched (and serialized) at once
+    :return: str
+    """
+    return f"""
+class {class_name}Export(ExportMixin, generics.GenericAPIView):
+    queryset = {queryset}
+    serializer_class = {class_name}Serializer
+    export_chunk_size = {export_chunk_size}\n\n"""
+
+
+def get_class_bulk_view(class_name, queryset, cache=False, bulk_batch_size=500, filter_fields=None):
+    """
+    Get the bulk create/update/delete view code of a single class
+    :param class_name:
+    :param queryset: the queryset code
+    :param cache: whether the cached responses are invalidated
+    :param bulk_batch_size: the batch size of the bulk writes
+    :param filter_fields: the fields the bulk deletes can be filtered on (the filters of the list view), if any
+    :return: str
+    """
+    bulk_mixins = "BulkCacheInvalidationMixin, " if cache else ""
+    extra = ""
+    if filter_fields is not None:
+        bulk_mixins += "IndexedFilterMixin, "
+        extra = f"\n    filter_fields = {filter_fields}\n    filter_methods = ('DELETE',)"
+    return f"""
+class {class_name}Bulk({bulk_mixins}BulkMixin, generics.GenericAPIView):
+    queryset = {queryset}
+    serializer_class = {class_name}Serializer
+    bulk_batch_size = {bulk_batch_size}{extra}\n\n"""
+
+
+def get_class_async_view(class_name, queryset, page_size=100, max_page_size=1000, bulk=False, cache=False,
+                         bulk_batch_size=500):
+    """
+    Get the async views code of a single class (the bulk view is still synchronous)
+    :param class_name:
+    :param queryset: the queryset code
+    :param page_size: the default page size of the list view
+    :param max_page_size: the maximum page size a client can ask for
+    :param bulk: whether to generate the bulk create/update/delete view
+    :param cache: whether the cached responses are invalidated by the bulk view
+    :param bulk_batch_size: the batch size of the bulk writes
+    :return: str
+    """
+    content = f"""\nclass {class_name}List(AsyncListCreateView):
+    queryset = {queryset}
+    serializer_class = {class_name}Serializer
+    page_size = {page_size}
+    max_page_size = {max_page_size}\n\n
+class {class_name}Detail(AsyncRetrieveUpdateDestroyView):
+    queryset = {queryset}
+    serializer_class = {class_name}Serializer\n\n"""
+    if bulk:
+        content += get_class_bulk_view(class_name, queryset, cache=cache, bulk_batch_size=bulk_batch_size)
+    return content
+
+
+def write_class_view(class_name, fpath, write=False, model=None, relation_depth=0, pagination=None, page_size=100,
+                     max_page_size=1000, sparse=False, conditional=False, cache=False, cache_ttl=60, bulk=False,
+                     bulk_batch_size=500, filters=False, async_views=False, fast_list=False, export=False,
+                     export_chunk_size=2000, count_threshold=10000, batch=False, batch_max_size=100, replica=False):
     """
     Write the view for a single class
     :param class_name:
     :param fpath:
     :param write:
+    :param model: the model class. If given, related objects are fetched with select_related/prefetch_related
+    :param relation_depth: the maximum relation depth to follow for select_related (0 to disable)
+    :param pagination: None (the default pagination from the settings), "cursor", "nocount" or "estimated"
+    :param page_size: the default page size of the list view
+    :param max_page_size: the maximum page size a client can ask for
+    :param sparse: whether to only fetch the columns asked for using ?fields= and ?omit=
+    :param conditional: whether to support conditional GET (ETag/Last-Modified) if the model has an auto_now or a
+    version field
+    :param cache: whether to cache the responses of GET requests
+    :param cache_ttl: the cache timeout (in seconds) of the responses
+    :param bulk: whether to generate the bulk create/update/delete view
+    :param bulk_batch_size: the batch size of the bulk writes
+    :param filters: whether the list view can be filtered on the indexed fields
+    :param async_views: whether to generate async list and detail views
+    :param fast_list: whether the list view renders the rows fetched using values() instead of the serializer
+    :param export: whether to generate the streaming export view
+    :param export_chunk_size: the number of rows fetched (and serialized) at once by the export view
+    :param count_threshold: the number of rows above which the estimated pagination returns the estimated count
+    :param batch: whether to generate the batch retrieve view (?ids=)
+    :param batch_max_size: the maximum number of ids of a batch
+    :param replica: whether the GET and HEAD requests read from a replica (see routers.py)
     :return:
     """
-    content = f"""\nclass {class_name}List(generics.ListCreateAPIView):
-    queryset = {class_name}.objects.all()
-    serializer_class = {class_name}Serializer\n\n
-class {class_name}Detail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = {class_name}.objects.all()
-    serializer_class = {class_name}Serializer\n\n"""
+    content = get_class_view(class_name, model=model, relation_depth=relation_depth, pagination=pagination,
+                             page_size=page_size, max_page_size=max_page_size, sparse=sparse, conditional=conditional,
+                             cache=cache, cache_ttl=cache_ttl, bulk=bulk, bulk_batch_size=bulk_batch_size,
+                             filters=filters, async_views=async_views, fast_list=fast_list, export=export,
+                             export_chunk_size=export_chunk_size, count_threshold=count_threshold, batch=batch,
+                             batch_max_size=batch_max_size, replica=replica)
     if write:
         with open(fpath, "a") as f:
             f.write(content)
@@ -111,20 +497,35 @@ class {class_name}Detail(generics.RetrieveUpdateDestroyAPIView):
         print(content)
 
 
-def add_views_imports(app_name, views_path, write=False):
+def get_views_imports(app_name, imports=None):
     """
-    Add the imports for views.py
+    Get the imports of views.py
     :param app_name:
-    :param views_path:
-    :param write:
-    :return:
+    :param imports: list of extra import lines required by the generated views
+    :return: str
     """
     content = f"""from {app_name}.models import *
 from {app_name}.serializers import *
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
-from rest_framework import generics\n\n"""
+from rest_framework import generics\n"""
+    if imports:
+        content += "\n".join(imports) + "\n"
+    content += "\n"
+    return content
+
+
+def add_views_imports(app_name, views_path, write=False, imports=None):
+    """
+    Add the imports for views.py
+    :param app_name:
+    :param views_path:
+    :param write:
+    :param imports: list of extra import lines required by the generated views
+    :return:
+    """
+    content = get_views_imports(app_name, imports=imports)
     if write:
         with open(views_path, "a") as f:
             f.write(content)
@@ -142,6 +543,21 @@ def get_app_name(app_path):
     return app_name
 
 
+def get_serializers_imports(app_name, imports=None):
+    """
+    Get the imports of serializers.py
+    :param app_name:
+    :param imports: list of extra import lines required by the generated serializers
+    :return: str
+    """
+    content = f"""from {app_name}.models import *
+from rest_framework import serializers\n"""
+    if imports:
+        content += "\n".join(imports) + "\n"
+    content += "\n"
+    return content
+
+
 def add_serializers_imports(app_name, serializers_path, write=False):
     """
     Add the imports for serializers.py
@@ -150,8 +566,7 @@ def add_serializers_imports(app_name, serializers_path, write=False):
     :param write:
     :return:
     """
-    content = f"""from {app_name}.models import *
-from rest_framework import serializers\n\n"""
+    content = get_serializers_imports(app_name)
     if write:
         with open(serializers_path, "a") as f:
             f.write(content)
@@ -160,13 +575,12 @@ from rest_framework import serializers\n\n"""
         print(content)
 
 
-def write_root_view(views_path, classes, write):
+def get_root_view(classes, async_views=False):
     """
-    Write the root api view
-    :param views_path:
+    Get the root api view code
     :param classes:
-    :param write:
-    :return:
+    :param async_views: whether to generate an async view
+    :return: str
     """
     lists = ""
     for c in classes:
@@ -174,12 +588,35 @@ def write_root_view(views_path, classes, write):
         line = f"\t'{name}-list': reverse('{name}-list', request=request, format=format),\n"
         lists += line
 
+    if async_views:
+        return f"""class ApiRoot(AsyncJsonMixin, AsyncBaseView):
+    async def get(self, request, format=None):
+        return self.make_response({{
+{lists}
+        }})
+
+
+api_root = ApiRoot.as_view()
+"""
     content = f"""@api_view(['GET'])
 def api_root(request, format=None):
     return Response({{
 {lists}  
     }})
     """
+    return content
+
+
+def write_root_view(views_path, classes, write, async_views=False):
+    """
+    Write the root api view
+    :param views_path:
+    :param classes:
+    :param write:
+    :param async_views: whether to generate an async view
+    :return:
+    """
+    content = get_root_view(classes, async_views=async_views)
 
     if write:
         with open(views_path, "a") as f:
@@ -188,22 +625,208 @@ def api_root(request, format=None):
         print(content)
 
 
-def write_views(classes, views_path, app_path):
+# The options that do not apply to the async list and detail views, with their command line flags
+ASYNC_IGNORED_OPTIONS = {
+    "pagination": "--pagination",
+    "paginations": "--pagination-per-model",
+    "sparse": "--sparse",
+    "conditional": "--conditional",
+    "cache": "--cache",
+    "filters": "--filters",
+    "fast_list": "--fast-list",
+    "replicas": "--replicas",
+    "replica_weights": "--replica-weights",
+}
+
+
+def get_async_ignored_options(options):
+    """
+    Get the given options that are ignored by the async list and detail views
+    :param options: dict of the generation options (see generate_app)
+    :return: list of the command line flags of the ignored options (empty if the views are not async)
+    """
+    if not options.get("async_views"):
+        return []
+    return [flag for name, flag in ASYNC_IGNORED_OPTIONS.items() if options.get(name)]
+
+
+def get_views_helpers(app_name, pagination=None, sparse=False, conditional=False, cache=False, bulk=False,
+                      filters=False, async_views=False, fast_list=False, export=False, paginations=None, batch=False,
+                      replica=False):
+    """
+    Get the extra imports and the helper code required by the generated views
+    :param app_name:
+    :param pagination: None, "cursor", "nocount" or "estimated"
+    :param sparse: whether to only fetch the columns asked for using ?fields= and ?omit=
+    :param conditional: whether to support conditional GET (ETag/Last-Modified)
+    :param cache: whether to cache the responses of GET requests
+    :param bulk: whether to generate the bulk create/update/delete views
+    :param filters: whether the list views can be filtered on the indexed fields
+    :param async_views: whether to generate async list and detail views (only the bulk and cache helpers apply)
+    :param fast_list: whether the list views render the rows fetched using values() instead of the serializer
+    :param export: whether to generate the streaming export views
+    :param paginations: dict of the pagination per class name
+    :param batch: whether to generate the batch retrieve views
+    :param replica: whether the GET and HEAD requests read from a replica (see routers.py)
+    :return: (list of import lines, list of code snippets)
+    """
+    imports = []
+    helpers = []
+    used_paginations = {pagination} | set((paginations or {}).values())
+    if async_views:
+        imports += snippets.ASYNC_VIEW_IMPORTS
+        helpers.append(snippets.ASYNC_VIEW)
+        used_paginations = set()
+        sparse = conditional = filters = fast_list = False
+        # only the batch views are synchronous
+        replica = replica and batch
+    if used_paginations - {None}:
+        imports.append("from rest_framework import pagination")
+    if used_paginations & {"nocount", "estimated"}:
+        imports += snippets.COUNT_PAGINATION_IMPORTS
+        helpers.append(snippets.COUNT_PAGINATION)
+    if conditional:
+        imports += snippets.CONDITIONAL_GET_VIEW_IMPORTS
+        helpers.append(snippets.CONDITIONAL_GET_VIEW)
+    if cache:
+        imports += snippets.CACHE_VIEW_IMPORTS
+        imports.append(f"from {app_name}.signals import get_cache_version, bump_cache_version, CACHE_DEPENDENTS")
+        helpers.append(snippets.CACHE_VIEW)
+    if bulk:
+        imports += snippets.BULK_VIEW_IMPORTS
+        helpers.append(snippets.BULK_VIEW)
+    if sparse:
+        helpers.append(snippets.SPARSE_FIELDS_VIEW)
+    if filters:
+        imports += snippets.FILTER_VIEW_IMPORTS
+        helpers.append(snippets.FILTER_VIEW)
+    if fast_list:
+        imports += snippets.VALUES_LIST_VIEW_IMPORTS
+        helpers.append(snippets.VALUES_LIST_VIEW)
+    if export:
+        imports += snippets.EXPORT_VIEW_IMPORTS
+        helpers.append(snippets.EXPORT_VIEW)
+    if batch:
+        imports += snippets.BATCH_VIEW_IMPORTS
+        helpers.append(snippets.BATCH_VIEW)
+    if replica:
+        imports.append(f"from {app_name}.routers import replica_reads")
+        helpers.append(snippets.REPLICA_VIEW)
+    imports = list(dict.fromkeys(imports))
+    return imports, helpers
+
+
+def get_views_regions(classes, app_name, relation_depth=0, pagination=None, paginations=None, page_size=100,
+                      max_page_size=1000, count_threshold=10000, sparse=False, conditional=False, cache=False,
+                      cache_ttl=60, cache_ttls=None, bulk=False, bulk_batch_size=500, filters=False, async_views=False,
+                      fast_list=False, export=False, export_chunk_size=2000, batch=False, batch_max_size=100,
+                      replica=False):
+    """
+    Get the regions of views.py
+    :param classes:
+    :param app_name:
+    :param relation_depth: the maximum relation depth to follow for select_related (0 to disable)
+    :param pagination: None (the default pagination from the settings), "cursor", "nocount" or "estimated"
+    :param paginations: dict of the pagination per class name
+    :param page_size: the default page size of the list views
+    :param max_page_size: the maximum page size a client can ask for
+    :param count_threshold: the number of rows above which the estimated pagination returns the estimated count
+    :param sparse: whether to only fetch the columns asked for using ?fields= and ?omit=
+    :param conditional: whether to support conditional GET (ETag/Last-Modified)
+    :param cache: whether to cache the responses of GET requests
+    :param cache_ttl: the default cache timeout (in seconds)
+    :param cache_ttls: dict of the cache timeout per class name
+    :param bulk: whether to generate the bulk create/update/delete views
+    :param bulk_batch_size: the batch size of the bulk writes
+    :param filters: whether the list views can be filtered on the indexed fields
+    :param async_views: whether to generate async list, detail and root views
+    :param fast_list: whether the list views render the rows fetched using values() instead of the serializer
+    :param export: whether to generate the streaming export views
+    :param export_chunk_size: the number of rows fetched (and serialized) at once by the export views
+    :param batch: whether to generate the batch retrieve views (?ids=)
+    :param batch_max_size: the maximum number of ids of a batch
+    :param replica: whether the GET and HEAD requests read from a replica (see routers.py)
+    :return: list of (region name, function returning the region content)
+    """
+    imports, helpers = get_views_helpers(app_name, pagination=pagination, sparse=sparse, conditional=conditional,
+                                         cache=cache, bulk=bulk, filters=filters, async_views=async_views,
+                                         fast_list=fast_list, export=export, paginations=paginations, batch=batch,
+                                         replica=replica)
+    header = get_views_imports(app_name, imports=imports) + "".join(helpers)
+    regions = [("@header", partial(str, header)),
+               ("@api_root", partial(get_root_view, classes, async_views=async_views))]
+    for c in classes:
+        regions.append((c[0], partial(get_class_view, c[0], model=introspect.get_class_model(c),
+                                      relation_depth=relation_depth,
+                                      pagination=(paginations or {}).get(c[0], pagination), page_size=page_size,
+                                      max_page_size=max_page_size,
+                                      count_threshold=count_threshold, sparse=sparse, conditional=conditional,
+                                      cache=cache, cache_ttl=(cache_ttls or {}).get(c[0], cache_ttl), bulk=bulk,
+                                      bulk_batch_size=bulk_batch_size, filters=filters, async_views=async_views,
+                                      fast_list=fast_list and not async_views, export=export,
+                                      export_chunk_size=export_chunk_size, batch=batch,
+                                      batch_max_size=batch_max_size, replica=replica)))
+    return regions
+
+
+def write_views(classes, views_path, app_path, relation_depth=0, pagination=None, paginations=None, page_size=100,
+                max_page_size=1000, count_threshold=10000, sparse=False, conditional=False, cache=False, cache_ttl=60,
+                cache_ttls=None, bulk=False, bulk_batch_size=500, filters=False, async_views=False, fast_list=False,
+                export=False, export_chunk_size=2000, batch=False, batch_max_size=100, replica=False, app_name=None,
+                overwrite=False, diff=False):
     """
     Write API views
     :param classes:
     :param views_path:
     :param app_path:
+    :param relation_depth: the maximum relation depth to follow for select_related (0 to disable)
+    :param pagination: None (the default pagination from the settings), "cursor", "nocount" or "estimated"
+    :param paginations: dict of the pagination per class name
+    :param page_size: the default page size of the list views
+    :param max_page_size: the maximum page size a client can ask for
+    :param count_threshold: the number of rows above which the estimated pagination returns the estimated count
+    :param sparse: whether to only fetch the columns asked for using ?fields= and ?omit=
+    :param conditional: whether to support conditional GET (ETag/Last-Modified)
+    :param cache: whether to cache the responses of GET requests
+    :param cache_ttl: the default cache timeout (in seconds)
+    :param cache_ttls: dict of the cache timeout per class name
+    :param bulk: whether to generate the bulk create/update/delete views
+    :param bulk_batch_size: the batch size of the bulk writes
+    :param filters: whether the list views can be filtered on the indexed fields
+    :param async_views: whether to generate async list, detail and root views
+    :param fast_list: whether the list views render the rows fetched using values() instead of the serializer
+    :param export: whether to generate the streaming export views
+    :param export_chunk_size: the number of rows fetched (and serialized) at once by the export views
+    :param batch: whether to generate the batch retrieve views (?ids=)
+    :param batch_max_size: the maximum number of ids of a batch
+    :param replica: whether the GET and HEAD requests read from a replica (see routers.py)
+    :param app_name: the app module name used in the imports (default: guessed from the app path)
+    :param overwrite: whether to replace the file if it is not empty
+    :param diff: whether to only print the diff against the current file
     :return: None
     """
     empty = utils.empty_fpath(fpath=views_path)
-
-    # add_views_imports(views_path=views_path, app_path=app_path, write=empty)
-    # add_views_imports(views_path=views_path, app_name=app_path, write=empty)
-    add_views_imports(views_path=views_path, app_name=get_app_name(app_path), write=empty)
-    write_root_view(views_path=views_path, classes=classes, write=empty)
-    for c in classes:
-        write_class_view(class_name=c[0], fpath=views_path, write=empty)
+    regions = get_views_regions(classes, app_name or get_app_name(app_path), relation_depth=relation_depth,
+                                pagination=pagination, paginations=paginations, page_size=page_size,
+                                max_page_size=max_page_size, count_threshold=count_threshold,
+                                sparse=sparse, conditional=conditional, cache=cache, cache_ttl=cache_ttl,
+                                cache_ttls=cache_ttls, bulk=bulk, bulk_batch_size=bulk_batch_size,
+                                filters=filters, async_views=async_views, fast_list=fast_list, export=export,
+                                export_chunk_size=export_chunk_size, batch=batch, batch_max_size=batch_max_size,
+                                replica=replica)
+    render.write_file(views_path, render.join_regions(regions), write=empty or overwrite, diff=diff)
+
+
+def get_urls_imports(app_name):
+    """
+    Get the imports of urls.py
+    :param app_name:
+    :return: str
+    """
+    content = f"""from {app_name}.models import *
+from {app_name} import views
+from django.urls import path, re_path, include\n\n"""
+    return content
 
 
 def add_urls_imports(app_name, urls_path, write=False):
@@ -214,9 +837,7 @@ def add_urls_imports(app_name, urls_path, write=False):
     :param write:
     :return:
     """
-    content = f"""from {app_name}.models import *
-from {app_name} import views
-from django.urls import path, re_path, include\n\n"""
+    content = get_urls_imports(app_name)
     if write:
         with open(urls_path, "a") as f:
             f.write(content)
@@ -237,116 +858,521 @@ def get_class_url_name(verbose_name, joiner="_"):
     return url_name
 
 
-def get_class_url(class_pair):
+def get_class_url(class_pair, bulk=False, export=False, batch=False):
     """
     Appends the class url path to urls.py
     :param class_pair:
+    :param bulk: whether to add the bulk view url (before the detail url as a str pk would match it)
+    :param export: whether to add the export view url (before the detail url as well)
+    :param batch: whether to add the batch retrieve view url (before the detail url as well)
     :return:
     """
     url_name = get_class_url_name(class_pair[2], joiner="-")
     url_name_plural = get_class_url_name(class_pair[1])
-    content = f"""\tpath('{url_name_plural}/', views.{class_pair[0]}List.as_view(), name='{url_name}-list'),
-\tpath('{url_name_plural}/<int:pk>/', views.{class_pair[0]}Detail.as_view(), name='{url_name}-detail'),\n"""
+    pk_converter = introspect.get_pk_url_converter(introspect.get_class_model(class_pair))
+    content = f"\tpath('{url_name_plural}/', views.{class_pair[0]}List.as_view(), name='{url_name}-list'),\n"
+    if bulk:
+        content += f"\tpath('{url_name_plural}/bulk/', views.{class_pair[0]}Bulk.as_view(), name='{url_name}-bulk'),\n"
+    if export:
+        content += (f"\tpath('{url_name_plural}/export/', views.{class_pair[0]}Export.as_view(), "
+                    f"name='{url_name}-export'),\n")
+    if batch:
+        content += (f"\tpath('{url_name_plural}/batch/', views.{class_pair[0]}Batch.as_view(), "
+                    f"name='{url_name}-batch'),\n")
+    content += (f"\tpath('{url_name_plural}/<{pk_converter}:pk>/', views.{class_pair[0]}Detail.as_view(), "
+                f"name='{url_name}-detail'),\n")
     return content
 
 
-def write_urls(classes, app_path, urls_path):
+def get_urls_regions(classes, app_name, bulk=False, export=False, batch=False):
+    """
+    Get the regions of urls.py
+    :param classes:
+    :param app_name:
+    :param bulk: whether to add the bulk views urls
+    :param export: whether to add the export views urls
+    :param batch: whether to add the batch retrieve views urls
+    :return: list of (region name, function returning the region content)
+    """
+    regions = [("@header", partial(str, get_urls_imports(app_name) + "urlpatterns = [\n"))]
+    for c in classes:
+        regions.append((c[0], partial(get_class_url, class_pair=c, bulk=bulk, export=export, batch=batch)))
+    regions.append(("@footer", partial(str, "\tpath('', views.api_root)\n]")))
+    return regions
+
+
+def write_urls(classes, app_path, urls_path, bulk=False, export=False, batch=False, app_name=None, overwrite=False,
+               diff=False):
     """
     Generates the code for the urls.py
     :param classes:
     :param app_path:
     :param urls_path:
+    :param bulk: whether to add the bulk views urls
+    :param export: whether to add the export views urls
+    :param batch: whether to add the batch retrieve views urls
+    :param app_name: the app module name used in the imports (default: guessed from the app path)
+    :param overwrite: whether to replace the file if it is not empty
+    :param diff: whether to only print the diff against the current file
     :return:
     """
     empty = utils.empty_fpath(fpath=urls_path)
-    add_urls_imports(urls_path=urls_path, app_name=get_app_name(app_path), write=empty)
-    # add_urls_imports(urls_path=urls_path, app_name=app_path, write=empty)
-
-    content = ""
-
-    for c in classes:
-        content += get_class_url(class_pair=c)
-
-    # root url
-    content += "\tpath('', views.api_root)"
-    content = f"urlpatterns = [\n{content}\n]"
-
-    if empty:
-        with open(urls_path, "a") as f:
-            f.write(content)
-
-    else:
-        print(content)
+    regions = get_urls_regions(classes, app_name or get_app_name(app_path), bulk=bulk, export=export, batch=batch)
+    render.write_file(urls_path, render.join_regions(regions), write=empty or overwrite, diff=diff)
 
 
-def get_class_admin(class_pair):
+def get_class_admin(class_pair, tuned=False, per_page=100):
     """
     Code to add a single class to admin page
     :param class_pair:
+    :param tuned: whether to register a ModelAdmin tuned for large tables (if the model was loaded)
+    :param per_page: the number of rows per page of the tuned changelist
     :return:
     """
     if class_pair[0] == "User":
         return ""
+    model = introspect.get_class_model(class_pair)
+    if tuned and model is not None:
+        return get_class_model_admin(class_pair[0], model, per_page=per_page)
     content = f"admin.site.register({class_pair[0]})\n"
     return content
 
 
-def get_admin_imports(app_path):
+def get_class_model_admin(class_name, model, per_page=100):
+    """
+    Get the ModelAdmin of a single class tuned for large tables: the changelist only shows the indexed columns
+    (joining the related objects), does not count all the rows and is bounded to per_page rows, and the relations
+    are edited with raw id or autocomplete widgets instead of select boxes listing all the related rows
+    :param class_name:
+    :param model: the model class
+    :param per_page: the number of rows per page of the changelist
+    :return: str
+    """
+    list_display = introspect.get_admin_list_display(model)
+    select_related = [name for name in list_display if model._meta.get_field(name).is_relation]
+    search_fields = introspect.get_admin_search_fields(model)
+    raw_id_fields = []
+    autocomplete_fields = []
+    for field in introspect.get_admin_relations(model):
+        related_model = field.related_model
+        # the autocomplete needs the admin of the related model, with search fields
+        if hasattr(related_model, "_meta") and related_model._meta.app_label == model._meta.app_label \
+                and related_model._meta.object_name != "User" and introspect.get_admin_search_fields(related_model):
+            autocomplete_fields.append(field.name)
+        else:
+            raw_id_fields.append(field.name)
+    content = f"\nclass {class_name}Admin(admin.ModelAdmin):\n"
+    for name, value in [("list_display", list_display), ("list_select_related", select_related),
+                        ("search_fields", search_fields), ("raw_id_fields", raw_id_fields),
+                        ("autocomplete_fields", autocomplete_fields)]:
+        if value:
+            content += f"    {name} = {value}\n"
+    content += f"""    list_per_page = {per_page}
+    list_max_show_all = {per_page}
+    show_full_result_count = False
+
+
+admin.site.register({class_name}, {class_name}Admin)\n"""
+    return content
+
+
+def get_admin_imports(app_path, app_name=None):
     """
     Generate admin imports
     :param app_path:
+    :param app_name: the app module name (default: guessed from the app path)
     :return:
     """
-    app_name = app_path.split(os.sep)[-1]
+    if not app_name:
+        app_name = app_path.split(os.sep)[-1]
     content = f"from django.contrib import admin\nfrom {app_name}.models import *\n\n"
     return content
 
 
-def write_admin(classes, app_path, admin_path):
+def get_admin_regions(classes, app_name, tuned=False, per_page=100):
+    """
+    Get the regions of admin.py
+    :param classes:
+    :param app_name:
+    :param tuned: whether to register ModelAdmins tuned for large tables
+    :param per_page: the number of rows per page of the tuned changelists
+    :return: list of (region name, function returning the region content)
+    """
+    regions = [("@header", partial(get_admin_imports, app_name, app_name=app_name))]
+    for c in classes:
+        if c[0] != "User":
+            regions.append((c[0], partial(get_class_admin, c, tuned=tuned, per_page=per_page)))
+    return regions
+
+
+def write_admin(classes, app_path, admin_path, tuned=False, per_page=100, app_name=None, overwrite=False, diff=False):
     """
     Writes the admin.py from the given classes
     :param classes:
     :param app_path:
     :param admin_path:
+    :param tuned: whether to register ModelAdmins tuned for large tables
+    :param per_page: the number of rows per page of the tuned changelists
+    :param app_name: the app module name used in the imports (default: guessed from the app path)
+    :param overwrite: whether to replace the file if it is not empty
+    :param diff: whether to only print the diff against the current file
     :return:
     """
+    empty = utils.empty_fpath(admin_path)
+    regions = get_admin_regions(classes, app_name or app_path.split(os.sep)[-1], tuned=tuned, per_page=per_page)
+    render.write_file(admin_path, render.join_regions(regions), write=empty or overwrite, diff=diff)
+
+
+def get_class_signals(class_pair, classes):
+    """
+    Code of the signal receivers that invalidate the cached responses of a single class
+    :param class_pair:
+    :param classes: all the generated classes
+    :return:
+    """
+    class_name = class_pair[0]
+    model = introspect.get_class_model(class_pair)
+    func_name = get_class_url_name(class_pair[2])
+    models_names = {introspect.get_class_model(c): c[0] for c in classes}
+    dependents = introspect.get_dependent_models(model, list(models_names.keys()))
+    bumped = ", ".join([class_name] + [models_names[d] for d in dependents])
     content = ""
+    if dependents:
+        # for the bulk writes, which do not send the signals (see BulkCacheInvalidationMixin)
+        content += f"\nCACHE_DEPENDENTS[{class_name}] = [{', '.join(models_names[d] for d in dependents)}]\n\n"
+    content += f"""
+@receiver([post_save, post_delete], sender={class_name})
+def {func_name}_changed(sender, **kwargs):
+    bump_cache_version({bumped})\n\n"""
+    for field_name in introspect.get_many_to_many_fields(model):
+        content += f"""
+@receiver(m2m_changed, sender={class_name}.{field_name}.through)
+def {func_name}_{field_name}_changed(sender, **kwargs):
+    bump_cache_version({class_name})\n\n"""
+    return content
+
+
+def get_signals_imports(app_name):
+    """
+    Get the imports and the helpers of signals.py
+    :param app_name:
+    :return: str
+    """
+    return f"from {app_name}.models import *\n" + snippets.CACHE_SIGNALS
+
+
+def get_signals_regions(classes, app_name):
+    """
+    Get the regions of signals.py
+    :param classes:
+    :param app_name:
+    :return: list of (region name, function returning the region content)
+    """
+    regions = [("@header", partial(get_signals_imports, app_name))]
     for c in classes:
-        content += get_class_admin(c)
-    empty = utils.empty_fpath(admin_path)
-    content = get_admin_imports(app_path) + content
-    if empty:
-        with open(admin_path, "a") as f:
-            f.write(content)
+        regions.append((c[0], partial(get_class_signals, c, classes)))
+    return regions
+
+
+def write_signals(classes, app_path, signals_path, app_name=None, overwrite=False, diff=False):
+    """
+    Writes the signals.py that invalidates the cached responses on changes
+    :param classes:
+    :param app_path:
+    :param signals_path:
+    :param app_name: the app module name used in the imports (default: guessed from the app path)
+    :param overwrite: whether to replace the file if it is not empty
+    :param diff: whether to only print the diff against the current file
+    :return:
+    """
+    empty = utils.empty_fpath(signals_path)
+    regions = get_signals_regions(classes, app_name or get_app_name(app_path))
+    render.write_file(signals_path, render.join_regions(regions), write=empty or overwrite, diff=diff)
+
+
+def is_signals_imported(app_path):
+    """
+    Whether the apps.py of the app imports signals.py (e.g., in AppConfig.ready()), so the receivers are connected
+    even if the views are not imported (e.g., in management commands)
+    :param app_path:
+    :return: bool
+    """
+    apps_path = os.path.join(app_path, "apps.py")
+    if not os.path.exists(apps_path):
+        return False
+    with open(apps_path) as f:
+        return "signals" in f.read()
+
+
+def get_routers_code(app_name, replicas=None, replica_weights=None):
+    """
+    Get the code of routers.py
+    :param app_name:
+    :param replicas: list of the replica database aliases (read in a round-robin)
+    :param replica_weights: dict of the weight per replica alias (a weighted random choice instead of round-robin)
+    :return: str
+    """
+    if replica_weights:
+        aliases = list(dict.fromkeys(list(replicas or []) + list(replica_weights)))
+        databases = {alias: replica_weights.get(alias, 1) for alias in aliases}
     else:
-        print("\n\n\n\n=========================== admin.py ===========================\n\n")
-        print(content)
+        databases = list(replicas or [])
+    return f'''"""
+Route the reads of the GET and HEAD requests of the generated views to the read replicas. Enable it in the settings:
+
+DATABASE_ROUTERS = ["{app_name}.routers.ReplicaRouter"]
+
+The replicas can be changed without editing this file with the REPLICA_DATABASES setting: a list of aliases (read
+in a round-robin) or a dict of the weight per alias (weighted random choice). The aliases that are not in DATABASES
+are ignored, so the reads use the primary database if there is no replica.
+"""
+import itertools
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DATABASES = {databases!r}
+''' + snippets.REPLICA_ROUTER
+
+
+def get_routers_regions(app_name, replicas=None, replica_weights=None):
+    """
+    Get the regions of routers.py (it does not depend on the models)
+    :param app_name:
+    :param replicas: list of the replica database aliases
+    :param replica_weights: dict of the weight per replica alias
+    :return: list of (region name, function returning the region content)
+    """
+    return [("@header", partial(get_routers_code, app_name, replicas=replicas, replica_weights=replica_weights))]
 
 
-def write_dummy(classes, app_path, dummy_path, overwrite):
+def write_routers(app_path, routers_path, replicas=None, replica_weights=None, app_name=None, overwrite=False,
+                  diff=False):
+    """
+    Writes the routers.py that sends the reads of the generated views to the read replicas
+    :param app_path:
+    :param routers_path:
+    :param replicas: list of the replica database aliases (read in a round-robin)
+    :param replica_weights: dict of the weight per replica alias (a weighted random choice instead of round-robin)
+    :param app_name: the app module name used in the settings example (default: guessed from the app path)
+    :param overwrite: whether to replace the file if it is not empty
+    :param diff: whether to only print the diff against the current file
+    :return:
     """
+    empty = utils.empty_fpath(routers_path)
+    regions = get_routers_regions(app_name or get_app_name(app_path), replicas=replicas,
+                                  replica_weights=replica_weights)
+    render.write_file(routers_path, render.join_regions(regions), write=empty or overwrite, diff=diff)
+
 
+def get_class_tests(class_pair, fast_list=False):
+    """
+    Code of the query count tests of a single class
+    :param class_pair:
+    :param fast_list: whether to check the list rendered using values() against the serializer
+    :return:
+    """
+    url_name = get_class_url_name(class_pair[2], joiner="-")
+    mixins = "ValuesListTestMixin, " if fast_list else ""
+    content = f"""
+class {class_pair[0]}QueryCountTests({mixins}QueryCountTestMixin, APITestCase):
+    model = {class_pair[0]}
+    url_name = "{url_name}"\n\n"""
+    return content
+
+
+def get_tests_regions(classes, app_name, fast_list=False):
+    """
+    Get the regions of tests_api.py
+    :param classes:
+    :param app_name:
+    :param fast_list: whether to check the lists rendered using values() against the serializers
+    :return: list of (region name, function returning the region content)
+    """
+    header = f"from {app_name}.models import *\n"
+    if fast_list:
+        header += "\n".join(snippets.VALUES_LIST_TESTS_IMPORTS) + "\n"
+    header += snippets.QUERY_COUNT_TESTS
+    if fast_list:
+        header += snippets.VALUES_LIST_TESTS
+    regions = [("@header", partial(str, header))]
+    for c in classes:
+        regions.append((c[0], partial(get_class_tests, c, fast_list=fast_list)))
+    return regions
+
+
+def write_tests(classes, app_path, tests_path, app_name=None, fast_list=False, overwrite=False, diff=False):
+    """
+    Writes the tests_api.py that fails if the number of queries of the endpoints grows with the number of rows
     :param classes:
     :param app_path:
-    :param dummy_path:
-    :param overwrite:
+    :param tests_path:
+    :param app_name: the app module name used in the imports (default: guessed from the app path)
+    :param fast_list: whether to check the lists rendered using values() against the serializers
+    :param overwrite: whether to replace the file if it is not empty
+    :param diff: whether to only print the diff against the current file
+    :return:
+    """
+    empty = utils.empty_fpath(tests_path)
+    regions = get_tests_regions(classes, app_name or get_app_name(app_path), fast_list=fast_list)
+    render.write_file(tests_path, render.join_regions(regions), write=empty or overwrite, diff=diff)
+
+
+def get_loadtest_imports(app_name, app_label):
+    """
+    Get the usage, the imports and the app label of loadtest.py
+    :param app_name:
+    :param app_label:
+    :return: str
+    """
+    content = f'''"""
+Load test of the generated endpoints. It prints the latency percentiles, the throughput and a latency histogram of
+each route. Run it from the project directory, e.g.,
+
+    python -m {app_name}.loadtest --settings proj.settings                 (in-process, WSGI)
+    python -m {app_name}.loadtest --settings proj.settings --asgi          (in-process, ASGI)
+    python -m {app_name}.loadtest --settings proj.settings --base-url http://127.0.0.1:8000
+
+The detail routes request the first rows of the database (e.g., generated using dummygen.py).
+"""
+import argparse
+import asyncio
+import bisect
+import math
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import django
+from django.apps import apps
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment
+from django.urls import NoReverseMatch, reverse
+
+APP_LABEL = "{app_label}"
+
+# (route name, model name of the detail routes)
+ROUTES = [\n'''
+    return content
+
+
+def get_class_load_routes(class_pair):
+    """
+    The load test routes of a single class
+    :param class_pair:
+    :return:
+    """
+    url_name = get_class_url_name(class_pair[2], joiner="-")
+    content = f"""    ("{url_name}-list", None),
+    ("{url_name}-detail", "{class_pair[0]}"),\n"""
+    return content
+
+
+def get_loadtest_regions(classes, app_name, app_label):
+    """
+    Get the regions of loadtest.py
+    :param classes:
+    :param app_name:
+    :param app_label:
+    :return: list of (region name, function returning the region content)
+    """
+    regions = [("@header", partial(get_loadtest_imports, app_name, app_label))]
+    for c in classes:
+        regions.append((c[0], partial(get_class_load_routes, c)))
+    regions.append(("@footer", partial(str, "]\n" + snippets.LOAD_TEST)))
+    return regions
+
+
+def write_loadtest(classes, app_path, loadtest_path, app_name=None, app_label=None, overwrite=False, diff=False):
+    """
+    Writes the loadtest.py that measures the latency of the list and detail routes
+    :param classes:
+    :param app_path:
+    :param loadtest_path:
+    :param app_name: the app module name (default: guessed from the app path)
+    :param app_label: the django app label (default: guessed from the app path)
+    :param overwrite: whether to replace the file if it is not empty
+    :param diff: whether to only print the diff against the current file
     :return:
     """
-    content = "from model_bakery import baker\nfrom django.contrib.auth.models import User\n\n"
-    content += "def run(*args):\n"
-    app_name = app_path.split(os.sep)[-1]
+    empty = utils.empty_fpath(loadtest_path)
+    app_name = app_name or get_app_name(app_path)
+    regions = get_loadtest_regions(classes, app_name, app_label or app_name.split(".")[-1])
+    render.write_file(loadtest_path, render.join_regions(regions), write=empty or overwrite, diff=diff)
+
+
+def get_dummy_models(classes, app_label, dummy_count=10, dummy_counts=None):
+    """
+    Get the models of dummygen.py ordered by their ForeignKey dependencies
+    :param classes:
+    :param app_label: the django app label
+    :param dummy_count: the default number of rows per model
+    :param dummy_counts: dict of the number of rows per class name
+    :return: list of (model label, number of rows)
+    """
+    models_list = [introspect.get_class_model(c) for c in classes]
+    if None not in models_list:
+        order = {model: i for i, model in enumerate(introspect.get_dependency_order(models_list))}
+        classes = [c for _, c in sorted(zip(models_list, classes), key=lambda pair: order[pair[0]])]
+    labels = []
     for c in classes:
-        if c[0] == "User":
-            line = f"\tbaker.make({c[0]})\n"
+        model = introspect.get_class_model(c)
+        if model is not None:
+            label = model._meta.label
+        elif c[0] == "User":
+            label = "auth.User"
         else:
-            line = f"\tbaker.make('{app_name}.{c[0]}')\n"
-        content += line
+            label = f"{app_label}.{c[0]}"
+        labels.append((label, (dummy_counts or {}).get(c[0], dummy_count)))
+    return labels
+
+
+def write_dummy(classes, app_path, dummy_path, overwrite, app_label=None, diff=False, dummy_count=10,
+                dummy_counts=None, dummy_batch_size=1000):
+    """
+    Writes the dummygen.py that creates dummy rows with bulk inserts, parents first
+    :param classes:
+    :param app_path:
+    :param dummy_path:
+    :param overwrite:
+    :param app_label: the django app label (default: guessed from the app path)
+    :param diff: whether to only print the diff against the current file
+    :param dummy_count: the default number of rows per model
+    :param dummy_counts: dict of the number of rows per class name
+    :param dummy_batch_size: the default batch size of the inserts
+    :return:
+    """
+    app_name = app_label or app_path.split(os.sep)[-1]
+    lines = [f'''"""
+Create dummy rows, e.g., python manage.py runscript dummygen --script-args Book=100000 count=1000 batch=5000
+The models are created in the order below (the models referenced by a ForeignKey first) using bulk_create, and the
+relations reference random existing rows.
+"""
+import random
+from django.apps import apps
+from django.db import transaction
+from model_bakery import baker
+
+DEFAULT_BATCH_SIZE = {dummy_batch_size}
+# The maximum number of existing rows loaded to be referenced by the relations
+MAX_PARENT_PKS = 100000
+# The number of rows made for a referenced model that has none
+MISSING_PARENTS = 10
+# The average number of many-to-many links per row
+M2M_PER_OBJECT = 3
+
+# (model label, number of rows)
+MODELS = [\n''']
+    for label, count in get_dummy_models(classes, app_name, dummy_count=dummy_count, dummy_counts=dummy_counts):
+        lines.append(f"    (\"{label}\", {count}),\n")
+    lines.append("]\n")
+    lines.append(snippets.DUMMY_DATA)
     empty = utils.empty_fpath(dummy_path)
-    if empty or overwrite:
-        with open(dummy_path, "w") as f:
-            f.write(content)
-    else:
-        print(content)
+    render.write_file(dummy_path, "".join(lines), write=empty or overwrite, diff=diff)
 
 
 def get_curr_path():
@@ -355,54 +1381,244 @@ def get_curr_path():
     return p
 
 
-def guess_app_path(curr_path=None):
+def guess_app_path(curr_path=None, prune=None, max_depth=scanner.DEFAULT_MAX_DEPTH, use_cache=True):
+    """
+    Guess the app path (the shallowest directory with a models.py)
+    :param curr_path: the project directory (default: the current directory)
+    :param prune: directory names to skip. None means scanner.DEFAULT_PRUNE
+    :param max_depth: the maximum directory depth to enter
+    :param use_cache: whether to use the cached project scan
+    :return: the app path or None
+    """
     if not curr_path:
         curr_path = get_curr_path()
-
-    dirs = []
-    files = dict()
-    for fp in os.listdir(curr_path):
-        fp_path = os.path.join(curr_path, fp)
-        if os.path.isdir(fp_path):
-            dirs.append(fp_path)
-        elif os.path.isfile(fp_path):
-            files[fp] = fp_path
-
-    if "models.py" in files: # and "views.py" in files:
-        with open(files["models.py"]) as f:
-            text = f.read()
-            if len(text) > 50:
-                return curr_path
-
-    for d in dirs:
-        guessed = guess_app_path(os.path.join(curr_path, d))
-        if guessed:
-            return guessed
-
+    apps = scanner.scan_project(curr_path, prune=prune, max_depth=max_depth, use_cache=use_cache)["apps"]
+    if apps:
+        return apps[0]
     return None
 
 
-def guess_settings_path(curr_path=None):
+def guess_settings_path(curr_path=None, prune=None, max_depth=scanner.DEFAULT_MAX_DEPTH, use_cache=True):
+    """
+    Guess the settings path (the shallowest settings.py)
+    :param curr_path: the project directory (default: the current directory)
+    :param prune: directory names to skip. None means scanner.DEFAULT_PRUNE
+    :param max_depth: the maximum directory depth to enter
+    :param use_cache: whether to use the cached project scan
+    :return: the settings path or None
+    """
     if not curr_path:
         curr_path = get_curr_path()
+    settings = scanner.scan_project(curr_path, prune=prune, max_depth=max_depth, use_cache=use_cache)["settings"]
+    if settings:
+        return settings[0]
+    return None
 
-    dirs = []
-    for fp in os.listdir(curr_path):
-        fp_path = os.path.join(curr_path, fp)
-        if os.path.isdir(fp_path):
-            dirs.append(fp_path)
-        elif os.path.isfile(fp_path) and fp == "settings.py":
-            return fp_path
-
-    for d in dirs:
-        guessed = guess_settings_path(d)
-        if guessed:
-            return guessed
 
-    return None
+def get_app_regions(classes, app_name, app_label=None, relation_depth=0, pagination=None, paginations=None,
+                    page_size=100, max_page_size=1000, count_threshold=10000, sparse=False, explicit_fields=False,
+                    conditional=False, cache=False, cache_ttl=60, cache_ttls=None, bulk=False, bulk_batch_size=500,
+                    filters=False, async_views=False, fast_list=False, export=False, export_chunk_size=2000,
+                    batch=False, batch_max_size=100, replicas=None, replica_weights=None, tuned_admin=False,
+                    admin_per_page=100, tests=False, loadtest=False):
+    """
+    Get the generated regions of each file of the app. The regions are rendered lazily so the unchanged models are
+    not rendered again.
+    :param classes: as returned by get_classes or get_app_classes
+    :param app_name: the app module name used in the imports
+    :param app_label: the django app label (default: the last part of the app name)
+    :param relation_depth: the generation options (see generate_app)
+    :param pagination:
+    :param paginations:
+    :param page_size:
+    :param max_page_size:
+    :param count_threshold:
+    :param sparse:
+    :param explicit_fields:
+    :param conditional:
+    :param cache:
+    :param cache_ttl:
+    :param cache_ttls:
+    :param bulk:
+    :param bulk_batch_size:
+    :param filters:
+    :param async_views:
+    :param fast_list:
+    :param export:
+    :param export_chunk_size:
+    :param batch:
+    :param batch_max_size:
+    :param replicas:
+    :param replica_weights:
+    :param tuned_admin:
+    :param admin_per_page:
+    :param tests:
+    :param loadtest:
+    :return: dict of the list of (region name, function returning the region content) per file name
+    """
+    replica = bool(replicas or replica_weights)
+    files = {
+        "serializers.py": get_serializers_regions(classes, app_name, sparse=sparse,
+                                                  explicit_fields=explicit_fields),
+        "views.py": get_views_regions(classes, app_name, relation_depth=relation_depth, pagination=pagination,
+                                      paginations=paginations, page_size=page_size, max_page_size=max_page_size,
+                                      count_threshold=count_threshold, sparse=sparse,
+                                      conditional=conditional, cache=cache, cache_ttl=cache_ttl,
+                                      cache_ttls=cache_ttls, bulk=bulk, bulk_batch_size=bulk_batch_size,
+                                      filters=filters, async_views=async_views, fast_list=fast_list,
+                                      export=export, export_chunk_size=export_chunk_size, batch=batch,
+                                      batch_max_size=batch_max_size, replica=replica),
+        "urls.py": get_urls_regions(classes, app_name, bulk=bulk, export=export, batch=batch),
+        "admin.py": get_admin_regions(classes, app_name, tuned=tuned_admin, per_page=admin_per_page),
+    }
+    if cache:
+        files["signals.py"] = get_signals_regions(classes, app_name)
+    if replica:
+        files["routers.py"] = get_routers_regions(app_name, replicas=replicas, replica_weights=replica_weights)
+    if tests:
+        files["tests_api.py"] = get_tests_regions(classes, app_name, fast_list=fast_list and not async_views)
+    if loadtest:
+        files["loadtest.py"] = get_loadtest_regions(classes, app_name, app_label or app_name.split(".")[-1])
+    return files
+
+
+def generate_app_incremental(classes, app_path, overwrite, app_name=None, diff=False, **options):
+    """
+    Regenerate the code of a single app inside the marked regions only. Only the regions of the models that were
+    added, changed or removed since the previous generation (see the manifest) are rendered again.
+    :param classes: as returned by get_classes or get_app_classes
+    :param app_path: the directory of the app
+    :param overwrite: bool. Whether to replace the files that do not have generated regions yet
+    :param app_name: the app module name used in the imports (default: guessed from the app path)
+    :param diff: bool. Whether to only print the diff of the files (nothing is written)
+    :param options: the generation options (see generate_app)
+    :return: dict of the updated region names per file name
+    """
+    app_name = app_name or get_app_name(app_path)
+    files = get_app_regions(classes, app_name, **options)
+    relation_depth = options.get("relation_depth", 0)
+    fingerprints = {c[0]: incremental_regions.get_model_fingerprint(c, relation_depth=relation_depth)
+                    for c in classes}
+    options = dict(options, app_name=app_name)
+    return incremental_regions.update_app(app_path, files, fingerprints, options, overwrite=overwrite, diff=diff)
+
+
+def generate_app(classes, app_path, overwrite, dummy, app_name=None, app_label=None, relation_depth=0,
+                 pagination=None, paginations=None, page_size=100, max_page_size=1000, count_threshold=10000,
+                 sparse=False, explicit_fields=False, conditional=False, cache=False, cache_ttl=60, cache_ttls=None,
+                 bulk=False, bulk_batch_size=500, filters=False, async_views=False, fast_list=False, export=False,
+                 export_chunk_size=2000, batch=False, batch_max_size=100, replicas=None, replica_weights=None,
+                 tuned_admin=False, admin_per_page=100, tests=False, loadtest=False, dummy_count=10, dummy_counts=None,
+                 dummy_batch_size=1000, index_advisor=False, index_migration=False, incremental=False, diff=False):
+    """
+    Generate the code of a single app
+    :param classes: as returned by get_classes or get_app_classes
+    :param app_path: the directory of the app
+    :param overwrite: bool
+    :param dummy: bool
+    :param app_name: the app module name used in the imports (default: guessed from the app path)
+    :param app_label: the django app label (default: guessed from the app path)
+    :param relation_depth: int. The maximum relation depth for select_related (0 to disable)
+    :param pagination: None, "cursor", "nocount" or "estimated"
+    :param paginations: dict. The pagination per class name (overrides pagination)
+    :param page_size: int
+    :param max_page_size: int
+    :param count_threshold: int. The number of rows above which the estimated pagination returns the estimated count
+    :param sparse: bool. Whether to support sparse fieldsets (?fields= and ?omit=)
+    :param explicit_fields: bool. Whether the serializers declare the fields resolved from the models instead of
+    fields = '__all__'
+    :param conditional: bool. Whether to support conditional GET (ETag/Last-Modified)
+    :param cache: bool. Whether to cache the responses of GET requests
+    :param cache_ttl: int. The default cache timeout (in seconds)
+    :param cache_ttls: dict of the cache timeout per class name
+    :param bulk: bool. Whether to generate the bulk create/update/delete views
+    :param bulk_batch_size: int. The batch size of the bulk writes
+    :param filters: bool. Whether the list views can be filtered on the indexed fields (?field=, ?field__gte=)
+    :param async_views: bool. Whether to generate async list, detail and root views (Django >= 4.1)
+    :param fast_list: bool. Whether the list views render the rows fetched using values() instead of the serializers
+    :param export: bool. Whether to generate the streaming export views (NDJSON or JSON array)
+    :param export_chunk_size: int. The number of rows fetched (and serialized) at once by the export views
+    :param batch: bool. Whether to generate the batch retrieve views (/batch/?ids=1,2,3)
+    :param batch_max_size: int. The maximum number of ids of a batch
+    :param replicas: list of the replica database aliases the GET and HEAD requests read from (round-robin)
+    :param replica_weights: dict of the weight per replica alias (weighted random choice instead of round-robin)
+    :param tuned_admin: bool. Whether to register ModelAdmins tuned for large tables instead of the default ones
+    :param admin_per_page: int. The number of rows per page of the tuned admin changelists
+    :param tests: bool. Whether to generate the query count tests of the endpoints (tests_api.py)
+    :param loadtest: bool. Whether to generate the load test script of the endpoints (loadtest.py)
+    :param dummy_count: int. The default number of rows per model of dummygen.py
+    :param dummy_counts: dict of the number of rows of dummygen.py per class name
+    :param dummy_batch_size: int. The default batch size of the inserts of dummygen.py
+    :param index_advisor: bool. Whether to report the fields used by the endpoints that are not indexed
+    :param index_migration: bool. Whether to write the migration adding the missing indexes
+    :param incremental: bool. Whether to only regenerate the marked regions of the changed models
+    :param diff: bool. Whether to only print the diff of the generated files against the current ones
+    :return:
+    """
+    serializers_path = os.path.join(app_path, "serializers.py")
+    views_path = os.path.join(app_path, "views.py")
+    urls_path = os.path.join(app_path, "urls.py")
+    admin_path = os.path.join(app_path, "admin.py")
+    dummy_path = os.path.join(app_path, "dummygen.py")
+    signals_path = os.path.join(app_path, "signals.py")
+    tests_path = os.path.join(app_path, "tests_api.py")
+    loadtest_path = os.path.join(app_path, "loadtest.py")
+    routers_path = os.path.join(app_path, "routers.py")
+    replica = bool(replicas or replica_weights)
+    if cache and not is_signals_imported(app_path):
+        print(f"Import signals.py in the ready() method of the AppConfig ({os.path.join(app_path, 'apps.py')}), "
+              f"otherwise the writes made before the views are imported do not invalidate the cache:\n"
+              f"    def ready(self):\n        from . import signals  # noqa: F401")
+    if index_advisor or index_migration:
+        indexes.write_indexes(classes, app_path, app_label=app_label, pagination=pagination, paginations=paginations,
+                              conditional=conditional, migration=index_migration, overwrite=overwrite, diff=diff)
+    if incremental:
+        generate_app_incremental(classes, app_path, overwrite, app_name=app_name, app_label=app_label,
+                                 relation_depth=relation_depth, pagination=pagination, paginations=paginations,
+                                 page_size=page_size, max_page_size=max_page_size, count_threshold=count_threshold,
+                                 sparse=sparse, explicit_fields=explicit_fields, conditional=conditional,
+                                 cache=cache, cache_ttl=cache_ttl,
+                                 cache_ttls=cache_ttls, bulk=bulk, bulk_batch_size=bulk_batch_size, filters=filters,
+                                 async_views=async_views, fast_list=fast_list, export=export,
+                                 export_chunk_size=export_chunk_size, batch=batch, batch_max_size=batch_max_size,
+                                 replicas=replicas, replica_weights=replica_weights, tuned_admin=tuned_admin,
+                                 admin_per_page=admin_per_page, tests=tests, loadtest=loadtest, diff=diff)
+        if dummy:
+            write_dummy(classes, app_path, dummy_path, overwrite, app_label=app_label, diff=diff,
+                        dummy_count=dummy_count, dummy_counts=dummy_counts, dummy_batch_size=dummy_batch_size)
+        return
+    write_serializers(classes=classes, serializers_path=serializers_path, app_path=app_path, sparse=sparse,
+                      explicit_fields=explicit_fields, app_name=app_name, overwrite=overwrite, diff=diff)
+    write_views(classes=classes, views_path=views_path, app_path=app_path, relation_depth=relation_depth,
+                pagination=pagination, paginations=paginations, page_size=page_size, max_page_size=max_page_size,
+                count_threshold=count_threshold, sparse=sparse,
+                conditional=conditional, cache=cache, cache_ttl=cache_ttl, cache_ttls=cache_ttls, bulk=bulk,
+                bulk_batch_size=bulk_batch_size, filters=filters, async_views=async_views, fast_list=fast_list,
+                export=export, export_chunk_size=export_chunk_size, batch=batch, batch_max_size=batch_max_size,
+                replica=replica, app_name=app_name, overwrite=overwrite, diff=diff)
+    write_urls(classes=classes, app_path=app_path, urls_path=urls_path, bulk=bulk, export=export, batch=batch,
+               app_name=app_name, overwrite=overwrite, diff=diff)
+    write_admin(classes=classes, app_path=app_path, admin_path=admin_path, tuned=tuned_admin, per_page=admin_per_page,
+                app_name=app_name, overwrite=overwrite, diff=diff)
+    if cache:
+        write_signals(classes=classes, app_path=app_path, signals_path=signals_path, app_name=app_name,
+                      overwrite=overwrite, diff=diff)
+    if replica:
+        write_routers(app_path=app_path, routers_path=routers_path, replicas=replicas,
+                      replica_weights=replica_weights, app_name=app_name, overwrite=overwrite, diff=diff)
+    if tests:
+        write_tests(classes=classes, app_path=app_path, tests_path=tests_path, app_name=app_name,
+                    fast_list=fast_list and not async_views, overwrite=overwrite, diff=diff)
+    if loadtest:
+        write_loadtest(classes=classes, app_path=app_path, loadtest_path=loadtest_path, app_name=app_name,
+                       app_label=app_label, overwrite=overwrite, diff=diff)
+    if dummy:
+        write_dummy(classes, app_path, dummy_path, overwrite, app_label=app_label, diff=diff, dummy_count=dummy_count,
+                    dummy_counts=dummy_counts, dummy_batch_size=dummy_batch_size)
 
 
-def workflow(python_path, app_path, settings_fpath, overwrite, dummy):
+def workflow(python_path, app_path, settings_fpath, overwrite, dummy, apps=None, all_apps=False, prune=None,
+             max_depth=scanner.DEFAULT_MAX_DEPTH, scan_cache=True, static=False, **options):
     """
     This includes the main workflow of the API generator.
     :param python_path:
@@ -410,37 +1626,56 @@ def workflow(python_path, app_path, settings_fpath, overwrite, dummy):
     :param settings_fpath:
     :param overwrite: bool
     :param dummy: bool
+    :param apps: list of app labels to generate the code for (django is setup once for all of them)
+    :param all_apps: bool. Whether to generate the code for all the apps inside the project
+    :param prune: list of directory names to skip when guessing the paths. None means scanner.DEFAULT_PRUNE
+    :param max_depth: int. The maximum directory depth to enter when guessing the paths
+    :param scan_cache: bool. Whether to use the cached project scan when guessing the paths
+    :param static: bool. Whether to parse the models source code instead of importing them (no django setup)
+    :param options: the generation options (see generate_app)
     :return:
     """
-    if not app_path:
-        app_path = guess_app_path()
+    ignored = get_async_ignored_options(options)
+    if ignored:
+        print(f"Warning: {', '.join(ignored)} do not apply to the async list and detail views (--async)")
+    multi_apps = bool(apps) or all_apps
+    if static and multi_apps:
+        raise Exception("The static mode does not support multiple apps")
+    scan = dict()
+    if (not app_path and not multi_apps) or (not settings_fpath and not static):
+        scan = scanner.scan_project(get_curr_path(), prune=prune, max_depth=max_depth, use_cache=scan_cache)
+
+    if not app_path and not multi_apps:
+        app_path = scan["apps"][0] if scan["apps"] else None
         if app_path is None:
             raise Exception("Unable to detect app path.")
         else:
             print(f"Guessed app path: {app_path}")
 
+    if static:
+        models_fpath = os.path.join(app_path, "models.py")
+        if not os.path.exists(models_fpath):
+            models_fpath = os.path.join(app_path, "models")
+        classes = static_models.get_static_classes(models_fpath)
+        generate_app(classes, app_path, overwrite, dummy, **options)
+        return
+
     if not settings_fpath:
-        settings_fpath = guess_settings_path()
+        settings_fpath = scan["settings"][0] if scan["settings"] else None
         if settings_fpath is None:
             raise Exception("Unable to detect settings path")
         else:
             print(f"Guessed settings path: {settings_fpath}")
 
+    if multi_apps:
+        setup_django(python_path=python_path, settings_fpath=settings_fpath)
+        for app_config in get_app_configs(python_path, app_labels=apps):
+            print(f"Generating app: {app_config.name}")
+            generate_app(get_app_classes(app_config), app_config.path, overwrite, dummy, app_name=app_config.name,
+                         app_label=app_config.label, **options)
+        return
+
     models_fpath = os.path.join(app_path, "models.py")
-    serializers_path = os.path.join(app_path, "serializers.py")
-    views_path = os.path.join(app_path, "views.py")
-    urls_path = os.path.join(app_path, "urls.py")
-    admin_path = os.path.join(app_path, "admin.py")
-    dummy_path = os.path.join(app_path, "dummygen.py")
-    if overwrite:
-        for fpath in [serializers_path, views_path, urls_path, admin_path]:
-            with open(fpath, 'w') as f:
-                f.write('')
     models_obj = load_models(python_path=python_path, settings_fpath=settings_fpath, models_fpath=models_fpath)
     classes = get_classes(models_obj)
-    write_serializers(classes=classes, serializers_path=serializers_path, app_path=app_path)
-    write_views(classes=classes, views_path=views_path, app_path=app_path)
-    write_urls(classes=classes, app_path=app_path, urls_path=urls_path)
-    write_admin(classes=classes, app_path=app_path, admin_path=admin_path)
-    if dummy:
-        write_dummy(classes, app_path, dummy_path, overwrite)
\ No newline at end of file
+    generate_app(classes, app_path, overwrite, dummy, **options)
@@ -0,0 +1,126 @@
+from django.db import models
+from django.utils.functional import Promise
+
+# The lazy (translated) field arguments that are read from the model field in the generated code
+LAZY_ATTRIBUTES = {
+    "label": "capfirst({model}._meta.get_field('{name}').verbose_name)",
+    "help_text": "{model}._meta.get_field('{name}').help_text",
+}
+
+
+def is_django_model(model):
+    return isinstance(model, type) and issubclass(model, models.Model)
+
+
+def get_queryset_code(queryset, model):
+    """
+    Get the code of a queryset argument (e.g., of a related field or a unique validator)
+    :param queryset: a manager or an unfiltered queryset
+    :param model: the serialized model (the querysets of models of other apps are not imported)
+    :return: str or None if it can not be declared
+    """
+    if isinstance(queryset, models.QuerySet):
+        if queryset.query.where or queryset.query.is_sliced:
+            return None
+        code = f"{queryset.model._default_manager.name}.all()"
+    elif isinstance(queryset, models.Manager):
+        # ModelSerializer passes the default manager
+        code = queryset.name
+    else:
+        return None
+    related_model = queryset.model
+    if related_model._meta.app_label != model._meta.app_label or related_model._meta.proxy:
+        return None
+    return f"{related_model._meta.object_name}.{code}"
+
+
+def get_value_code(value, model, name=None, key=None):
+    """
+    Get the code of an argument of a serializer field
+    :param value:
+    :param model: the serialized model
+    :param name: the serializer field name
+    :param key: the argument name
+    :return: str or None if it can not be declared
+    """
+    from rest_framework import fields
+    from rest_framework.validators import UniqueValidator
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return repr(value)
+    if isinstance(value, Promise):
+        if key in LAZY_ATTRIBUTES and name in {f.name for f in model._meta.get_fields()}:
+            return LAZY_ATTRIBUTES[key].format(model=model._meta.object_name, name=name)
+        return None
+    if isinstance(value, (list, tuple)):
+        items = [get_value_code(item, model) for item in value]
+        if None in items:
+            return None
+        if isinstance(value, tuple):
+            return "(" + ", ".join(items) + ("," if len(items) == 1 else "") + ")"
+        return "[" + ", ".join(items) + "]"
+    if isinstance(value, dict):
+        items = [(get_value_code(k, model), get_value_code(v, model)) for k, v in value.items()]
+        if any(k is None or v is None for k, v in items):
+            return None
+        return "{" + ", ".join(f"{k}: {v}" for k, v in items) + "}"
+    if isinstance(value, (models.Manager, models.QuerySet)):
+        return get_queryset_code(value, model)
+    if type(value) is UniqueValidator:
+        queryset = get_queryset_code(value.queryset, model)
+        if queryset is None or value.lookup != "exact" or isinstance(value.message, Promise):
+            return None
+        if value.message == UniqueValidator.message:
+            return f"UniqueValidator(queryset={queryset})"
+        return f"UniqueValidator(queryset={queryset}, message={value.message!r})"
+    if isinstance(value, fields.Field):
+        return get_field_code(value, model)
+    return None
+
+
+def get_field_code(field, model, name=None):
+    """
+    Get the declaration of a serializer field as built by ModelSerializer (e.g.,
+    serializers.CharField(max_length=100))
+    :param field: the serializer field
+    :param model: the serialized model
+    :param name: the serializer field name
+    :return: str or None if it can not be declared
+    """
+    from rest_framework import relations, serializers
+    kwargs = dict(field._kwargs)
+    if isinstance(field, relations.ManyRelatedField):
+        # declared using many=True as the child relation is built from the same arguments
+        field = field.child_relation
+        kwargs = dict(field._kwargs, many=True)
+    class_name = type(field).__name__
+    if getattr(serializers, class_name, None) is not type(field):
+        return None
+    args = [get_value_code(arg, model) for arg in field._args]
+    arguments = [(key, get_value_code(value, model, name=name, key=key)) for key, value in sorted(kwargs.items())]
+    if None in args or any(code is None for _, code in arguments):
+        return None
+    return f"serializers.{class_name}({', '.join(args + [f'{key}={code}' for key, code in arguments])})"
+
+
+def get_serializer_fields(model):
+    """
+    Get the declarations of the fields ModelSerializer builds for the given model with fields = '__all__'
+    :param model: django model class
+    :return: list of (field name, declaration) or None if a field can not be declared
+    """
+    if not is_django_model(model):
+        return None
+    from rest_framework import serializers
+
+    class Serializer(serializers.ModelSerializer):
+        class Meta:
+            fields = "__all__"
+
+    Serializer.Meta.model = model
+    declarations = []
+    for name, field in Serializer().get_fields().items():
+        code = get_field_code(field, model, name=name)
+        if code is None:
+            return None
+        declarations.append((name, code))
+    return declarations
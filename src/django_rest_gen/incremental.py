@@ -0,0 +1,307 @@
+import hashlib
+import json
+import os
+from . import render
+
+BEGIN_MARKER = "# django-rest-gen: begin "
+END_MARKER = "# django-rest-gen: end "
+MANIFEST_NAME = ".django_rest_gen.json"
+MANIFEST_VERSION = 1
+
+
+def get_stable_value(value):
+    """
+    Get a json serializable value that does not change between runs (e.g., no memory addresses)
+    :param value:
+    :return:
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        values = [get_stable_value(v) for v in value]
+        if isinstance(value, (set, frozenset)):
+            values.sort(key=repr)
+        return values
+    if isinstance(value, dict):
+        return {str(k): get_stable_value(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if hasattr(value, "_meta") and hasattr(value._meta, "label"):
+        return value._meta.label
+    if hasattr(value, "__qualname__"):
+        return f"{getattr(value, '__module__', '')}.{value.__qualname__}"
+    if hasattr(value, "deconstruct"):
+        try:
+            return get_stable_value(value.deconstruct())
+        except Exception:
+            pass
+    text = repr(value)
+    if " at 0x" in text:
+        return f"{type(value).__module__}.{type(value).__qualname__}"
+    return text
+
+
+def get_field_definition(field):
+    """
+    Get the definition of a model field (django or static) as written in the models
+    :param field:
+    :return: dict
+    """
+    if hasattr(field, "deconstruct"):
+        _, path, args, kwargs = field.deconstruct()
+    else:
+        path, args, kwargs = field.field_type, field.args, field.kwargs
+    return {"name": field.name, "type": path, "args": get_stable_value(args), "kwargs": get_stable_value(kwargs)}
+
+
+def get_model_definition(model):
+    """
+    Get the definition of the given model: its fields, the reverse relations and the Meta options
+    :param model: django model class (or a static model)
+    :return: dict
+    """
+    opts = model._meta
+    fields = [get_field_definition(f) for f in list(opts.concrete_fields) + list(opts.many_to_many)]
+    reverse = [f"{f.related_model._meta.label}.{f.remote_field.name}" for f in opts.get_fields()
+               if f.is_relation and not f.concrete and f.related_model is not None]
+    meta = {
+        "verbose_name": str(opts.verbose_name),
+        "verbose_name_plural": str(opts.verbose_name_plural),
+        "ordering": get_stable_value(opts.ordering),
+        "unique_together": get_stable_value(opts.unique_together),
+        "indexes": [{"name": i.name, "fields": list(i.fields)} for i in opts.indexes],
+    }
+    return {"fields": fields, "reverse": sorted(reverse), "meta": meta}
+
+
+def get_model_fingerprint(class_pair, relation_depth=0):
+    """
+    Get the hash of the definition of the given class. The definitions of the models joined using select_related are
+    included as they change the generated code.
+    :param class_pair: tuple as returned by get_classes
+    :param relation_depth: the maximum relation depth followed by the views
+    :return: str
+    """
+    definition = {"class": list(class_pair[:3])}
+    if len(class_pair) > 3 and class_pair[3] is not None:
+        definition["model"] = get_related_definition(class_pair[3], relation_depth)
+    text = json.dumps(definition, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def get_related_definition(model, depth):
+    """
+    Get the definition of the model and the models it has a forward relation to, many-to-many ones included (up to the
+    given depth)
+    :param model:
+    :param depth:
+    :return: dict
+    """
+    definition = get_model_definition(model)
+    if depth > 0:
+        related = dict()
+        for field in list(model._meta.concrete_fields) + list(model._meta.many_to_many):
+            if field.is_relation and field.related_model is not None and field.related_model is not model:
+                if hasattr(field.related_model, "_meta"):
+                    related[field.name] = get_related_definition(field.related_model, depth - 1)
+        definition["related"] = related
+    return definition
+
+
+def get_options_fingerprint(options):
+    """
+    Get the hash of the generation options
+    :param options: dict
+    :return: str
+    """
+    text = json.dumps(get_stable_value(options), sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def load_manifest(app_path):
+    """
+    Load the manifest of the previous generation of the given app
+    :param app_path:
+    :return: dict (empty if missing, unreadable or of another version)
+    """
+    try:
+        with open(os.path.join(app_path, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return dict()
+    if manifest.get("version") != MANIFEST_VERSION:
+        return dict()
+    return manifest
+
+
+def save_manifest(app_path, options_fingerprint, fingerprints):
+    """
+    Save the manifest of the given app
+    :param app_path:
+    :param options_fingerprint:
+    :param fingerprints: dict of the fingerprint per class name
+    :return:
+    """
+    manifest = {"version": MANIFEST_VERSION, "options": options_fingerprint, "models": fingerprints}
+    render.atomic_write(os.path.join(app_path, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def mark_region(name, content):
+    """
+    Surround the given content with the region markers
+    :param name:
+    :param content:
+    :return: str
+    """
+    content = content.strip("\n")
+    return f"{BEGIN_MARKER}{name}\n{content}\n{END_MARKER}{name}\n"
+
+
+def parse_regions(text):
+    """
+    Split the text of a file into the generated regions and the text outside of them
+    :param text:
+    :return: list of (region name, text). The region name is None for the text outside of the regions.
+    """
+    chunks = []
+    curr_name = None
+    curr_lines = []
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if curr_name is None and stripped.startswith(BEGIN_MARKER):
+            if curr_lines:
+                chunks.append((None, "".join(curr_lines)))
+            curr_name = stripped[len(BEGIN_MARKER):].strip()
+            curr_lines = [line]
+        elif curr_name is not None and stripped == f"{END_MARKER}{curr_name}":
+            curr_lines.append(line if line.endswith("\n") else line + "\n")
+            chunks.append((curr_name, "".join(curr_lines)))
+            curr_name = None
+            curr_lines = []
+        else:
+            curr_lines.append(line)
+    if curr_name is not None:
+        raise Exception(f"The generated region {curr_name} is not terminated")
+    if curr_lines:
+        chunks.append((None, "".join(curr_lines)))
+    return chunks
+
+
+def render_regions(regions):
+    """
+    Render all the given regions
+    :param regions: list of (region name, function returning the region content)
+    :return: str
+    """
+    return "\n".join([mark_region(name, render_region()) for name, render_region in regions])
+
+
+def merge_regions(text, regions, changed):
+    """
+    Update the generated regions of the given text. The text outside of the regions is left as is.
+    Regions that are no longer generated are removed, the changed and the missing ones are rendered and inserted
+    after the region that precedes them.
+    :param text: the current content of the file
+    :param regions: list of (region name, function returning the region content) in order
+    :param changed: set of the region names to render again
+    :return: (str, list of the updated region names)
+    """
+    renders = dict(regions)
+    chunks = parse_regions(text)
+    updated = []
+    merged = []
+    skip_blank = False
+    for name, chunk in chunks:
+        if name is None:
+            if skip_blank and chunk.startswith("\n"):
+                chunk = chunk[1:]
+            skip_blank = False
+            if chunk:
+                merged.append((None, chunk))
+            continue
+        skip_blank = False
+        if name not in renders:
+            updated.append(name)
+            skip_blank = True
+            continue
+        if name in changed:
+            new_chunk = mark_region(name, renders[name]())
+            if new_chunk != chunk:
+                updated.append(name)
+            chunk = new_chunk
+        merged.append((name, chunk))
+    present = {name for name, _ in merged}
+    for i, (name, render_region) in enumerate(regions):
+        if name in present:
+            continue
+        index = 0
+        for prev_name, _ in reversed(regions[:i]):
+            if prev_name in present:
+                index = [n for n, _ in merged].index(prev_name) + 1
+                break
+        block = mark_region(name, render_region())
+        if index > 0:
+            block = "\n" + block
+        elif merged:
+            block = block + "\n"
+        merged.insert(index, (name, block))
+        present.add(name)
+        updated.append(name)
+    return "".join([chunk for _, chunk in merged]), updated
+
+
+def update_file(fpath, regions, changed, overwrite=False, diff=False):
+    """
+    Write the generated regions into the given file. Files that already exist without regions are left untouched
+    unless overwrite is set.
+    :param fpath:
+    :param regions: list of (region name, function returning the region content) in order
+    :param changed: set of the region names to render again
+    :param overwrite: whether to replace a file that does not have generated regions
+    :param diff: whether to only print the diff against the current file
+    :return: list of the updated region names
+    """
+    text = ""
+    if os.path.exists(fpath):
+        with open(fpath) as f:
+            text = f.read()
+    if text.strip() and BEGIN_MARKER not in text:
+        if not overwrite:
+            print(f"{fpath} has no generated regions. Skipping it (use --overwrite to generate it once)")
+            return []
+        text = ""
+    if text.strip():
+        content, updated = merge_regions(text, regions, changed)
+    else:
+        content, updated = render_regions(regions), [name for name, _ in regions]
+    if content != text:
+        render.write_file(fpath, content, write=True, diff=diff)
+    return updated
+
+
+def update_app(app_path, files, fingerprints, options, overwrite=False, diff=False):
+    """
+    Regenerate the files of the given app only re-rendering the regions of the added and changed models
+    :param app_path:
+    :param files: dict of the regions per file name. The regions of a model are named after the class.
+    :param fingerprints: dict of the fingerprint per class name
+    :param options: dict of the generation options
+    :param overwrite: whether to replace the files that do not have generated regions
+    :param diff: whether to only print the diff of the files (nothing is written, not even the manifest)
+    :return: dict of the updated region names per file name
+    """
+    manifest = load_manifest(app_path)
+    options_fingerprint = get_options_fingerprint(options)
+    previous = manifest.get("models", dict())
+    if manifest.get("options") != options_fingerprint:
+        previous = dict()
+    changed = {name for name, fingerprint in fingerprints.items() if previous.get(name) != fingerprint}
+    result = dict()
+    for fname, regions in files.items():
+        # the regions that are not named after a class (e.g., the imports) are cheap and depend on all the classes
+        file_changed = changed | {name for name, _ in regions if name not in fingerprints}
+        updated = update_file(os.path.join(app_path, fname), regions, file_changed, overwrite=overwrite, diff=diff)
+        if updated and not diff:
+            print(f"{fname}: updated {', '.join(updated)}")
+        result[fname] = updated
+    if not diff:
+        save_manifest(app_path, options_fingerprint, fingerprints)
+    return result
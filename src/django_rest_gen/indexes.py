@@ -0,0 +1,219 @@
+import importlib
+import os
+import textwrap
+from django.db import migrations, models
+from . import introspect, render
+
+
+def get_direction(name):
+    return "-" if name.startswith("-") else ""
+
+
+def is_covered(fields, prefixes):
+    """
+    Whether an index starts with the given fields. The directions must all match or all be reversed (a btree index
+    can be scanned backwards).
+    :param fields: list of field names (descending ones are prefixed with "-")
+    :param prefixes: as returned by introspect.get_index_prefixes
+    :return: bool
+    """
+    names = [f.lstrip("-") for f in fields]
+    for prefix in prefixes:
+        if len(prefix) < len(fields) or [p.lstrip("-") for p in prefix[:len(fields)]] != names:
+            continue
+        if len(fields) == 1:
+            return True
+        same = [get_direction(f) == get_direction(p) for f, p in zip(fields, prefix)]
+        if all(same) or not any(same):
+            return True
+    return False
+
+
+def get_ordering_fields(model, ordering):
+    """
+    Get the concrete fields of the given ordering (expressions, random and related orderings are skipped)
+    :param model: django model class
+    :param ordering: list of orderings (e.g., ["-created", "title"])
+    :return: list of field names (descending ones are prefixed with "-"), empty if the ordering is not supported
+    """
+    fields = []
+    for item in ordering or []:
+        if not isinstance(item, str) or item == "?" or "__" in item:
+            return []
+        name = item.lstrip("-")
+        if name == "pk":
+            name = model._meta.pk.name
+        try:
+            field = model._meta.get_field(name)
+        except Exception:
+            return []
+        if not getattr(field, "concrete", False) or field.many_to_many:
+            return []
+        fields.append(get_direction(item) + field.name)
+    return fields
+
+
+def get_missing_indexes(model, pagination=None, conditional=False):
+    """
+    Get the indexes the generated endpoints of the given model need and that are not covered by an existing index:
+    the default ordering (composite if it has many fields), the cursor pagination ordering, the conditional GET
+    field (aggregated with Max) and the ForeignKey joins. The filters of the list views only use indexed fields.
+    :param model: django model class
+    :param pagination: None or "cursor"
+    :param conditional: whether the conditional GET is generated
+    :return: list of (field names, list of reasons)
+    """
+    candidates = []
+    ordering = get_ordering_fields(model, model._meta.ordering)
+    if ordering:
+        candidates.append((ordering, "ordering"))
+    if pagination == "cursor":
+        cursor = get_ordering_fields(model, [introspect.get_cursor_ordering(model)])
+        if cursor:
+            candidates.append((cursor, "cursor pagination"))
+    if conditional:
+        last_modified = introspect.get_last_modified_field(model)
+        if last_modified:
+            candidates.append(([last_modified], "conditional GET"))
+    for field in model._meta.concrete_fields:
+        if field.is_relation and (field.many_to_one or field.one_to_one):
+            candidates.append(([field.name], "join"))
+
+    prefixes = introspect.get_index_prefixes(model)
+    missing = []
+    for fields, reason in candidates:
+        if is_covered(fields, prefixes):
+            continue
+        for other_fields, reasons in missing:
+            if is_covered(fields, [tuple(other_fields)]):
+                reasons.append(reason)
+                break
+            if is_covered(other_fields, [tuple(fields)]):
+                other_fields[:] = fields
+                reasons.append(reason)
+                break
+        else:
+            missing.append((list(fields), [reason]))
+    return missing
+
+
+def get_index(model, fields):
+    """
+    Get the index of the given fields named like django does (at most 30 characters)
+    :param model: django model class
+    :param fields: list of field names
+    :return: models.Index
+    """
+    index = models.Index(fields=list(fields))
+    index.set_name_with_model(model)
+    return index
+
+
+META_INDEXES_NOTE = ("The migration only adds the indexes to the database. Add them to the Meta of the models as "
+                     "well (as above) before migrating, otherwise the next makemigrations removes them.")
+
+
+def get_report(missing_indexes, migration=False):
+    """
+    Get the report of the missing indexes
+    :param missing_indexes: list of (model, list of (field names, reasons))
+    :param migration: whether the migration adding the indexes is written
+    :return: str
+    """
+    lines = ["Index advisor report", ""]
+    if not any(missing for _, missing in missing_indexes):
+        lines.append("All the fields used for ordering, cursor pagination, conditional GET and joins are indexed.")
+    for model, missing in missing_indexes:
+        if not missing:
+            continue
+        lines.append(f"{model._meta.label} ({model._meta.db_table}):")
+        for fields, reasons in missing:
+            lines.append(f"  - {', '.join(fields)}: {', '.join(reasons)}")
+        lines.append("  Add to the Meta of the model:")
+        lines.append("    indexes = [")
+        for fields, _ in missing:
+            index = get_index(model, fields)
+            lines.append(f"        models.Index(fields={index.fields!r}, name={index.name!r}),")
+        lines.append("    ]")
+        lines.append("")
+    if migration and any(missing for _, missing in missing_indexes):
+        lines.append(META_INDEXES_NOTE)
+    return "\n".join(lines) + "\n"
+
+
+def get_migration(app_label, missing_indexes, name="indexes"):
+    """
+    Get the migration adding the missing indexes after the latest migration of the app
+    :param app_label:
+    :param missing_indexes: list of (model, list of (field names, reasons))
+    :param name: the suffix of the migration name
+    :return: (migration name, migration code) or None if the app has no migrations
+    """
+    from django.db.migrations.loader import MigrationLoader
+    from django.db.migrations.writer import MigrationWriter
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    leaf_nodes = loader.graph.leaf_nodes(app_label)
+    if not leaf_nodes:
+        return None
+    numbers = [int(node[1].split("_")[0]) for node in leaf_nodes if node[1].split("_")[0].isdigit()]
+    migration_name = f"{max(numbers + [0]) + 1:04d}_{name}"
+    migration = migrations.Migration(migration_name, app_label)
+    migration.dependencies = sorted(leaf_nodes)
+    for model, missing in missing_indexes:
+        for fields, _ in missing:
+            migration.operations.append(migrations.AddIndex(model_name=model._meta.model_name,
+                                                            index=get_index(model, fields)))
+    note = "".join(f"# {line}\n" for line in textwrap.wrap(META_INDEXES_NOTE, width=116))
+    return migration_name, note + MigrationWriter(migration).as_string()
+
+
+def get_migrations_path(app_label, app_path):
+    """
+    Get the directory of the migrations of the app (MIGRATION_MODULES is taken into account)
+    :param app_label:
+    :param app_path:
+    :return: str
+    """
+    from django.db.migrations.loader import MigrationLoader
+    module_name, _ = MigrationLoader.migrations_module(app_label)
+    try:
+        return os.path.dirname(importlib.import_module(module_name).__file__)
+    except (ImportError, TypeError):
+        return os.path.join(app_path, "migrations")
+
+
+def write_indexes(classes, app_path, app_label=None, pagination=None, paginations=None, conditional=False,
+                  migration=False, overwrite=False, diff=False):
+    """
+    Print the index advisor report and write the migration adding the missing indexes
+    :param classes: as returned by get_classes
+    :param app_path:
+    :param app_label: the django app label (default: the app label of the models)
+    :param pagination: None or the pagination of the list views (e.g., "cursor")
+    :param paginations: dict of the pagination per class name
+    :param conditional: whether the conditional GET is generated
+    :param migration: whether to write the migration
+    :param overwrite: whether to replace the migration file if it exists
+    :param diff: whether to only print the diff of the migration file
+    :return: list of (model, list of (field names, reasons))
+    """
+    missing_indexes = []
+    for c in classes:
+        model = introspect.get_class_model(c)
+        if model is None or not hasattr(model._meta, "db_table"):
+            # static models do not know their database tables
+            continue
+        app_label = app_label or model._meta.app_label
+        missing_indexes.append((model, get_missing_indexes(model, pagination=(paginations or {}).get(c[0], pagination),
+                                                           conditional=conditional)))
+    print(get_report(missing_indexes, migration=migration))
+    if not migration or not any(missing for _, missing in missing_indexes):
+        return missing_indexes
+    result = get_migration(app_label, missing_indexes)
+    if result is None:
+        print(f"The app {app_label} has no migrations. Run makemigrations first to add the index migration.")
+        return missing_indexes
+    migration_name, content = result
+    migration_path = os.path.join(get_migrations_path(app_label, app_path), f"{migration_name}.py")
+    render.write_file(migration_path, content, write=overwrite or not os.path.exists(migration_path), diff=diff)
+    return missing_indexes
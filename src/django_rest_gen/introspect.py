@@ -0,0 +1,303 @@
+import heapq
+
+AUTO_FIELDS = ["AutoField", "BigAutoField", "SmallAutoField"]
+# The fields that are too large to be rendered in the admin changelists
+ADMIN_EXPENSIVE_FIELDS = ["TextField", "JSONField", "BinaryField"]
+# The fields the admin can search with an index (startswith)
+ADMIN_SEARCH_FIELDS = ["CharField", "SlugField", "EmailField"]
+
+
+def get_class_model(class_pair):
+    """
+    Get the model class of the given class tuple (if it was loaded)
+    :param class_pair: tuple as returned by get_classes
+    :return: model class or None
+    """
+    if len(class_pair) > 3:
+        return class_pair[3]
+    return None
+
+
+def get_pk_url_converter(model):
+    """
+    Get the path converter of the primary key of the given model (e.g., int or uuid)
+    :param model: django model class
+    :return: path converter name
+    """
+    if model is None:
+        return "int"
+    internal_type = model._meta.pk.get_internal_type()
+    if internal_type in AUTO_FIELDS or internal_type.endswith("IntegerField"):
+        return "int"
+    if internal_type == "UUIDField":
+        return "uuid"
+    return "str"
+
+
+def get_select_related(model, max_depth=1):
+    """
+    Get the forward ForeignKey and OneToOne paths of the given model that can be joined using select_related.
+    Nested paths (e.g., author__publisher) are followed up to max_depth.
+    :param model: django model class
+    :param max_depth: maximum relation depth to follow. 0 disables it.
+    :return: list of select_related paths
+    """
+    paths = []
+    if max_depth < 1:
+        return paths
+    for field in model._meta.get_fields():
+        if not field.is_relation or not field.concrete or field.auto_created:
+            continue
+        if not (field.many_to_one or field.one_to_one) or field.related_model is None:
+            continue
+        sub_paths = get_select_related(field.related_model, max_depth=max_depth - 1)
+        if sub_paths:
+            paths += [f"{field.name}__{p}" for p in sub_paths]
+        else:
+            paths.append(field.name)
+    return paths
+
+
+def get_prefetch_related(model, fields=None):
+    """
+    Get the many-to-many and reverse relations of the given model that are exposed by the serializer.
+    :param model: django model class
+    :param fields: the serializer field names. None means '__all__', which only includes forward relations.
+    :return: list of prefetch_related lookups
+    """
+    lookups = []
+    for field in model._meta.get_fields():
+        if not field.is_relation:
+            continue
+        if field.concrete:
+            if field.many_to_many and (fields is None or field.name in fields):
+                lookups.append(field.name)
+        elif (field.one_to_many or field.many_to_many) and fields is not None:
+            accessor = field.get_accessor_name()
+            if accessor in fields:
+                lookups.append(accessor)
+    return lookups
+
+
+def get_queryset_relations(model, max_depth=1, fields=None):
+    """
+    Get the select_related and prefetch_related lookups for the given model
+    :param model: django model class
+    :param max_depth: maximum relation depth of select_related. 0 disables it. The relations listed by the serializer
+    (e.g., the ids of the many-to-many fields) are always prefetched.
+    :param fields: the serializer field names. None means '__all__'
+    :return: (select_related, prefetch_related)
+    """
+    if model is None:
+        return [], []
+    return get_select_related(model, max_depth=max_depth), get_prefetch_related(model, fields=fields)
+
+
+def get_cursor_ordering(model):
+    """
+    Get a unique and monotonic ordering of the given model to be used for cursor pagination.
+    An auto-increment primary key is preferred, then an auto_now_add datetime (indexed ones first),
+    then a unique field.
+    :param model: django model class
+    :return: ordering (e.g., "-pk" or "-created")
+    """
+    if model is None:
+        return "-pk"
+    opts = model._meta
+    if opts.pk.get_internal_type() in AUTO_FIELDS:
+        return "-pk"
+    created = [f for f in opts.concrete_fields if getattr(f, "auto_now_add", False)]
+    created.sort(key=lambda f: not f.db_index)
+    if created:
+        return f"-{created[0].name}"
+    for field in opts.concrete_fields:
+        if field.unique and not field.primary_key and not field.null:
+            return field.name
+    return "-pk"
+
+
+VERSION_FIELD_NAMES = ["version", "revision", "row_version"]
+
+
+def get_last_modified_field(model):
+    """
+    Get the name of the auto_now datetime field of the given model (indexed ones first)
+    :param model: django model class
+    :return: field name or None
+    """
+    if model is None:
+        return None
+    fields = [f for f in model._meta.concrete_fields if getattr(f, "auto_now", False)]
+    fields.sort(key=lambda f: not f.db_index)
+    if fields:
+        return fields[0].name
+    return None
+
+
+def get_version_field(model):
+    """
+    Get the name of the integer version field of the given model (e.g., version or revision)
+    :param model: django model class
+    :return: field name or None
+    """
+    if model is None:
+        return None
+    for field in model._meta.concrete_fields:
+        if field.name in VERSION_FIELD_NAMES and field.get_internal_type().endswith("IntegerField"):
+            return field.name
+    return None
+
+
+def get_many_to_many_fields(model):
+    """
+    Get the names of the forward many-to-many fields of the given model
+    :param model: django model class
+    :return: list of field names
+    """
+    if model is None:
+        return []
+    return [f.name for f in model._meta.many_to_many]
+
+
+def get_dependent_models(model, candidates):
+    """
+    Get the models (out of the candidates) that have a forward ForeignKey or OneToOne relation to the given model
+    :param model: django model class
+    :param candidates: list of model classes
+    :return: list of model classes
+    """
+    dependents = []
+    if model is None:
+        return dependents
+    for candidate in candidates:
+        if candidate is None or candidate is model:
+            continue
+        for field in candidate._meta.concrete_fields:
+            if field.is_relation and field.related_model is model:
+                dependents.append(candidate)
+                break
+    return dependents
+
+
+def get_dependency_order(models):
+    """
+    Order the models so that the models referenced by a ForeignKey or OneToOne come before the models referencing
+    them (e.g., to create the rows in this order). Models in a cycle keep their given order.
+    :param models: list of model classes
+    :return: list of model classes
+    """
+    index = {model: i for i, model in enumerate(models)}
+    children = {model: [] for model in models}
+    num_parents = {model: 0 for model in models}
+    for model in models:
+        parents = {f.related_model for f in model._meta.concrete_fields
+                   if f.is_relation and f.related_model in index and f.related_model is not model}
+        num_parents[model] = len(parents)
+        for parent in parents:
+            children[parent].append(model)
+    heap = [index[m] for m in models if num_parents[m] == 0]
+    heapq.heapify(heap)
+    ordered = []
+    done = set()
+    while len(ordered) < len(models):
+        if not heap:
+            # a cycle: the first remaining model is created first
+            heapq.heappush(heap, min(index[m] for m in models if m not in done))
+        model = models[heapq.heappop(heap)]
+        if model in done:
+            continue
+        done.add(model)
+        ordered.append(model)
+        for child in children[model]:
+            num_parents[child] -= 1
+            if num_parents[child] == 0 and child not in done:
+                heapq.heappush(heap, index[child])
+    return ordered
+
+
+def get_index_prefixes(model):
+    """
+    Get the fields of each index of the given model (primary key, unique and db_index fields, Meta.indexes,
+    unique_together, index_together and unique constraints). Descending fields are prefixed with "-".
+    :param model: django model class
+    :return: list of tuples of field names
+    """
+    opts = model._meta
+    prefixes = []
+    for field in opts.concrete_fields:
+        if field.primary_key or field.unique or field.db_index:
+            prefixes.append((field.name,))
+    for index in opts.indexes:
+        if getattr(index, "condition", None) is None and index.fields:
+            prefixes.append(tuple(index.fields))
+    for fields in list(opts.unique_together) + list(getattr(opts, "index_together", [])):
+        prefixes.append(tuple(fields))
+    for constraint in getattr(opts, "constraints", []):
+        if getattr(constraint, "condition", None) is None and getattr(constraint, "fields", None):
+            prefixes.append(tuple(constraint.fields))
+    return prefixes
+
+
+def get_indexed_field_names(model):
+    """
+    Get the names of the fields of the given model that are the first column of an index
+    :param model: django model class
+    :return: set of field names
+    """
+    if model is None:
+        return set()
+    return {prefix[0].lstrip("-") for prefix in get_index_prefixes(model)}
+
+
+def get_filter_fields(model):
+    """
+    Get the fields of the given model that can be filtered on without a full table scan: the primary key, the unique
+    and the indexed fields (including the ForeignKeys)
+    :param model: django model class
+    :return: list of field names (in the order of the model fields)
+    """
+    if model is None:
+        return []
+    indexed = get_indexed_field_names(model)
+    return [f.name for f in model._meta.concrete_fields if f.name in indexed]
+
+
+def get_admin_list_display(model):
+    """
+    Get the columns of the admin changelist of the given model: the indexed fields that are cheap to render
+    :param model: django model class
+    :return: list of field names
+    """
+    return [name for name in get_filter_fields(model)
+            if model._meta.get_field(name).get_internal_type() not in ADMIN_EXPENSIVE_FIELDS]
+
+
+def get_admin_search_fields(model):
+    """
+    Get the admin search fields of the given model: the indexed text fields, searched with startswith so the index
+    can be used (unlike the default icontains)
+    :param model: django model class
+    :return: list of search fields (e.g., name__startswith)
+    """
+    if model is None:
+        return []
+    return [f"{name}__startswith" for name in get_filter_fields(model)
+            if model._meta.get_field(name).get_internal_type() in ADMIN_SEARCH_FIELDS]
+
+
+def get_admin_relations(model):
+    """
+    Get the editable ForeignKey, OneToOne and many-to-many fields of the given model (the many-to-many fields with
+    a custom through model are not editable in the admin)
+    :param model: django model class
+    :return: list of fields
+    """
+    fields = []
+    for field in list(model._meta.concrete_fields) + list(model._meta.many_to_many):
+        if not field.is_relation or not getattr(field, "editable", True):
+            continue
+        through = getattr(field.remote_field, "through", None)
+        if field.many_to_many and hasattr(through, "_meta") and not through._meta.auto_created:
+            continue
+        fields.append(field)
+    return fields
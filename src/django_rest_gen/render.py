@@ -0,0 +1,77 @@
+import difflib
+import os
+import tempfile
+
+
+def join_regions(regions):
+    """
+    Render the given regions and join them into the content of a single file
+    :param regions: list of (region name, function returning the region content)
+    :return: str
+    """
+    return "".join([render_region() for _, render_region in regions])
+
+
+def atomic_write(fpath, content):
+    """
+    Write the whole content of the file at once through a temporary file in the same directory that replaces it,
+    so the file is never left half written
+    :param fpath:
+    :param content:
+    :return:
+    """
+    dir_path = os.path.dirname(os.path.abspath(fpath))
+    fd, tmp_path = tempfile.mkstemp(dir=dir_path, prefix=f".{os.path.basename(fpath)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        if os.path.exists(fpath):
+            os.chmod(tmp_path, os.stat(fpath).st_mode & 0o777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, fpath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_diff(fpath, content):
+    """
+    Get the unified diff between the current content of the file and the given content
+    :param fpath:
+    :param content:
+    :return: str (empty if there are no changes)
+    """
+    old_content = ""
+    if os.path.exists(fpath):
+        with open(fpath) as f:
+            old_content = f.read()
+    diff = difflib.unified_diff(old_content.splitlines(keepends=True), content.splitlines(keepends=True),
+                                fromfile=f"a/{fpath}", tofile=f"b/{fpath}")
+    lines = []
+    for line in diff:
+        lines.append(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n")
+    return "".join(lines)
+
+
+def write_file(fpath, content, write=False, diff=False):
+    """
+    Write the generated content of a file, print it, or print the diff against the current file
+    :param fpath:
+    :param content:
+    :param write: whether to write the file. Otherwise, the content is printed.
+    :param diff: whether to only print the unified diff against the current file (nothing is written)
+    :return:
+    """
+    if diff:
+        file_diff = get_diff(fpath, content)
+        if file_diff:
+            print(file_diff, end="")
+    elif write:
+        atomic_write(fpath, content)
+    else:
+        print(f"\n\n\n\n=========================== {os.path.basename(fpath)} ===========================\n\n")
+        print(content)
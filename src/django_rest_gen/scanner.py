@@ -0,0 +1,130 @@
+import json
+import os
+from collections import deque
+
+DEFAULT_PRUNE = [".git", ".hg", ".svn", "__pycache__", "node_modules", "bower_components", ".venv", "venv", "env",
+                 "site-packages", ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".idea", ".vscode",
+                 "media", "static", "staticfiles", "dist", "build"]
+DEFAULT_MAX_DEPTH = 8
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "django_rest_gen", "scan.json")
+MIN_MODELS_SIZE = 50
+
+
+def walk_project(root, prune=None, max_depth=DEFAULT_MAX_DEPTH):
+    """
+    Walk the project once (breadth first) looking for settings modules and apps.
+    Pruned directories and virtual environments are not entered.
+    :param root: the project directory
+    :param prune: directory names to skip. None means DEFAULT_PRUNE
+    :param max_depth: the maximum directory depth to enter (0 is the root only)
+    :return: dict with the found "settings" and "apps" paths, the mtime of the visited "dirs" and the mtime and size
+    of the candidate "files" (settings.py and models.py)
+    """
+    if prune is None:
+        prune = DEFAULT_PRUNE
+    prune = set(prune)
+    result = {"settings": [], "apps": [], "dirs": {}, "files": {}}
+    queue = deque([(root, 0)])
+    while queue:
+        curr_path, depth = queue.popleft()
+        try:
+            with os.scandir(curr_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        if depth > 0 and any(e.name == "pyvenv.cfg" for e in entries):
+            continue
+        result["dirs"][curr_path] = os.stat(curr_path).st_mtime_ns
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if depth < max_depth and entry.name not in prune and not entry.name.endswith(".egg-info"):
+                    queue.append((entry.path, depth + 1))
+            elif entry.name in ["settings.py", "models.py"]:
+                stat = entry.stat()
+                result["files"][entry.path] = [stat.st_mtime_ns, stat.st_size]
+                if entry.name == "settings.py":
+                    result["settings"].append(entry.path)
+                elif stat.st_size > MIN_MODELS_SIZE:
+                    result["apps"].append(curr_path)
+    return result
+
+
+def load_cached_scan(root, prune, max_depth, cache_path):
+    """
+    Get the cached scan of the given project if none of the visited directories and candidate files changed
+    :param root:
+    :param prune:
+    :param max_depth:
+    :param cache_path:
+    :return: dict or None
+    """
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f).get(root)
+    except (OSError, ValueError):
+        return None
+    if not cached or cached["prune"] != sorted(prune) or cached["max_depth"] != max_depth or "files" not in cached:
+        return None
+    for dir_path, mtime in cached["dirs"].items():
+        try:
+            if os.stat(dir_path).st_mtime_ns != mtime:
+                return None
+        except OSError:
+            return None
+    # editing a file in place does not change the mtime of its directory
+    for file_path, (mtime, size) in cached["files"].items():
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if stat.st_mtime_ns != mtime or stat.st_size != size:
+            return None
+    return cached
+
+
+def save_cached_scan(root, prune, max_depth, cache_path, result):
+    """
+    Cache the scan of the given project keyed on the directories mtimes and the candidate files mtimes and sizes
+    :param root:
+    :param prune:
+    :param max_depth:
+    :param cache_path:
+    :param result: as returned by walk_project
+    :return:
+    """
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = dict()
+    cache[root] = dict(result, prune=sorted(prune), max_depth=max_depth)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"Unable to cache the project scan: {e}")
+
+
+def scan_project(root, prune=None, max_depth=DEFAULT_MAX_DEPTH, use_cache=True, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Find the settings modules and the apps of the project in a single walk. The result is cached and reused as long
+    as none of the visited directories and candidate files changed.
+    :param root: the project directory
+    :param prune: directory names to skip. None means DEFAULT_PRUNE
+    :param max_depth: the maximum directory depth to enter
+    :param use_cache: whether to use the cached scan
+    :param cache_path: the path of the cache file
+    :return: dict with the found "settings" and "apps" paths (shallowest first)
+    """
+    root = os.path.abspath(root)
+    if prune is None:
+        prune = DEFAULT_PRUNE
+    if use_cache:
+        cached = load_cached_scan(root, prune, max_depth, cache_path)
+        if cached:
+            return cached
+    result = walk_project(root, prune=prune, max_depth=max_depth)
+    if use_cache:
+        save_cached_scan(root, prune, max_depth, cache_path, result)
+    return result
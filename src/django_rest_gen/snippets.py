@@ -0,0 +1,1421 @@
+"""
+Helper code that is emitted as-is in the generated files (e.g., mixins shared by the generated classes)
+"""
+
+# The names used by the declarations of the serializer fields resolved from the models
+EXPLICIT_FIELDS_SERIALIZER_IMPORTS = [
+    "from django.utils.text import capfirst",
+    "from rest_framework.validators import UniqueValidator",
+]
+
+SPARSE_FIELDS_SERIALIZER = '''
+def get_sparse_fields(request, available):
+    """
+    Get the field names asked for using ?fields=a,b and ?omit=c (None if neither is given)
+    """
+    fields = request.query_params.get("fields")
+    omit = request.query_params.get("omit")
+    if not fields and not omit:
+        return None
+    names = set(available)
+    if fields:
+        names &= {name.strip() for name in fields.split(",")}
+    if omit:
+        names -= {name.strip() for name in omit.split(",")}
+    return names
+
+
+class SparseFieldsMixin:
+    """
+    Drop the serializer fields that are not asked for using ?fields= or ?omit=
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in ("GET", "HEAD"):
+            return
+        names = get_sparse_fields(request, self.fields.keys())
+        if names is None:
+            return
+        for name in list(self.fields.keys()):
+            if name not in names:
+                self.fields.pop(name)
+
+'''
+
+SPARSE_FIELDS_VIEW = '''
+def get_select_related_paths(tree, prefix=""):
+    paths = []
+    for name, sub_tree in tree.items():
+        path = prefix + name
+        paths += get_select_related_paths(sub_tree, path + "__") or [path]
+    return paths
+
+
+class SparseFieldsQuerysetMixin:
+    """
+    Push the ?fields= / ?omit= projection into the queryset so the unused columns are not fetched
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in ("GET", "HEAD"):
+            return queryset
+        opts = queryset.model._meta
+        names = get_sparse_fields(self.request, [f.name for f in opts.get_fields()])
+        if names is None:
+            return queryset
+        columns = [f.name for f in opts.concrete_fields if f.name in names or f.primary_key]
+        if isinstance(queryset.query.select_related, dict):
+            select_related = get_select_related_paths(queryset.query.select_related)
+            select_related = [p for p in select_related if p.split("__")[0] in names]
+            queryset = queryset.select_related(None)
+            if select_related:
+                queryset = queryset.select_related(*select_related)
+        prefetch_related = [lookup for lookup in queryset._prefetch_related_lookups
+                            if getattr(lookup, "prefetch_through", lookup).split("__")[0] in names]
+        queryset = queryset.prefetch_related(None)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset.only(*columns)
+
+'''
+
+FILTER_VIEW_IMPORTS = [
+    "from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError",
+    "from rest_framework.exceptions import ValidationError",
+]
+
+FILTER_VIEW = '''
+FILTER_RESERVED_PARAMS = {"page", "page_size", "cursor", "fields", "omit", "format", "ordering", "ids", "as"}
+FILTER_LOOKUPS = {"exact", "gt", "gte", "lt", "lte", "range"}
+
+
+class IndexedFilterMixin:
+    """
+    Filter the list using ?field=value, ?field__gte=value or ?field__range=low,high on the indexed fields only.
+    Any other query parameter is rejected with 400 rather than turned into a full table scan.
+    """
+    filter_fields = []
+    filter_reserved_params = FILTER_RESERVED_PARAMS
+    filter_methods = ("GET", "HEAD")
+
+    def get_filter_value(self, field, lookup, value):
+        if lookup == "range":
+            values = value.split(",")
+            if len(values) != 2:
+                raise DjangoValidationError("Expected two comma separated values")
+            return [field.to_python(v) for v in values]
+        return field.to_python(value)
+
+    def get_filter_kwargs(self, request):
+        opts = self.get_queryset().model._meta
+        kwargs = dict()
+        errors = dict()
+        for param, value in request.query_params.items():
+            if param in self.filter_reserved_params:
+                continue
+            name, _, lookup = param.partition("__")
+            lookup = lookup or "exact"
+            if name not in self.filter_fields or lookup not in FILTER_LOOKUPS:
+                errors[param] = [f"Filtering on {param} is not supported. Use the exact or range lookups of: "
+                                 f"{', '.join(self.filter_fields)}"]
+                continue
+            try:
+                kwargs[f"{name}__{lookup}"] = self.get_filter_value(opts.get_field(name), lookup, value)
+            except (DjangoValidationError, FieldDoesNotExist) as e:
+                errors[param] = list(getattr(e, "messages", [str(e)]))
+        if errors:
+            raise ValidationError(errors)
+        return kwargs
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in self.filter_methods:
+            return queryset
+        return queryset.filter(**self.get_filter_kwargs(self.request))
+
+'''
+
+ASYNC_VIEW_IMPORTS = [
+    "import json",
+    "from asgiref.sync import sync_to_async",
+    "from django.core.serializers.json import DjangoJSONEncoder",
+    "from django.http import HttpResponse, JsonResponse",
+    "from django.views import View",
+]
+
+ASYNC_VIEW = '''
+try:
+    # adrf adds the authentication, permissions, throttling and content negotiation of DRF to async views
+    from adrf.views import APIView as AsyncBaseView
+    HAS_ADRF = True
+except ImportError:
+    HAS_ADRF = False
+
+    class AsyncBaseView(View):
+        @classmethod
+        def as_view(cls, **initkwargs):
+            # Like the DRF views, which only check the CSRF token of the session authenticated requests. These views
+            # do not authenticate the requests.
+            view = super().as_view(**initkwargs)
+            view.csrf_exempt = True
+            return view
+
+
+class AsyncJsonMixin:
+    def make_response(self, data, status=200):
+        if HAS_ADRF:
+            return Response(data, status=status)
+        if data is None:
+            return HttpResponse(status=status)
+        return JsonResponse(data, status=status, safe=False, encoder=DjangoJSONEncoder)
+
+
+class AsyncModelViewMixin(AsyncJsonMixin):
+    """
+    Run the queries with the async ORM. The serializers only validate (in a thread as the validators may query the
+    database) and render the objects that are fetched with all their relations.
+    """
+    queryset = None
+    serializer_class = None
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get_serializer(self, *args, **kwargs):
+        context = {"view": self}
+        if hasattr(self.request, "query_params"):
+            context["request"] = self.request
+        return self.serializer_class(*args, context=context, **kwargs)
+
+    def get_request_data(self, request):
+        if hasattr(request, "data"):
+            return request.data
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+
+    async def get_object(self, pk):
+        try:
+            return await self.get_queryset().aget(pk=pk)
+        except (self.queryset.model.DoesNotExist, ValueError):
+            return None
+
+    async def save(self, serializer, instance=None):
+        data = dict(serializer.validated_data)
+        many_to_many = {f.name: data.pop(f.name) for f in self.queryset.model._meta.many_to_many if f.name in data}
+        if instance is None:
+            instance = await self.queryset.model._default_manager.acreate(**data)
+        else:
+            for name, value in data.items():
+                setattr(instance, name, value)
+            await sync_to_async(instance.save)()
+        for name, values in many_to_many.items():
+            await sync_to_async(getattr(instance, name).set)(values)
+        # fetch the saved object with its relations to render it
+        return await self.get_object(instance.pk)
+
+    def not_found(self):
+        return self.make_response({"detail": "Not found."}, status=404)
+
+
+class AsyncListCreateView(AsyncModelViewMixin, AsyncBaseView):
+    """
+    List the objects by pages of ?page_size= (the next page is detected by fetching an extra row, without counting)
+    """
+    page_size = 100
+    max_page_size = 1000
+
+    def get_page_url(self, request, page):
+        query = request.GET.copy()
+        query["page"] = page
+        return request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+            page_size = min(max(int(request.GET.get("page_size", self.page_size)), 1), self.max_page_size)
+        except ValueError:
+            return self.make_response({"detail": "Invalid page."}, status=400)
+        queryset = self.get_queryset()
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+        offset = (page - 1) * page_size
+        objs = [obj async for obj in queryset[offset:offset + page_size + 1]]
+        return self.make_response({
+            "next": self.get_page_url(request, page + 1) if len(objs) > page_size else None,
+            "previous": self.get_page_url(request, page - 1) if page > 1 else None,
+            "results": self.get_serializer(objs[:page_size], many=True).data,
+        })
+
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=self.get_request_data(request))
+        if not await sync_to_async(serializer.is_valid)():
+            return self.make_response(serializer.errors, status=400)
+        instance = await self.save(serializer)
+        return self.make_response(self.get_serializer(instance).data, status=201)
+
+
+class AsyncRetrieveUpdateDestroyView(AsyncModelViewMixin, AsyncBaseView):
+    async def get(self, request, pk, *args, **kwargs):
+        instance = await self.get_object(pk)
+        if instance is None:
+            return self.not_found()
+        return self.make_response(self.get_serializer(instance).data)
+
+    async def put(self, request, pk, *args, partial=False, **kwargs):
+        instance = await self.get_object(pk)
+        if instance is None:
+            return self.not_found()
+        serializer = self.get_serializer(instance, data=self.get_request_data(request), partial=partial)
+        if not await sync_to_async(serializer.is_valid)():
+            return self.make_response(serializer.errors, status=400)
+        instance = await self.save(serializer, instance=instance)
+        return self.make_response(self.get_serializer(instance).data)
+
+    async def patch(self, request, pk, *args, **kwargs):
+        return await self.put(request, pk, *args, partial=True, **kwargs)
+
+    async def delete(self, request, pk, *args, **kwargs):
+        deleted, _ = await self.queryset.model._default_manager.filter(pk=pk).adelete()
+        if not deleted:
+            return self.not_found()
+        return self.make_response(None, status=204)
+
+'''
+
+VALUES_LIST_VIEW_IMPORTS = [
+    "from django.core.exceptions import FieldDoesNotExist",
+    "from rest_framework import serializers",
+]
+
+VALUES_LIST_VIEW = '''
+# The serializer fields whose representation is the database value itself
+VALUES_IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+                          serializers.FloatField)
+
+
+def get_values_column(opts, field):
+    """
+    Get the column and the converter of a serializer field (None if it can not be read using values())
+    """
+    if field.source == "*" or "." in field.source:
+        return None
+    try:
+        model_field = opts.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None or not (model_field.many_to_one or model_field.one_to_one):
+            return None
+        return model_field.attname, None
+    if isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField, serializers.FileField,
+                          serializers.SerializerMethodField, serializers.BaseSerializer)):
+        return None
+    if not model_field.concrete or model_field.is_relation:
+        return None
+    if isinstance(field, VALUES_IDENTITY_FIELDS) or (isinstance(field, serializers.JSONField) and not field.binary):
+        return model_field.attname, None
+    return model_field.attname, field.to_representation
+
+
+class ValuesListMixin:
+    """
+    Render the list using values() and plain dicts instead of model instances and the serializer.
+    The many-to-many primary keys are fetched with one query per relation. Serializers with other fields (e.g.,
+    nested serializers, file or method fields) use the default path.
+    """
+    values_list_enabled = True
+
+    def get_values_plan(self, serializer):
+        opts = self.get_queryset().model._meta
+        many_to_many = {f.name: f for f in opts.many_to_many}
+        columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.ManyRelatedField):
+                child = field.child_relation
+                if field.source not in many_to_many or not isinstance(child, serializers.PrimaryKeyRelatedField):
+                    return None
+                if child.pk_field is not None:
+                    return None
+                columns.append((name, None, many_to_many[field.source]))
+                continue
+            column = get_values_column(opts, field)
+            if column is None:
+                return None
+            columns.append((name,) + column)
+        return columns
+
+    def get_many_to_many_values(self, model_field, pks):
+        query_name = model_field.related_query_name()
+        # the same query (and ordering) as prefetch_related
+        rows = model_field.related_model._default_manager.filter(**{f"{query_name}__in": pks})
+        values = {pk: [] for pk in pks}
+        for pk, related_pk in rows.values_list(query_name, "pk"):
+            values[pk].append(related_pk)
+        return values
+
+    def get_values_data(self, rows, columns):
+        pks = [row["pk"] for row in rows]
+        many_to_many = {name: self.get_many_to_many_values(model_field, pks)
+                        for name, column, model_field in columns if column is None}
+        data = []
+        for row in rows:
+            item = dict()
+            for name, column, convert in columns:
+                if column is None:
+                    item[name] = many_to_many[name][row["pk"]]
+                    continue
+                value = row[column]
+                item[name] = convert(value) if convert is not None and value is not None else value
+            data.append(item)
+        return data
+
+    def list(self, request, *args, **kwargs):
+        columns = self.get_values_plan(self.get_serializer()) if self.values_list_enabled else None
+        if columns is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        names = list(dict.fromkeys([column for _, column, _ in columns if column is not None] + ["pk"]))
+        # the cursor pagination reads the position from the ordering fields of the last row
+        ordering = getattr(self.paginator, "ordering", None) or []
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        names += [o.lstrip("-") for o in ordering if o.lstrip("-") not in names]
+        queryset = queryset.values(*names)
+        page = self.paginate_queryset(queryset)
+        data = self.get_values_data(list(page if page is not None else queryset), columns)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+'''
+
+VALUES_LIST_TESTS_IMPORTS = [
+    "from unittest.mock import patch",
+    "from django.urls import resolve",
+]
+
+VALUES_LIST_TESTS = '''
+
+class ValuesListTestMixin:
+    """
+    Fail if the list rendered using values() differs from the list rendered by the serializer
+    """
+
+    def test_values_list_same_json(self):
+        url = reverse(f"{self.url_name}-list")
+        self.make_objects(SMALL_SIZE)
+        view_class = resolve(url).func.view_class
+        fast = self.client.get(url)
+        self.assertEqual(fast.status_code, 200, fast.content)
+        with patch.object(view_class, "values_list_enabled", False):
+            slow = self.client.get(url)
+        self.assertEqual(fast.json(), slow.json())
+
+'''
+
+COUNT_PAGINATION_IMPORTS = [
+    "import json",
+    "from django.db import connections",
+    "from rest_framework.exceptions import NotFound",
+    "from rest_framework.utils.urls import remove_query_param, replace_query_param",
+]
+
+COUNT_PAGINATION = '''
+class CountFreePagination(pagination.PageNumberPagination):
+    """
+    Page number pagination without SELECT COUNT(*): page_size + 1 rows are fetched to know whether there is a next
+    page. The responses have the next and previous links and the results, without the count.
+    """
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(page_number=request.query_params[self.page_query_param],
+                                                            message="Not an integer."))
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message.format(page_number=self.page_number,
+                                                            message="That page number is less than 1"))
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message.format(page_number=self.page_number,
+                                                            message="That page contains no results"))
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"].pop("count")
+        if "count" in response_schema.get("required", []):
+            response_schema["required"].remove("count")
+        return response_schema
+
+
+class EstimatedCountPagination(CountFreePagination):
+    """
+    Count-free page number pagination that also returns a count. Above count_threshold rows, the count is the
+    estimate of the query planner (EXPLAIN) on the databases that support it (PostgreSQL), and count_estimated is
+    true. Otherwise (and on the other databases, e.g., SQLite) the rows are counted exactly.
+    """
+    count_threshold = 10000
+    estimated_count_vendors = {"postgresql"}
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = super().paginate_queryset(queryset, request, view=view)
+        if page is not None:
+            self.count, self.count_estimated = self.get_count(queryset)
+        return page
+
+    def get_count(self, queryset):
+        if connections[queryset.db].vendor in self.estimated_count_vendors:
+            estimate = self.get_estimated_count(queryset)
+            if estimate > self.count_threshold:
+                return estimate, True
+        return queryset.count(), False
+
+    def get_estimated_count(self, queryset):
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "count_estimated": self.count_estimated,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = pagination.PageNumberPagination.get_paginated_response_schema(self, schema)
+        response_schema["properties"]["count_estimated"] = {"type": "boolean", "example": False}
+        return response_schema
+
+'''
+
+BATCH_VIEW_IMPORTS = [
+    "from django.core.exceptions import ValidationError as DjangoValidationError",
+    "from rest_framework.exceptions import ValidationError",
+]
+
+BATCH_VIEW = '''
+class BatchRetrieveMixin:
+    """
+    Retrieve many objects by primary key (?ids=1,2,3) in a single request and a single query. The results are in the
+    order of the ids (repeated ids are returned once) and the ids that were not found are returned in missing.
+    """
+    batch_max_size = 100
+
+    def get_batch_ids(self, request):
+        values = [value.strip() for value in request.query_params.get("ids", "").split(",") if value.strip()]
+        if not values:
+            raise ValidationError({"ids": ["Expected a comma separated list of ids (e.g., ?ids=1,2,3)."]})
+        pk_field = self.get_queryset().model._meta.pk
+        try:
+            ids = list(dict.fromkeys(pk_field.to_python(value) for value in values))
+        except DjangoValidationError as e:
+            raise ValidationError({"ids": e.messages})
+        if len(ids) > self.batch_max_size:
+            raise ValidationError({"ids": [f"Ensure there are at most {self.batch_max_size} ids."]})
+        return ids
+
+    def get(self, request, *args, **kwargs):
+        return self.batch_retrieve(request, *args, **kwargs)
+
+    def batch_retrieve(self, request, *args, **kwargs):
+        ids = self.get_batch_ids(request)
+        objs = self.filter_queryset(self.get_queryset()).in_bulk(ids)
+        serializer = self.get_serializer([objs[pk] for pk in ids if pk in objs], many=True)
+        return Response({
+            "results": serializer.data,
+            "missing": [pk for pk in ids if pk not in objs],
+        })
+
+'''
+
+EXPORT_VIEW_IMPORTS = [
+    "import json",
+    "from itertools import islice",
+    "from django.http import StreamingHttpResponse",
+    "from rest_framework.utils.encoders import JSONEncoder",
+]
+
+EXPORT_VIEW = '''
+class ExportMixin:
+    """
+    Stream all the rows as NDJSON (?as=ndjson) or as a JSON array (?as=json, the default) in chunks, so the memory
+    use does not grow with the size of the table. Querysets with prefetch_related are read in chunks of increasing
+    primary keys (the related objects are prefetched for each chunk), the others using iterator().
+    """
+    export_chunk_size = 2000
+    export_formats = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
+    def get_export_chunks(self, queryset):
+        if queryset._prefetch_related_lookups:
+            queryset = queryset.order_by("pk")
+            chunk = list(queryset[:self.export_chunk_size])
+            while chunk:
+                yield chunk
+                if len(chunk) < self.export_chunk_size:
+                    return
+                chunk = list(queryset.filter(pk__gt=chunk[-1].pk)[:self.export_chunk_size])
+            return
+        rows = queryset.iterator(chunk_size=self.export_chunk_size)
+        chunk = list(islice(rows, self.export_chunk_size))
+        while chunk:
+            yield chunk
+            chunk = list(islice(rows, self.export_chunk_size))
+
+    def get_export_lines(self, queryset, export_format):
+        encoder = JSONEncoder(ensure_ascii=False)
+        first = True
+        if export_format == "json":
+            yield "["
+        for chunk in self.get_export_chunks(queryset):
+            lines = [encoder.encode(item) for item in self.get_serializer(chunk, many=True).data]
+            if export_format == "ndjson":
+                yield "".join(line + "\\n" for line in lines)
+            else:
+                yield ("" if first else ",") + ",".join(lines)
+            first = False
+        if export_format == "json":
+            yield "]\\n"
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get("as", "json")
+        if export_format not in self.export_formats:
+            return Response({"as": [f"Unknown export format: {export_format}. Use one of: "
+                                    f"{', '.join(self.export_formats)}"]}, status=400)
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(self.get_export_lines(queryset, export_format),
+                                         content_type=self.export_formats[export_format])
+        filename = f"{queryset.model._meta.model_name}.{export_format}"
+        response["Content-Disposition"] = f\'attachment; filename="{filename}"\'
+        return response
+
+'''
+
+CONDITIONAL_GET_VIEW_IMPORTS = [
+    "import hashlib",
+    "from django.db.models import Count, Max, Sum",
+    "from django.utils.cache import get_conditional_response",
+    "from django.utils.http import http_date",
+]
+
+CONDITIONAL_GET_VIEW = '''
+class ConditionalGetMixin:
+    """
+    Answer GET requests with 304 Not Modified (without serializing) if the resource did not change.
+    The validators are computed from the last modified and the version fields only.
+    """
+    last_modified_field = None
+    version_field = None
+
+    def get_conditional_validators(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            fields = [f for f in [self.last_modified_field, self.version_field] if f]
+            row = queryset.values_list(*fields).first()
+            if row is None:
+                return None, None
+            values = dict(zip(fields, row))
+        else:
+            aggregates = {"count": Count("pk")}
+            if self.last_modified_field:
+                aggregates[self.last_modified_field] = Max(self.last_modified_field)
+            if self.version_field:
+                aggregates[self.version_field] = Sum(self.version_field)
+            values = queryset.order_by().aggregate(**aggregates)
+        last_modified = values.get(self.last_modified_field)
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+        state = f"{request.get_full_path()}:{request.accepted_renderer.format}:{sorted(values.items())}"
+        etag = '"%s"' % hashlib.md5(state.encode()).hexdigest()
+        return etag, last_modified
+
+    def get_conditional_response(self, request, handler, *args, **kwargs):
+        etag, last_modified = self.get_conditional_validators(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in [200, 304]:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(request, super().retrieve, *args, **kwargs)
+
+'''
+
+CACHE_VIEW_IMPORTS = [
+    "import hashlib",
+    "from django.core.cache import cache",
+]
+
+CACHE_VIEW = '''
+class CacheResponseMixin:
+    """
+    Cache the response data of GET requests using the django cache framework. The cache keys include the model
+    version, which is bumped on every change (see signals.py), so stale entries are never served.
+    """
+    cache_timeout = 60
+
+    def get_cache_key(self, request):
+        model = self.get_queryset().model
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        version = get_cache_version(model)
+        return f"drg:{model._meta.label_lower}:{version}:{request.accepted_renderer.format}:{path}"
+
+    def get_cached_response(self, request, handler, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().retrieve, *args, **kwargs)
+
+    def batch_retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().batch_retrieve, *args, **kwargs)
+
+
+class BulkCacheInvalidationMixin:
+    """
+    Invalidate the cached responses after bulk writes, which do not send the model signals
+    """
+
+    def bulk_changed(self, model):
+        super().bulk_changed(model)
+        # like the post_save and post_delete receivers of signals.py
+        bump_cache_version(model, *CACHE_DEPENDENTS.get(model, []))
+
+'''
+
+CACHE_SIGNALS = '''import time
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+# The models whose responses include the id of a model (e.g., the authors of a publisher), per model
+CACHE_DEPENDENTS = dict()
+
+
+def get_cache_version_key(model):
+    return f"drg:{model._meta.label_lower}:version"
+
+
+def get_cache_version(model):
+    """
+    Get the current cache version of the given model
+    """
+    return cache.get_or_set(get_cache_version_key(model), time.time_ns, None)
+
+
+def bump_cache_version(*models):
+    """
+    Invalidate the cached responses of the given models
+    """
+    for model in models:
+        key = get_cache_version_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The version was evicted. A new one is set that no cached entry can have.
+            cache.set(key, time.time_ns(), None)
+
+'''
+
+REPLICA_VIEW = '''
+class ReplicaReadMixin:
+    """
+    Read from a replica (see routers.py) on GET and HEAD. The other methods, and the reads that follow a write in the
+    same request, use the primary database.
+    """
+    replica_methods = ("GET", "HEAD")
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in self.replica_methods:
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+'''
+
+REPLICA_ROUTER = '''
+
+class ReplicaState:
+    def __init__(self):
+        self.alias = None
+        self.pinned = False
+
+
+_replica_state = ContextVar("replica_state", default=None)
+_round_robin = itertools.count()
+
+
+def get_replica_databases():
+    """
+    Get the configured replicas (the REPLICA_DATABASES setting overrides the generated ones) that are in DATABASES
+    :return: dict of the weight per alias, or list of aliases (round-robin)
+    """
+    replicas = getattr(settings, "REPLICA_DATABASES", REPLICA_DATABASES)
+    if isinstance(replicas, dict):
+        return {alias: weight for alias, weight in replicas.items() if alias in settings.DATABASES and weight > 0}
+    return [alias for alias in replicas if alias in settings.DATABASES]
+
+
+def choose_replica():
+    """
+    Choose the replica of a request: weighted random choice if the replicas have weights, round-robin otherwise
+    :return: the database alias or None (the primary) if there is no replica
+    """
+    replicas = get_replica_databases()
+    if not replicas:
+        return None
+    if isinstance(replicas, dict):
+        return random.choices(list(replicas), weights=list(replicas.values()))[0]
+    return replicas[next(_round_robin) % len(replicas)]
+
+
+@contextmanager
+def replica_reads():
+    """
+    Send the reads of the block to a single replica, until the first write of the block
+    """
+    token = _replica_state.set(ReplicaState())
+    try:
+        yield
+    finally:
+        _replica_state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Route the reads made inside replica_reads() (the GET and HEAD requests of the generated views) to a replica. All
+    the other queries use the primary database.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _replica_state.get()
+        if state is None or state.pinned:
+            return None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # the related objects are read from the database of the instance
+            return instance._state.db
+        if state.alias is None:
+            state.alias = choose_replica()
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _replica_state.get()
+        if state is not None:
+            # read your writes: the following reads of the request use the primary
+            state.pinned = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *get_replica_databases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+'''
+
+BULK_VIEW_IMPORTS = [
+    "from django.core.exceptions import ValidationError as DjangoValidationError",
+    "from django.db import IntegrityError, transaction",
+    "from rest_framework import status",
+    "from rest_framework.exceptions import ValidationError",
+]
+
+BULK_VIEW = '''
+class BulkMixin:
+    """
+    Create (POST), update (PUT/PATCH) and delete (DELETE) many objects in a single request.
+    The writes are done in batches of bulk_batch_size inside one transaction.
+    """
+    bulk_batch_size = 500
+    integrity_error_message = "The items conflict with each other or with existing rows (e.g., a unique value)."
+
+    def get_bulk_items(self, request):
+        if not isinstance(request.data, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of items."]})
+        return request.data
+
+    def get_bulk_pks(self, values):
+        pk_field = self.get_queryset().model._meta.pk
+        try:
+            return [pk_field.to_python(value) for value in values]
+        except DjangoValidationError as e:
+            raise ValidationError({"ids": e.messages})
+
+    def bulk_changed(self, model):
+        """
+        Called after the bulk writes, which do not send the model signals
+        """
+        pass
+
+    def set_bulk_relations(self, model, objs, relations, clear=False):
+        """
+        Set the many-to-many relations of the given objects using one bulk insert per relation
+        """
+        for field in model._meta.many_to_many:
+            through = getattr(model, field.name).through
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            updated = [obj for obj, values in zip(objs, relations) if field.name in values]
+            if not updated:
+                continue
+            if clear:
+                through._default_manager.filter(**{f"{source}__in": updated}).delete()
+            rows = [through(**{f"{source}_id": obj.pk, f"{target}_id": value.pk})
+                    for obj, values in zip(objs, relations) for value in values.get(field.name, [])]
+            through._default_manager.bulk_create(rows, batch_size=self.bulk_batch_size, ignore_conflicts=True)
+
+    def get_integrity_error_response(self, error):
+        """
+        The constraints the serializers can not check item by item (e.g., two new items with the same unique value)
+        """
+        return Response({"non_field_errors": [self.integrity_error_message]}, status=status.HTTP_400_BAD_REQUEST)
+
+    def get_bulk_response(self, objs, status_code):
+        if any(obj.pk is None for obj in objs):
+            # The database backend does not return the primary keys of the inserted rows
+            return Response({"count": len(objs)}, status=status_code)
+        instances = self.get_queryset().in_bulk([obj.pk for obj in objs])
+        serializer = self.get_serializer([instances[obj.pk] for obj in objs], many=True)
+        return Response(serializer.data, status=status_code)
+
+    def post(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        serializers = [self.get_serializer(data=item) for item in items]
+        errors = [{"index": i, "errors": s.errors} for i, s in enumerate(serializers) if not s.is_valid()]
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        model = self.get_queryset().model
+        m2m_names = [f.name for f in model._meta.many_to_many]
+        objs = []
+        relations = []
+        for serializer in serializers:
+            data = dict(serializer.validated_data)
+            relations.append({name: data.pop(name) for name in m2m_names if name in data})
+            objs.append(model(**data))
+        try:
+            with transaction.atomic():
+                objs = model._default_manager.bulk_create(objs, batch_size=self.bulk_batch_size)
+                if any(relations) and any(obj.pk is None for obj in objs):
+                    raise ValidationError({"non_field_errors": ["Many-to-many relations are not supported by bulk "
+                                                                "creation on this database."]})
+                self.set_bulk_relations(model, objs, relations)
+        except IntegrityError as e:
+            return self.get_integrity_error_response(e)
+        self.bulk_changed(model)
+        return self.get_bulk_response(objs, status.HTTP_201_CREATED)
+
+    def put(self, request, *args, **kwargs):
+        return self.bulk_update(request, partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.bulk_update(request, partial=True)
+
+    def bulk_update(self, request, partial=False):
+        items = self.get_bulk_items(request)
+        model = self.get_queryset().model
+        pk_name = model._meta.pk.name
+        pks = self.get_bulk_pks([item.get(pk_name, item.get("pk")) if isinstance(item, dict) else None
+                                 for item in items])
+        instances = self.filter_queryset(self.get_queryset()).in_bulk([pk for pk in pks if pk is not None])
+        serializers = []
+        errors = []
+        for i, (item, pk) in enumerate(zip(items, pks)):
+            if pk not in instances:
+                errors.append({"index": i, "errors": {pk_name: ["Not found."]}})
+                continue
+            serializer = self.get_serializer(instances[pk], data=item, partial=partial)
+            if not serializer.is_valid():
+                errors.append({"index": i, "errors": serializer.errors})
+            serializers.append(serializer)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        m2m_names = [f.name for f in model._meta.many_to_many]
+        auto_now = [f for f in model._meta.concrete_fields if getattr(f, "auto_now", False)]
+        fields = set()
+        objs = []
+        relations = []
+        for serializer in serializers:
+            obj = serializer.instance
+            relations.append({})
+            for name, value in serializer.validated_data.items():
+                if name in m2m_names:
+                    relations[-1][name] = value
+                else:
+                    setattr(obj, name, value)
+                    fields.add(name)
+            for field in auto_now:
+                field.pre_save(obj, add=False)
+                fields.add(field.name)
+            objs.append(obj)
+        try:
+            with transaction.atomic():
+                if fields:
+                    model._default_manager.bulk_update(objs, list(fields), batch_size=self.bulk_batch_size)
+                self.set_bulk_relations(model, objs, relations, clear=True)
+        except IntegrityError as e:
+            return self.get_integrity_error_response(e)
+        self.bulk_changed(model)
+        return self.get_bulk_response(objs, status.HTTP_200_OK)
+
+    def has_bulk_filters(self, request):
+        """
+        Whether one of the filter_fields (see IndexedFilterMixin) is given in the query parameters
+        """
+        filter_fields = getattr(self, "filter_fields", [])
+        return any(param.partition("__")[0] in filter_fields for param in request.query_params)
+
+    def delete(self, request, *args, **kwargs):
+        """
+        Delete the objects given using ?ids=1,2,3 and/or the filters (see IndexedFilterMixin) with a single
+        queryset.delete()
+        """
+        ids = request.query_params.get("ids")
+        if not ids and not self.has_bulk_filters(request):
+            raise ValidationError({"ids": ["Either ids or a filter is required."]})
+        queryset = self.filter_queryset(self.get_queryset())
+        if ids:
+            queryset = queryset.filter(pk__in=self.get_bulk_pks(ids.split(",")))
+        with transaction.atomic():
+            deleted, _ = queryset.delete()
+        self.bulk_changed(queryset.model)
+        return Response({"deleted": deleted}, status=status.HTTP_200_OK)
+
+'''
+QUERY_COUNT_TESTS = '''from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework.test import APITestCase
+
+# The number of rows the endpoints are called with. The number of queries must be the same for both.
+SMALL_SIZE = 2
+LARGE_SIZE = 10
+
+
+class QueryCountTestMixin:
+    """
+    Fail if the number of queries of the list and the detail endpoints grows with the number of rows
+    """
+    model = None
+    url_name = None
+
+    def setUp(self):
+        user = baker.make(get_user_model(), is_staff=True, is_superuser=True)
+        self.client.force_authenticate(user=user)
+
+    def make_objects(self, quantity):
+        return baker.make(self.model, _quantity=quantity, make_m2m=True)
+
+    def get_num_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries)
+
+    def test_list_num_queries(self):
+        url = reverse(f"{self.url_name}-list")
+        self.make_objects(SMALL_SIZE)
+        num_queries = self.get_num_queries(url)
+        self.make_objects(LARGE_SIZE - SMALL_SIZE)
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_detail_num_queries(self):
+        obj = self.make_objects(SMALL_SIZE)[0]
+        num_queries = self.get_num_queries(reverse(f"{self.url_name}-detail", kwargs={"pk": obj.pk}))
+        obj = self.make_objects(LARGE_SIZE - SMALL_SIZE)[-1]
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(reverse(f"{self.url_name}-detail", kwargs={"pk": obj.pk}))
+        self.assertEqual(response.status_code, 200, response.content)
+
+'''
+LOAD_TEST = '''
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def get_percentile(values, percent):
+    """
+    Get the percentile of the sorted values (nearest rank)
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, math.ceil(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+def get_route_paths(name, model_name, limit=100):
+    """
+    Get the paths of a route: the list path or the detail paths of the first rows
+    """
+    if model_name is None:
+        return [reverse(name)]
+    model = apps.get_model(APP_LABEL, model_name)
+    pks = list(model.objects.order_by("pk").values_list("pk", flat=True)[:limit])
+    return [reverse(name, kwargs={"pk": pk}) for pk in pks]
+
+
+async def run_route(send, paths, requests, concurrency):
+    """
+    Send the requests to the paths of a route (round robin) with the given concurrency
+    :return: (sorted latencies in milliseconds, number of errors, duration in seconds)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def send_one(i):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                status = await send(paths[i % len(paths)])
+            except Exception:
+                status = None
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status is None or status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[send_one(i) for i in range(requests)])
+    return sorted(latencies), errors, time.perf_counter() - start
+
+
+def get_routes_paths(routes=None):
+    """
+    Get the paths of each route (the database is queried, so this is done before starting the event loop)
+    :return: list of (route name, paths)
+    """
+    routes_paths = []
+    for name, model_name in routes or ROUTES:
+        try:
+            paths = get_route_paths(name, model_name)
+        except NoReverseMatch:
+            print(f"{name}: the url is not included in the project urls, skipping it")
+            continue
+        if not paths:
+            print(f"{name}: no rows to request (e.g., run the dummy data generator first), skipping it")
+            continue
+        routes_paths.append((name, paths))
+    return routes_paths
+
+
+async def run_load_test(send, routes_paths, requests=200, concurrency=10, warmup=5):
+    """
+    Load test each route and get its latency percentiles and throughput
+    :param send: coroutine function sending a GET request to a path and returning the status code
+    :param routes_paths: as returned by get_routes_paths
+    :return: dict of the result per route name
+    """
+    results = dict()
+    for name, paths in routes_paths:
+        for path in paths[:warmup]:
+            await send(path)
+        latencies, errors, duration = await run_route(send, paths, requests, concurrency)
+        results[name] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": len(latencies) / duration if duration else 0.0,
+            "p50": get_percentile(latencies, 50),
+            "p95": get_percentile(latencies, 95),
+            "p99": get_percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+            "histogram": get_histogram(latencies),
+        }
+    return results
+
+
+def get_histogram(latencies):
+    """
+    Count the latencies per bucket (the upper bound in milliseconds, None for the slower ones)
+    """
+    counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    for latency in latencies:
+        index = bisect.bisect_left(LATENCY_BUCKETS_MS, latency)
+        counts[index] += 1
+    return list(zip(LATENCY_BUCKETS_MS + [None], counts))
+
+
+def print_results(results):
+    for name, result in results.items():
+        print(f"\\n{name}: {result['requests']} requests, {result['errors']} errors, {result['rps']:.1f} req/s")
+        print(f"  p50 {result['p50']:.2f} ms  p95 {result['p95']:.2f} ms  p99 {result['p99']:.2f} ms  "
+              f"max {result['max']:.2f} ms")
+        width = max([count for _, count in result["histogram"]] + [1])
+        for bound, count in result["histogram"]:
+            if not count:
+                continue
+            label = f"<= {bound} ms" if bound is not None else f"> {LATENCY_BUCKETS_MS[-1]} ms"
+            print(f"  {label:>12} | {'#' * max(1, round(40 * count / width)):<40} {count}")
+
+
+def get_http_sender(base_url, executor):
+    """
+    Send the requests to a running server (e.g., runserver) using urllib in the executor threads
+    """
+    def get(path):
+        try:
+            with urllib.request.urlopen(base_url.rstrip("/") + path) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    async def send(path):
+        return await asyncio.get_running_loop().run_in_executor(executor, get, path)
+    return send
+
+
+def get_wsgi_sender(executor):
+    """
+    Send the requests to the WSGI application in-process using the django test client in the executor threads
+    """
+    local = threading.local()
+
+    def get(path):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        return local.client.get(path).status_code
+
+    async def send(path):
+        return await asyncio.get_running_loop().run_in_executor(executor, get, path)
+    return send
+
+
+def get_asgi_sender():
+    """
+    Send the requests to the ASGI application in-process using the django async test client
+    """
+    client = AsyncClient()
+
+    async def send(path):
+        return (await client.get(path)).status_code
+    return send
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the generated endpoints")
+    parser.add_argument("--base-url", help="The url of a running server (e.g., http://127.0.0.1:8000). "
+                                           "By default, the requests are sent to the application in-process")
+    parser.add_argument("--asgi", action="store_true", help="Send the in-process requests to the ASGI application")
+    parser.add_argument("--requests", type=int, default=200, help="The number of requests per route")
+    parser.add_argument("--concurrency", type=int, default=10, help="The number of concurrent requests")
+    parser.add_argument("--warmup", type=int, default=5, help="The number of requests per route before measuring")
+    parser.add_argument("--routes", default="", help="Only load test the given route names (e.g., book-list)")
+    parser.add_argument("--settings", help="The settings module of the project (default: DJANGO_SETTINGS_MODULE)")
+    args = parser.parse_args()
+    if args.settings:
+        os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+    django.setup()
+    if not args.base_url:
+        setup_test_environment()
+    names = [r.strip() for r in args.routes.split(",") if r.strip()]
+    routes = [route for route in ROUTES if not names or route[0] in names]
+    executor = ThreadPoolExecutor(max_workers=args.concurrency)
+    if args.base_url:
+        send = get_http_sender(args.base_url, executor)
+    elif args.asgi:
+        send = get_asgi_sender()
+    else:
+        send = get_wsgi_sender(executor)
+    routes_paths = get_routes_paths(routes)
+    results = asyncio.run(run_load_test(send, routes_paths, requests=args.requests, concurrency=args.concurrency,
+                                        warmup=args.warmup))
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
+'''
+DUMMY_DATA = '''
+
+def parse_args(args):
+    """
+    Parse the runscript arguments: the number of rows per model (e.g., Book=100000 or shop.Book=100000), the default
+    number of rows (count=100) and the batch size (batch=5000)
+    """
+    counts = dict()
+    batch_size = DEFAULT_BATCH_SIZE
+    for arg in args:
+        name, _, value = arg.partition("=")
+        if not value:
+            raise ValueError(f"Invalid argument: {arg}. Expected Model=count, count=N or batch=N")
+        if name == "batch":
+            batch_size = int(value)
+        else:
+            counts[name] = int(value)
+    return counts, batch_size
+
+
+def get_pks(model, attname, cache):
+    """
+    Get the primary keys (or the values of the referenced field) of the existing rows of the model.
+    A few rows are made if the model has none.
+    """
+    key = (model, attname)
+    if key not in cache:
+        values = list(model._default_manager.values_list(attname, flat=True)[:MAX_PARENT_PKS])
+        if not values:
+            baker.make(model, _quantity=MISSING_PARENTS)
+            values = list(model._default_manager.values_list(attname, flat=True)[:MAX_PARENT_PKS])
+        cache[key] = values
+    return cache[key]
+
+
+def get_relations(model, quantity, cache, used):
+    """
+    Get the values of the ForeignKey and OneToOne fields of the given number of rows, reusing the existing parents.
+    The values referenced by the OneToOne fields are kept in used (a set per field name) across the batches.
+    :return: (dict of the values iterator per field attname, the number of rows that can be made)
+    """
+    relations = dict()
+    for field in model._meta.concrete_fields:
+        if not field.is_relation or field.remote_field.parent_link:
+            continue
+        related_model = field.related_model
+        target = field.target_field.attname
+        if related_model is model:
+            values = list(model._default_manager.values_list(target, flat=True)[:MAX_PARENT_PKS])
+        else:
+            values = get_pks(related_model, target, cache)
+        if field.one_to_one:
+            if field.name not in used:
+                used[field.name] = set(model._default_manager.values_list(field.attname, flat=True))
+            values = [v for v in values if v not in used[field.name]]
+            quantity = min(quantity, len(values))
+            values = random.sample(values, quantity)
+        elif values:
+            values = random.choices(values, k=quantity)
+        if not values:
+            if not field.null:
+                return relations, 0
+            values = [None] * quantity
+        relations[field.attname] = values
+    for field in model._meta.concrete_fields:
+        if field.one_to_one and field.attname in relations:
+            used[field.name].update(relations[field.attname][:quantity])
+    return {attname: iter(values) for attname, values in relations.items()}, quantity
+
+
+def create_rows(model, quantity, batch_size, cache):
+    """
+    Create the rows of the model in batches using bulk_create
+    :return: the number of rows created
+    """
+    created = 0
+    used = dict()
+    while created < quantity:
+        relations, size = get_relations(model, min(batch_size, quantity - created), cache, used)
+        if not size:
+            print(f"{model._meta.label}: no parents to reference, skipping it")
+            break
+        with transaction.atomic():
+            if model._meta.parents:
+                # bulk_create does not support multi-table inheritance
+                baker.make(model, _quantity=size, **relations)
+            else:
+                objs = baker.prepare(model, _quantity=size, **relations)
+                model._default_manager.bulk_create(objs, batch_size=batch_size)
+        created += size
+    for key in list(cache):
+        if key[0] is model:
+            del cache[key]
+    return created
+
+
+def create_many_to_many(model, quantity, batch_size, cache):
+    """
+    Link about M2M_PER_OBJECT random related rows to the rows of the model (using the auto created through models)
+    """
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        if not through._meta.auto_created:
+            continue
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+        source_pks = get_pks(model, model._meta.pk.attname, cache)
+        target_pks = get_pks(field.related_model, field.related_model._meta.pk.attname, cache)
+        total = quantity * M2M_PER_OBJECT
+        for start in range(0, total, batch_size):
+            size = min(batch_size, total - start)
+            links = [through(**{source: random.choice(source_pks), target: random.choice(target_pks)})
+                     for _ in range(size)]
+            through._default_manager.bulk_create(links, batch_size=batch_size, ignore_conflicts=True)
+
+
+def run(*args):
+    counts, batch_size = parse_args(args)
+    cache = dict()
+    created = dict()
+    for label, count in MODELS:
+        model = apps.get_model(label)
+        count = counts.get(label, counts.get(model.__name__, counts.get("count", count)))
+        created[label] = create_rows(model, count, batch_size, cache)
+        print(f"{label}: {created[label]} rows")
+    for label, _ in MODELS:
+        create_many_to_many(apps.get_model(label), created[label], batch_size, cache)
+'''
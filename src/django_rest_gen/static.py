@@ -0,0 +1,386 @@
+import ast
+import copy
+import os
+from django.utils.text import camel_case_to_spaces
+
+RELATION_FIELDS = ["ForeignKey", "OneToOneField", "ManyToManyField"]
+
+
+class StaticField:
+    """
+    A model field recovered from the source code. It mimics the attributes of django fields used by the generator.
+    """
+
+    def __init__(self, name, field_type, args=None, kwargs=None):
+        self.name = name
+        self.field_type = field_type
+        self.args = args or []
+        self.kwargs = kwargs or dict()
+        self.model = None
+        self.related_model = None
+        self.remote_field = None
+        self.is_relation = field_type in RELATION_FIELDS
+        self.many_to_many = field_type == "ManyToManyField"
+        self.many_to_one = field_type == "ForeignKey"
+        self.one_to_one = field_type == "OneToOneField"
+        self.one_to_many = False
+        self.concrete = True
+        self.auto_created = bool(self.kwargs.get("auto_created", False))
+        self.primary_key = bool(self.kwargs.get("primary_key", False))
+        self.unique = self.primary_key or self.one_to_one or bool(self.kwargs.get("unique", False))
+        self.db_index = bool(self.kwargs.get("db_index", self.many_to_one))
+        self.null = bool(self.kwargs.get("null", False))
+        self.blank = bool(self.kwargs.get("blank", False))
+        self.auto_now = bool(self.kwargs.get("auto_now", False))
+        self.auto_now_add = bool(self.kwargs.get("auto_now_add", False))
+        self.attname = f"{name}_id" if (self.many_to_one or self.one_to_one) else name
+        self.column = None if self.many_to_many else self.attname
+
+    @property
+    def related_name(self):
+        return self.kwargs.get("related_name")
+
+    def get_related_target(self):
+        """
+        The name of the related model as written in the source (e.g., "Author", "auth.User" or "self")
+        """
+        if "to" in self.kwargs:
+            return self.kwargs["to"]
+        if self.args:
+            return self.args[0]
+        return None
+
+    def get_internal_type(self):
+        return self.field_type
+
+    def __repr__(self):
+        return f"<StaticField: {self.name} ({self.field_type})>"
+
+
+class StaticRel:
+    """
+    The reverse side of a relation recovered from the source code (e.g., author.books)
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.remote_field = field
+        self.model = field.related_model
+        self.related_model = field.model
+        self.name = field.model._meta.model_name
+        self.is_relation = True
+        self.concrete = False
+        self.auto_created = True
+        self.many_to_many = field.many_to_many
+        self.one_to_many = field.many_to_one
+        self.one_to_one = field.one_to_one
+        self.many_to_one = False
+
+    def get_accessor_name(self):
+        if self.field.related_name:
+            return self.field.related_name
+        if self.one_to_one:
+            return self.name
+        return f"{self.name}_set"
+
+
+class StaticIndex:
+
+    def __init__(self, fields, name=None):
+        self.fields = list(fields)
+        self.name = name
+
+
+class StaticOptions:
+    """
+    Mimics the django model _meta (Options) for models recovered from the source code
+    """
+
+    def __init__(self, model, app_label):
+        self.model = model
+        self.app_label = app_label
+        self.object_name = model.__name__
+        self.model_name = model.__name__.lower()
+        self.label = f"{app_label}.{self.object_name}"
+        self.label_lower = self.label.lower()
+        self.verbose_name = camel_case_to_spaces(model.__name__)
+        self.verbose_name_plural = None
+        self.abstract = False
+        self.proxy = False
+        self.ordering = []
+        self.indexes = []
+        self.unique_together = []
+        self.index_together = []
+        self.local_fields = []
+        self.related_objects = []
+        self.pk = None
+
+    @property
+    def concrete_fields(self):
+        return [f for f in self.local_fields if not f.many_to_many]
+
+    @property
+    def many_to_many(self):
+        return [f for f in self.local_fields if f.many_to_many]
+
+    @property
+    def fields(self):
+        return self.concrete_fields
+
+    def get_fields(self, include_hidden=False):
+        return self.related_objects + self.local_fields
+
+    def get_field(self, name):
+        for field in self.get_fields():
+            if field.name == name or getattr(field, "attname", None) == name:
+                return field
+        raise LookupError(f"{self.object_name} has no field named '{name}'")
+
+
+class StaticModel:
+    """
+    A django model recovered from the source code without importing it
+    """
+
+    def __init__(self, name, app_label, bases=None):
+        self.__name__ = name
+        self.bases = bases or []
+        self._meta = StaticOptions(self, app_label)
+
+    def __repr__(self):
+        return f"<StaticModel: {self.__name__}>"
+
+
+def get_name(node):
+    """
+    Get the (dotted) name of the given ast node (e.g., models.Model)
+    :param node:
+    :return: str or None
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = get_name(node.value)
+        return f"{parent}.{node.attr}" if parent else node.attr
+    return None
+
+
+def get_value(node):
+    """
+    Get the python value of the given ast node. Translated strings (e.g., _("Books")) are unwrapped and names
+    (e.g., Author or settings.AUTH_USER_MODEL) are returned as strings.
+    :param node:
+    :return: value or None if it is not a literal
+    """
+    if isinstance(node, ast.Call) and len(node.args) == 1 and get_name(node.func) in [
+            "_", "gettext_lazy", "gettext", "ugettext_lazy"]:
+        return get_value(node.args[0])
+    if isinstance(node, (ast.Name, ast.Attribute)):
+        return get_name(node)
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [get_value(e) for e in node.elts]
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+
+def parse_field(name, node):
+    """
+    Get the field of the given class body assignment (e.g., title = models.CharField(max_length=100))
+    :param name:
+    :param node: the assigned value
+    :return: StaticField or None if it is not a field
+    """
+    if not isinstance(node, ast.Call):
+        return None
+    field_type = get_name(node.func)
+    if not field_type:
+        return None
+    field_type = field_type.split(".")[-1]
+    if not field_type.endswith("Field") and field_type not in RELATION_FIELDS:
+        return None
+    args = [get_value(a) for a in node.args]
+    kwargs = {k.arg: get_value(k.value) for k in node.keywords if k.arg}
+    return StaticField(name, field_type, args=args, kwargs=kwargs)
+
+
+def parse_meta(model, node):
+    """
+    Set the options of the given model from its Meta class
+    :param model: StaticModel
+    :param node: ast.ClassDef of the Meta class
+    :return:
+    """
+    opts = model._meta
+    for stmt in node.body:
+        if not isinstance(stmt, ast.Assign) or not isinstance(stmt.targets[0], ast.Name):
+            continue
+        key = stmt.targets[0].id
+        if key == "indexes" and isinstance(stmt.value, (ast.List, ast.Tuple)):
+            for index in stmt.value.elts:
+                if isinstance(index, ast.Call):
+                    kwargs = {k.arg: get_value(k.value) for k in index.keywords if k.arg}
+                    opts.indexes.append(StaticIndex(kwargs.get("fields") or [], name=kwargs.get("name")))
+            continue
+        value = get_value(stmt.value)
+        if key in ["verbose_name", "verbose_name_plural"] and isinstance(value, str):
+            setattr(opts, key, value)
+        elif key == "app_label" and isinstance(value, str):
+            opts.app_label = value
+            opts.label = f"{value}.{opts.object_name}"
+            opts.label_lower = opts.label.lower()
+        elif key in ["abstract", "proxy"]:
+            setattr(opts, key, bool(value))
+        elif key in ["ordering", "unique_together", "index_together"] and isinstance(value, (list, tuple)):
+            if key != "ordering" and value and isinstance(value[0], str):
+                value = [value]
+            setattr(opts, key, list(value))
+
+
+def parse_models_source(source, app_label, fpath="models.py"):
+    """
+    Get the model classes (including the abstract ones) defined in the given source code
+    :param source: the content of a models.py
+    :param app_label:
+    :param fpath: used in the syntax errors
+    :return: list of StaticModel
+    """
+    tree = ast.parse(source, filename=fpath)
+    found = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        model = StaticModel(node.name, app_label, bases=[get_name(b) for b in node.bases])
+        for stmt in node.body:
+            if isinstance(stmt, ast.ClassDef) and stmt.name == "Meta":
+                parse_meta(model, stmt)
+            elif isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                field = parse_field(stmt.targets[0].id, stmt.value)
+                if field:
+                    model._meta.local_fields.append(field)
+            elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name) and stmt.value:
+                field = parse_field(stmt.target.id, stmt.value)
+                if field:
+                    model._meta.local_fields.append(field)
+        found.append(model)
+    return found
+
+
+def is_model(model, known):
+    """
+    Whether the given class is a django model: it extends models.Model, a known model or a *Model class
+    :param model: StaticModel
+    :param known: dict of the parsed classes by name
+    :return: bool
+    """
+    for base in model.bases:
+        if not base:
+            continue
+        base_name = base.split(".")[-1]
+        if base_name in known and base_name != model.__name__:
+            if is_model(known[base_name], known):
+                return True
+        elif base_name.endswith("Model"):
+            return True
+    return False
+
+
+def get_models_files(models_path):
+    """
+    Get the python files of a models module or package
+    :param models_path: the path of models.py or the models package directory
+    :return: list of paths
+    """
+    if os.path.isfile(models_path):
+        return [models_path]
+    fpaths = []
+    for curr_dir, dirs, files in os.walk(models_path):
+        dirs.sort()
+        fpaths += [os.path.join(curr_dir, f) for f in sorted(files) if f.endswith(".py")]
+    return fpaths
+
+
+def resolve_models(parsed):
+    """
+    Inherit the fields of the parent classes, add the implicit primary keys and link the relations
+    :param parsed: list of StaticModel (in definition order)
+    :return: list of the concrete StaticModel
+    """
+    known = {m.__name__: m for m in parsed}
+    models = [m for m in parsed if is_model(m, known)]
+    external = dict()
+    for model in models:
+        opts = model._meta
+        inherited = []
+        for base in model.bases:
+            parent = known.get((base or "").split(".")[-1])
+            if parent is None or parent is model:
+                continue
+            if parent._meta.abstract:
+                inherited += [copy.copy(f) for f in parent._meta.local_fields
+                              if f.name not in [i.name for i in inherited]]
+                opts.ordering = opts.ordering or parent._meta.ordering
+            elif not opts.proxy and parent in models:
+                ptr = StaticField(f"{parent._meta.model_name}_ptr", "OneToOneField", args=[parent.__name__],
+                                  kwargs={"primary_key": True, "auto_created": True})
+                inherited.append(ptr)
+        local_names = [f.name for f in opts.local_fields]
+        opts.local_fields = [f for f in inherited if f.name not in local_names] + opts.local_fields
+        if opts.verbose_name_plural is None:
+            opts.verbose_name_plural = f"{opts.verbose_name}s"
+        pks = [f for f in opts.local_fields if f.primary_key]
+        if not pks and not opts.abstract:
+            pks = [StaticField("id", "AutoField", kwargs={"primary_key": True, "auto_created": True})]
+            opts.local_fields.insert(0, pks[0])
+        opts.pk = pks[0] if pks else None
+        for field in opts.local_fields:
+            field.model = model
+    for model in models:
+        if model._meta.abstract:
+            continue
+        for field in model._meta.local_fields:
+            if not field.is_relation:
+                continue
+            target = field.get_related_target()
+            if target == "self":
+                target = model.__name__
+            target = str(target or "").split(".")[-1]
+            related_model = known.get(target)
+            if related_model is None or related_model not in models:
+                if target not in external:
+                    external[target] = StaticModel(target, "external")
+                related_model = external[target]
+            field.related_model = related_model
+            field.remote_field = field
+            related_model._meta.related_objects.append(StaticRel(field))
+    return [m for m in models if not m._meta.abstract]
+
+
+def load_static_models(models_path, app_label=None):
+    """
+    Recover the models of an app by parsing its models.py (or models package) without importing it
+    :param models_path: the path of models.py or the models package directory
+    :param app_label: the django app label (default: the app directory name)
+    :return: list of StaticModel
+    """
+    if not app_label:
+        app_label = os.path.basename(os.path.dirname(os.path.abspath(models_path)))
+    parsed = []
+    for fpath in get_models_files(models_path):
+        with open(fpath) as f:
+            parsed += parse_models_source(f.read(), app_label, fpath=fpath)
+    return resolve_models(parsed)
+
+
+def get_static_classes(models_path, app_label=None):
+    """
+    Get the classes (in the same format and order as apigen.get_classes) by parsing the models source code
+    :param models_path: the path of models.py or the models package directory
+    :param app_label:
+    :return: list of classes
+    """
+    models = sorted(load_static_models(models_path, app_label=app_label), key=lambda m: m.__name__)
+    classes = [(m.__name__, m._meta.verbose_name_plural.title(), m._meta.verbose_name.title(), m) for m in models]
+    print(f"classes: {[c[:3] for c in classes]}")
+    return classes
@@ -13,4 +13,31 @@ def empty_fpath(fpath):
             content = f.read()
             if content.strip() != "":
                 empty = False
-    return empty
\ No newline at end of file
+    return empty
+
+
+def parse_model_options(text, value_type=str, choices=None):
+    """
+    Parse per model options given as "Model1=value1,Model2=value2"
+    :param text:
+    :param value_type: the type to cast the values to
+    :param choices: the allowed values if any
+    :return: dict
+    """
+    options = dict()
+    if not text:
+        return options
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        if "=" not in item:
+            raise Exception(f"Invalid per model option: {item}. Expected Model=value")
+        name, value = [part.strip() for part in item.split("=", 1)]
+        try:
+            value = value_type(value)
+        except ValueError:
+            raise Exception(f"Invalid value for {name}: {value}. Expected {value_type.__name__}")
+        if choices is not None and value not in choices:
+            raise Exception(f"Invalid value for {name}: {value}. Expected one of {', '.join(choices)}")
+        options[name] = value
+    return options
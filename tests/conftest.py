@@ -0,0 +1,95 @@
+import os
+import sys
+import types
+import pytest
+import django
+from django.conf import settings
+
+# Make the fixture app importable as a top level package (e.g., `testapp.models`)
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+
+def pytest_configure():
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.contenttypes",
+            "django.contrib.auth",
+            "testapp",
+        ],
+        DATABASES={
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+            # a separate database standing for a read replica (see test_replicas.py)
+            "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+        },
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        USE_TZ=True,
+    )
+    django.setup()
+
+
+@pytest.fixture(scope="session")
+def django_db_tables():
+    from django.apps import apps
+    from django.db import connection
+    with connection.schema_editor() as editor:
+        for app_label in ["contenttypes", "auth", "testapp"]:
+            for model in apps.get_app_config(app_label).get_models():
+                editor.create_model(model)
+
+
+@pytest.fixture
+def db(django_db_tables):
+    from django.db import transaction
+    atomic = transaction.atomic()
+    atomic.__enter__()
+    yield
+    transaction.set_rollback(True)
+    atomic.__exit__(None, None, None)
+
+
+@pytest.fixture
+def load_generated():
+    """
+    Load the generated code of a file as a module of the fixture app (e.g., testapp.views)
+    """
+    loaded = []
+
+    def load(name, fpath):
+        module = types.ModuleType(f"testapp.{name}")
+        sys.modules[module.__name__] = module
+        loaded.append(module.__name__)
+        with open(fpath) as f:
+            exec(compile(f.read(), fpath, "exec"), module.__dict__)
+        return module
+
+    yield load
+    for name in loaded:
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def generate_views(tmp_path, load_generated):
+    """
+    Generate and load the serializers and the views of the fixture app with the given options (e.g., bulk=True).
+    The signals are generated as well if the responses are cached (and disconnected afterwards).
+    """
+    def generate(sparse=False, explicit_fields=False, **options):
+        from testapp import models
+        from django_rest_gen.apigen import get_classes, write_serializers, write_signals, write_views
+        classes = get_classes(models)
+        serializers_path = os.path.join(tmp_path, "serializers.py")
+        write_serializers(classes, serializers_path, "testapp", sparse=sparse, explicit_fields=explicit_fields)
+        load_generated("serializers", serializers_path)
+        if options.get("cache"):
+            signals_path = os.path.join(tmp_path, "signals.py")
+            write_signals(classes, "testapp", signals_path)
+            load_generated("signals", signals_path)
+        views_path = os.path.join(tmp_path, "views.py")
+        write_views(classes, views_path, "testapp", sparse=sparse, **options)
+        return load_generated("views", views_path)
+
+    yield generate
+    from django.db.models import signals
+    for signal in [signals.post_save, signals.post_delete, signals.m2m_changed]:
+        signal.receivers = [r for r in signal.receivers if getattr(r[1](), "__module__", None) != "testapp.signals"]
+        signal.sender_receivers_cache.clear()
@@ -0,0 +1,44 @@
+import os
+from django.contrib import admin
+from django.contrib.admin import AdminSite
+from testapp import models
+from testapp.models import Author, Book, Event, Publisher, Tag
+from django_rest_gen.apigen import get_classes, get_class_admin, write_admin
+from django_rest_gen.introspect import get_admin_list_display, get_admin_relations, get_admin_search_fields
+
+
+def test_admin_introspection():
+    assert get_admin_list_display(Book) == ["id", "author"]
+    assert get_admin_list_display(Author) == ["id", "name", "publisher"]
+    assert get_admin_search_fields(Author) == ["name__startswith"]
+    assert get_admin_search_fields(Book) == []
+    assert get_admin_search_fields(None) == []
+    assert [f.name for f in get_admin_relations(Book)] == ["author", "tags"]
+
+
+def test_get_class_admin():
+    assert get_class_admin(("Book", "Books", "Book")) == "admin.site.register(Book)\n"
+    # the tuned admin needs the model
+    assert get_class_admin(("Book", "Books", "Book"), tuned=True) == "admin.site.register(Book)\n"
+    assert get_class_admin(("User", "Users", "User", Book), tuned=True) == ""
+    content = get_class_admin(("Book", "Books", "Book", Book), tuned=True, per_page=50)
+    assert "class BookAdmin(admin.ModelAdmin):" in content
+    assert "    list_display = ['id', 'author']\n    list_select_related = ['author']\n" in content
+    assert "    autocomplete_fields = ['author', 'tags']\n" in content
+    assert "    list_per_page = 50\n    list_max_show_all = 50\n    show_full_result_count = False\n" in content
+    assert content.endswith("admin.site.register(Book, BookAdmin)\n")
+
+
+def test_tuned_admin(tmp_path, load_generated, monkeypatch):
+    site = AdminSite()
+    monkeypatch.setattr(admin, "site", site)
+    admin_path = os.path.join(tmp_path, "admin.py")
+    write_admin(get_classes(models), str(tmp_path), admin_path, tuned=True, app_name="testapp")
+    load_generated("admin", admin_path)
+    assert set(site._registry) == {Author, Book, Event, Publisher, Tag}
+    for model_admin in site._registry.values():
+        assert model_admin.check() == []
+        assert model_admin.show_full_result_count is False
+    assert site._registry[Author].search_fields == ["name__startswith"]
+    assert site._registry[Author].autocomplete_fields == ["publisher"]
+    assert site._registry[Event].list_display == ["id", "created"]
@@ -0,0 +1,132 @@
+import asyncio
+import importlib.util
+import json
+import sys
+import django
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import Client, RequestFactory, override_settings
+from django.urls import path
+from testapp.models import Author, Book, Tag
+from django_rest_gen.apigen import get_async_ignored_options, get_class_view, get_root_view
+
+requires_async_orm = pytest.mark.skipif(django.VERSION < (4, 1), reason="the async ORM requires Django >= 4.1")
+HAS_ADRF = importlib.util.find_spec("adrf") is not None
+
+
+def call(view, request, **kwargs):
+    response = async_to_sync(view)(request, **kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response.status_code, json.loads(response.content) if response.content else None
+
+
+def test_get_class_view_async():
+    content = get_class_view("Book", model=Book, async_views=True, page_size=20, sparse=True, bulk=True)
+    assert "class BookList(AsyncListCreateView):" in content
+    assert "queryset = Book.objects.prefetch_related('tags')" in content
+    assert "    page_size = 20\n" in content
+    assert "class BookDetail(AsyncRetrieveUpdateDestroyView):" in content
+    assert "SparseFieldsQuerysetMixin" not in content
+    # the bulk view stays synchronous
+    assert "class BookBulk(BulkMixin, generics.GenericAPIView):" in content
+    root = get_root_view([("Book", "Books", "Book")], async_views=True)
+    assert "class ApiRoot(AsyncJsonMixin, AsyncBaseView):" in root
+    assert "api_root = ApiRoot.as_view()" in root
+
+
+def test_get_async_ignored_options():
+    options = {"async_views": True, "sparse": True, "pagination": "cursor", "fast_list": False, "bulk": True,
+               "paginations": {}}
+    assert get_async_ignored_options(options) == ["--pagination", "--sparse"]
+    assert get_async_ignored_options(dict(options, async_views=False)) == []
+
+
+def test_async_views_module(generate_views):
+    views = generate_views(async_views=True, conditional=True, filters=True)
+    assert views.AsyncBaseView is not None
+    assert not hasattr(views, "ConditionalGetMixin")
+    assert asyncio.iscoroutinefunction(views.BookList.get)
+    assert asyncio.iscoroutinefunction(views.ApiRoot.get)
+
+
+@requires_async_orm
+@override_settings(ALLOWED_HOSTS=["testserver"])
+@pytest.mark.parametrize("adrf", [pytest.param(True, marks=pytest.mark.skipif(not HAS_ADRF, reason="needs adrf")),
+                                  False])
+def test_async_views(db, monkeypatch, adrf, generate_views):
+    if not adrf:
+        # the generated views fall back to django views returning JSON
+        monkeypatch.setitem(sys.modules, "adrf.views", None)
+    views = generate_views(async_views=True, page_size=2)
+    assert views.HAS_ADRF == adrf
+    author = Author.objects.create(name="Someone")
+    tag = Tag.objects.create(label="tag")
+    factory = RequestFactory()
+
+    status, data = call(views.BookList.as_view(), factory.post(
+        "/books/", {"title": "First", "author": author.id, "tags": [tag.id]}, content_type="application/json"))
+    assert status == 201
+    assert data["title"] == "First" and data["tags"] == [tag.id]
+    book = Book.objects.get(pk=data["id"])
+    assert list(book.tags.all()) == [tag]
+    for i in range(2):
+        Book.objects.create(title=f"Book {i}", author=author)
+
+    status, data = call(views.BookList.as_view(), factory.get("/books/"))
+    assert status == 200
+    assert len(data["results"]) == 2 and data["previous"] is None
+    assert data["next"].endswith("/books/?page=2")
+    status, data = call(views.BookList.as_view(), factory.get("/books/", {"page": 2}))
+    assert len(data["results"]) == 1 and data["next"] is None
+
+    detail = views.BookDetail.as_view()
+    status, data = call(detail, factory.get(f"/books/{book.id}/"), pk=book.id)
+    assert status == 200 and data["tags"] == [tag.id]
+    status, data = call(detail, factory.patch(f"/books/{book.id}/", {"title": "Renamed", "tags": []},
+                                              content_type="application/json"), pk=book.id)
+    assert status == 200 and data["title"] == "Renamed" and data["tags"] == []
+    status, data = call(detail, factory.put(f"/books/{book.id}/", {"title": ""}, content_type="application/json"),
+                        pk=book.id)
+    assert status == 400 and "title" in data
+    assert call(detail, factory.delete(f"/books/{book.id}/"), pk=book.id)[0] == 204
+    assert call(detail, factory.get(f"/books/{book.id}/"), pk=book.id)[0] == 404
+
+
+@requires_async_orm
+@override_settings(ALLOWED_HOSTS=["testserver"])
+@pytest.mark.parametrize("adrf", [pytest.param(True, marks=pytest.mark.skipif(not HAS_ADRF, reason="needs adrf")),
+                                  False])
+def test_async_views_many_to_many_depth_0(db, monkeypatch, adrf, generate_views):
+    if not adrf:
+        monkeypatch.setitem(sys.modules, "adrf.views", None)
+    views = generate_views(async_views=True, relation_depth=0)
+    # the tags are rendered in the event loop, so they are prefetched whatever the relation depth
+    assert views.BookList.queryset._prefetch_related_lookups == ("tags",)
+    author = Author.objects.create(name="Someone")
+    tag = Tag.objects.create(label="tag")
+    book = Book.objects.create(title="First", author=author)
+    book.tags.add(tag)
+    factory = RequestFactory()
+    status, data = call(views.BookList.as_view(), factory.get("/books/"))
+    assert status == 200 and data["results"][0]["tags"] == [tag.id]
+    status, data = call(views.BookDetail.as_view(), factory.get(f"/books/{book.id}/"), pk=book.id)
+    assert status == 200 and data["tags"] == [tag.id]
+
+
+@requires_async_orm
+@override_settings(ALLOWED_HOSTS=["testserver"], MIDDLEWARE=["django.middleware.csrf.CsrfViewMiddleware"])
+@pytest.mark.parametrize("adrf", [pytest.param(True, marks=pytest.mark.skipif(not HAS_ADRF, reason="needs adrf")),
+                                  False])
+def test_async_views_csrf(db, monkeypatch, adrf, generate_views):
+    if not adrf:
+        monkeypatch.setitem(sys.modules, "adrf.views", None)
+    views = generate_views(async_views=True)
+    urls = type(sys)("async_urls")
+    urls.urlpatterns = [path("authors/", views.AuthorList.as_view())]
+    author = {"name": "Someone"}
+    with override_settings(ROOT_URLCONF=urls):
+        # the writes are not rejected by the CSRF middleware (there is no session authentication)
+        response = Client(enforce_csrf_checks=True).post("/authors/", author, content_type="application/json")
+    assert response.status_code == 201
+    assert Author.objects.filter(name="Someone").exists()
@@ -0,0 +1,100 @@
+import uuid
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book, Event, Tag
+from django_rest_gen.apigen import get_class_url, get_class_view
+
+
+def batch(view_class, ids):
+    return view_class.as_view()(APIRequestFactory().get("/items/batch/", {"ids": ids}))
+
+
+def create_books(count):
+    author = Author.objects.create(name="Someone")
+    tags = [Tag.objects.create(label=f"tag{i}") for i in range(3)]
+    books = []
+    for i in range(count):
+        book = Book.objects.create(title=f"Book {i}", author=author)
+        book.tags.set(tags[:i % 4])
+        books.append(book)
+    return books
+
+
+def test_get_class_view_batch():
+    content = get_class_view("Book", model=Book, batch=True, batch_max_size=20, cache=True, sparse=True)
+    assert "class BookBatch(CacheResponseMixin, SparseFieldsQuerysetMixin, BatchRetrieveMixin, " \
+           "generics.GenericAPIView):" in content
+    # the same queryset as the list view
+    assert "queryset = Book.objects.prefetch_related('tags')" in content
+    assert "    batch_max_size = 20\n" in content
+    assert "BookBatch" not in get_class_view("Book", model=Book)
+    # the batch view stays synchronous with the async views
+    assert "class BookBatch(BatchRetrieveMixin, generics.GenericAPIView):" in \
+        get_class_view("Book", model=Book, batch=True, async_views=True)
+
+
+def test_get_class_url_batch():
+    content = get_class_url(("Book", "Books", "Book"), batch=True)
+    assert content.index("name='book-batch'") < content.index("name='book-detail'")
+    assert "\tpath('books/batch/', views.BookBatch.as_view(), name='book-batch'),\n" in content
+    assert "batch" not in get_class_url(("Book", "Books", "Book"))
+
+
+def test_batch_order_and_missing(db, generate_views):
+    views = generate_views(batch=True)
+    books = create_books(4)
+    ids = [books[2].id, books[0].id, 999, books[3].id, books[0].id]
+    with CaptureQueriesContext(connection) as ctx:
+        response = batch(views.BookBatch, ",".join(map(str, ids)))
+    assert response.status_code == 200
+    # the books and their tags
+    assert len(ctx.captured_queries) == 2
+    assert [b["id"] for b in response.data["results"]] == [books[2].id, books[0].id, books[3].id]
+    assert response.data["missing"] == [999]
+    detail = views.BookDetail.as_view()(APIRequestFactory().get("/books/"), pk=books[2].id)
+    assert response.data["results"][0] == detail.data
+
+
+def test_batch_uuid_pk(db, generate_views):
+    views = generate_views(batch=True)
+    event = Event.objects.create(payload={"a": 1})
+    unknown = uuid.uuid4()
+    response = batch(views.EventBatch, f"{unknown},{event.pk}")
+    assert response.status_code == 200
+    assert [e["id"] for e in response.data["results"]] == [str(event.pk)]
+    assert response.data["missing"] == [unknown]
+
+
+def test_batch_invalid_ids(db, generate_views):
+    views = generate_views(batch=True, batch_max_size=2)
+    for ids in ["", " , ", "1,x", "1,2,3"]:
+        response = batch(views.BookBatch, ids)
+        assert response.status_code == 400, ids
+        assert "ids" in response.data
+    assert batch(views.EventBatch, "1").status_code == 400
+    # repeated ids are counted once
+    assert batch(views.BookBatch, "1,2,1").status_code == 200
+
+
+def test_batch_cached(db, generate_views):
+    cache.clear()
+    views = generate_views(batch=True, cache=True)
+    try:
+        books = create_books(2)
+        ids = f"{books[1].id},{books[0].id}"
+        first = batch(views.BookBatch, ids).data
+        with CaptureQueriesContext(connection) as ctx:
+            assert batch(views.BookBatch, ids).data == first
+        assert len(ctx.captured_queries) == 0
+        # the cached batch is invalidated on change
+        books[0].title = "Renamed"
+        books[0].save()
+        assert batch(views.BookBatch, ids).data["results"][1]["title"] == "Renamed"
+    finally:
+        from django.db.models import signals
+        for signal in [signals.post_save, signals.post_delete, signals.m2m_changed]:
+            signal.receivers = [r for r in signal.receivers
+                                if getattr(r[1](), "__module__", None) != "testapp.signals"]
+            signal.sender_receivers_cache.clear()
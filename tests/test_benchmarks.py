@@ -0,0 +1,29 @@
+import ast
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+import bench_generator  # noqa: E402
+
+
+def test_get_models_source():
+    source = bench_generator.get_models_source(20, relation_density=1)
+    tree = ast.parse(source)
+    assert len([n for n in tree.body if isinstance(n, ast.ClassDef)]) == 20
+    assert "rel18 = models." in source
+    assert source == bench_generator.get_models_source(20, relation_density=1)
+
+
+def test_run_case():
+    case = bench_generator.run_case(5, relation_density=0.5, depth=1, repeat=1, features=["cache"])
+    assert case["models"] == 5
+    assert list(case["phases"]) == ["guess_app_path", "guess_settings_path", "load_models", "get_classes",
+                                    "write_serializers", "write_views", "write_urls", "write_admin", "write_signals",
+                                    "write_dummy", "serializer_fields"]
+    assert case["phases"]["load_models"]["runs"] == 1
+
+
+def test_run_case_explicit_fields():
+    case = bench_generator.run_case(3, relation_density=1, depth=0, repeat=2, features=["explicit_fields"])
+    assert case["phases"]["serializer_fields"]["runs"] == 2
@@ -0,0 +1,120 @@
+import pytest
+from types import SimpleNamespace
+from django.db import models as django_models
+from django.test.utils import isolate_apps
+from django.urls import path
+from django.urls.resolvers import RegexPattern, URLResolver
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book, Tag
+from django_rest_gen.apigen import get_class_url, get_class_view
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def test_get_class_url_bulk():
+    content = get_class_url(("Book", "Books", "Book"), bulk=True)
+    assert "\tpath('books/bulk/', views.BookBulk.as_view(), name='book-bulk'),\n" in content
+    assert "bulk" not in get_class_url(("Book", "Books", "Book"))
+
+
+@isolate_apps("testapp")
+def test_get_class_url_bulk_str_pk():
+    class Country(django_models.Model):
+        code = django_models.CharField(max_length=2, primary_key=True)
+
+        class Meta:
+            app_label = "testapp"
+
+    content = get_class_url(("Country", "Countries", "Country", Country), bulk=True, export=True, batch=True)
+    assert "<str:pk>" in content
+    # the bulk, export and batch urls are before the detail url, which would match them
+    views = SimpleNamespace(**{f"Country{name}": SimpleNamespace(as_view=lambda name=name: (lambda request: name))
+                               for name in ["List", "Detail", "Bulk", "Export", "Batch"]})
+    resolver = URLResolver(RegexPattern(r"^/"), eval(f"[{content}]", {"path": path, "views": views}))
+    for url, view in [("bulk", "Bulk"), ("export", "Export"), ("batch", "Batch"), ("fr", "Detail")]:
+        assert resolver.resolve(f"/countries/{url}/").func(None) == view
+
+
+@pytest.fixture
+def views(generate_views):
+    return generate_views(bulk=True, bulk_batch_size=2)
+
+
+def test_bulk_create(db, views):
+    author = Author.objects.create(name="Someone")
+    tag = Tag.objects.create(label="tag")
+    items = [{"title": f"Book {i}", "author": author.id, "tags": [tag.id]} for i in range(5)]
+    view = views.BookBulk.as_view()
+    with CaptureQueriesContext(connection) as ctx:
+        response = view(APIRequestFactory().post("/books/bulk/", items, format="json"))
+    assert response.status_code == 201
+    assert [b["title"] for b in response.data] == [f"Book {i}" for i in range(5)]
+    assert Book.objects.count() == 5
+    assert Book.tags.through.objects.count() == 5
+    # Validation queries the author and the tag of each item, the writes do not grow per item
+    inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+    assert len(inserts) == 3 + 3
+
+
+def test_bulk_create_errors(db, views):
+    author = Author.objects.create(name="Someone")
+    items = [{"title": "Valid", "author": author.id}, {"author": author.id}]
+    response = views.BookBulk.as_view()(APIRequestFactory().post("/books/bulk/", items, format="json"))
+    assert response.status_code == 400
+    assert response.data["errors"][0]["index"] == 1
+    assert "title" in response.data["errors"][0]["errors"]
+    assert Book.objects.count() == 0
+
+
+def test_bulk_update_and_delete(db, views):
+    author = Author.objects.create(name="Someone")
+    books = [Book.objects.create(title=f"Book {i}", author=author) for i in range(3)]
+    view = views.BookBulk.as_view()
+    factory = APIRequestFactory()
+
+    items = [{"id": b.id, "title": f"New {b.id}"} for b in books[:2]]
+    response = view(factory.patch("/books/bulk/", items, format="json"))
+    assert response.status_code == 200
+    assert sorted(Book.objects.values_list("title", flat=True)) == [
+        "Book 2", f"New {books[0].id}", f"New {books[1].id}"]
+    assert Book.objects.get(pk=books[0].id).updated > books[0].updated
+
+    response = view(factory.patch("/books/bulk/", [{"id": 0, "title": "Missing"}], format="json"))
+    assert response.status_code == 400
+
+    assert view(factory.delete("/books/bulk/")).status_code == 400
+    response = view(factory.delete(f"/books/bulk/?ids={books[0].id},{books[2].id}"))
+    assert response.data == {"deleted": 2}
+    assert list(Book.objects.values_list("id", flat=True)) == [books[1].id]
+
+
+def test_bulk_create_integrity_error(db, views):
+    # each item is valid on its own, the unique label is only violated by the batch
+    items = [{"label": "same"}, {"label": "same"}]
+    response = views.TagBulk.as_view()(APIRequestFactory().post("/tags/bulk/", items, format="json"))
+    assert response.status_code == 400
+    assert "non_field_errors" in response.data
+    assert Tag.objects.count() == 0
+
+
+def test_bulk_delete_filters(db, generate_views):
+    content = get_class_view("Book", model=Book, bulk=True, filters=True)
+    assert "class BookBulk(IndexedFilterMixin, BulkMixin, generics.GenericAPIView):" in content
+    assert "    filter_fields = ['id', 'author']\n    filter_methods = ('DELETE',)\n" in content
+    assert "IndexedFilterMixin, BulkMixin" not in get_class_view("Book", model=Book, bulk=True)
+
+    views = generate_views(bulk=True, filters=True)
+    author = Author.objects.create(name="Someone")
+    other = Author.objects.create(name="Other")
+    for i in range(3):
+        Book.objects.create(title=f"Book {i}", author=author if i else other)
+    view = views.BookBulk.as_view()
+    factory = APIRequestFactory()
+    assert view(factory.delete("/books/bulk/?title=Book 1")).status_code == 400
+    # the filters are required even if the queryset of the view is already filtered
+    filtered = type("FilteredBookBulk", (views.BookBulk,), {"queryset": Book.objects.filter(author=author)})
+    assert filtered.as_view()(factory.delete("/books/bulk/")).status_code == 400
+    assert Book.objects.count() == 3
+    response = view(factory.delete(f"/books/bulk/?author={author.id}"))
+    assert response.data == {"deleted": 2}
+    assert list(Book.objects.values_list("author", flat=True)) == [other.id]
@@ -0,0 +1,80 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory
+from testapp import models
+from testapp.models import Author, Book, Publisher, Tag
+from django_rest_gen.apigen import get_classes, get_class_signals, is_signals_imported
+from django_rest_gen.utils import parse_model_options
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def test_parse_model_options():
+    assert parse_model_options("") == {}
+    assert parse_model_options("Book=300, Author=60", int) == {"Book": 300, "Author": 60}
+    with pytest.raises(Exception):
+        parse_model_options("Book")
+    with pytest.raises(Exception, match="Invalid value for Book: abc. Expected int"):
+        parse_model_options("Book=abc", int)
+    assert parse_model_options("Book=cursor", choices=["cursor", "nocount"]) == {"Book": "cursor"}
+    with pytest.raises(Exception, match="Invalid value for Book: curser. Expected one of cursor, nocount"):
+        parse_model_options("Book=curser", choices=["cursor", "nocount"])
+
+
+def test_get_class_signals():
+    classes = get_classes(models)
+    content = get_class_signals(("Publisher", "Publishers", "Publisher", Publisher), classes)
+    assert "@receiver([post_save, post_delete], sender=Publisher)" in content
+    # Authors show the publisher id, which is set to null when the publisher is deleted
+    assert "bump_cache_version(Publisher, Author)" in content
+    assert "CACHE_DEPENDENTS[Publisher] = [Author]\n" in content
+    content = get_class_signals(("Book", "Books", "Book", Book), classes)
+    assert "@receiver(m2m_changed, sender=Book.tags.through)" in content
+
+
+@pytest.fixture
+def views(generate_views):
+    cache.clear()
+    return generate_views(cache=True, cache_ttls={"Book": 300}, bulk=True)
+
+
+def test_cache_ttl_per_model(views):
+    assert views.BookList.cache_timeout == 300
+    assert views.TagList.cache_timeout == 60
+
+
+def test_cached_list_invalidated_on_change(db, views):
+    author = Author.objects.create(name="Someone")
+    book = Book.objects.create(title="A book", author=author)
+    view = views.BookList.as_view()
+    factory = APIRequestFactory()
+
+    assert len(view(factory.get("/books/")).data) == 1
+    with CaptureQueriesContext(connection) as ctx:
+        response = view(factory.get("/books/"))
+    assert len(response.data) == 1
+    assert len(ctx.captured_queries) == 0
+
+    Book.objects.create(title="Another book", author=author)
+    assert len(view(factory.get("/books/")).data) == 2
+
+    book.tags.add(Tag.objects.create(label="tag"))
+    assert view(factory.get("/books/")).data[1]["tags"] == [book.tags.get().id]
+
+
+def test_bulk_changed_bumps_dependents(db, views):
+    versions = {model: views.get_cache_version(model) for model in [Publisher, Author, Book]}
+    views.PublisherBulk().bulk_changed(Publisher)
+    # the authors show the publisher id, the books do not
+    assert views.get_cache_version(Publisher) != versions[Publisher]
+    assert views.get_cache_version(Author) != versions[Author]
+    assert views.get_cache_version(Book) == versions[Book]
+
+
+def test_is_signals_imported(tmp_path):
+    assert not is_signals_imported(str(tmp_path))
+    apps_path = tmp_path / "apps.py"
+    apps_path.write_text("class ShopConfig(AppConfig):\n    name = 'shop'\n")
+    assert not is_signals_imported(str(tmp_path))
+    apps_path.write_text(apps_path.read_text() + "\n    def ready(self):\n        from . import signals\n")
+    assert is_signals_imported(str(tmp_path))
@@ -0,0 +1,55 @@
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book, Publisher, Tag
+from django_rest_gen.introspect import get_last_modified_field, get_version_field
+from django_rest_gen.apigen import write_class_view
+
+
+def test_validator_fields():
+    assert get_last_modified_field(Book) == "updated"
+    assert get_last_modified_field(Tag) is None
+    assert get_version_field(Publisher) == "version"
+    assert get_version_field(Book) is None
+
+
+def test_write_class_view_conditional(capsys):
+    write_class_view("Tag", "views.py", write=False, model=Tag, conditional=True)
+    out, err = capsys.readouterr()
+    assert "ConditionalGetMixin" not in out
+    write_class_view("Book", "views.py", write=False, model=Book, conditional=True)
+    out, err = capsys.readouterr()
+    assert "class BookList(ConditionalGetMixin, generics.ListCreateAPIView):" in out
+    assert "class BookDetail(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):" in out
+    assert out.count("last_modified_field = 'updated'") == 2
+
+
+def test_conditional_get_detail(db, generate_views):
+    views = generate_views(conditional=True)
+    author = Author.objects.create(name="Someone")
+    book = Book.objects.create(title="A book", author=author)
+    view = views.BookDetail.as_view()
+    factory = APIRequestFactory()
+
+    response = view(factory.get(f"/books/{book.id}/"), pk=book.id)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+
+    response = view(factory.get(f"/books/{book.id}/", HTTP_IF_NONE_MATCH=etag), pk=book.id)
+    assert response.status_code == 304
+
+    book.title = "Another title"
+    book.save()
+    response = view(factory.get(f"/books/{book.id}/", HTTP_IF_NONE_MATCH=etag), pk=book.id)
+    assert response.status_code == 200
+
+
+def test_conditional_get_list(db, generate_views):
+    views = generate_views(conditional=True)
+    Publisher.objects.create(name="First")
+    view = views.PublisherList.as_view()
+    factory = APIRequestFactory()
+
+    etag = view(factory.get("/publishers/"))["ETag"]
+    assert view(factory.get("/publishers/", HTTP_IF_NONE_MATCH=etag)).status_code == 304
+    Publisher.objects.create(name="Second")
+    assert view(factory.get("/publishers/", HTTP_IF_NONE_MATCH=etag)).status_code == 200
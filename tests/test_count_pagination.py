@@ -0,0 +1,95 @@
+from unittest.mock import patch
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book
+from django_rest_gen.apigen import get_class_pagination, get_class_view, get_views_helpers
+
+
+def get(view_class, params=None):
+    response = view_class.as_view()(APIRequestFactory().get("/books/", params or {}))
+    return response.status_code, response.data
+
+
+@pytest.fixture
+def books(db):
+    author = Author.objects.create(name="Someone")
+    return [Book.objects.create(title=f"Book {i}", author=author) for i in range(5)]
+
+
+def test_get_class_pagination_count():
+    content = get_class_pagination("Book", model=Book, page_size=20, max_page_size=200, pagination="nocount")
+    assert "class BookCountFreePagination(CountFreePagination):" in content
+    assert "    page_size = 20\n    max_page_size = 200\n" in content
+    assert "count_threshold" not in content
+    content = get_class_pagination("Book", model=Book, pagination="estimated", count_threshold=500)
+    assert "class BookEstimatedCountPagination(EstimatedCountPagination):" in content
+    assert "    count_threshold = 500\n" in content
+    content = get_class_view("Book", model=Book, pagination="estimated")
+    assert "    pagination_class = BookEstimatedCountPagination" in content
+
+
+def test_get_views_helpers_per_model():
+    imports, helpers = get_views_helpers("testapp", paginations={"Book": "nocount"})
+    assert "from rest_framework import pagination" in imports
+    assert any("class CountFreePagination" in h for h in helpers)
+    imports, helpers = get_views_helpers("testapp", pagination="cursor")
+    assert not any("class CountFreePagination" in h for h in helpers)
+    imports, helpers = get_views_helpers("testapp", pagination="nocount", async_views=True)
+    assert "from rest_framework import pagination" not in imports
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+def test_count_free_pagination(books, generate_views):
+    views = generate_views(pagination="nocount", page_size=2)
+    with CaptureQueriesContext(connection) as ctx:
+        status, data = get(views.BookList)
+    assert status == 200
+    assert "count" not in data
+    assert [b["id"] for b in data["results"]] == [b.id for b in Book.objects.all()[:2]]
+    assert data["next"] == "http://testserver/books/?page=2" and data["previous"] is None
+    # no COUNT(*): the page and the tags of its books
+    assert len(ctx.captured_queries) == 2
+    assert "COUNT" not in ctx.captured_queries[0]["sql"].upper()
+
+    status, data = get(views.BookList, {"page": 2})
+    assert data["previous"] == "http://testserver/books/" and data["next"].endswith("page=3")
+    status, data = get(views.BookList, {"page": 3})
+    assert len(data["results"]) == 1 and data["next"] is None
+    assert data["previous"].endswith("page=2")
+    status, data = get(views.BookList, {"page": 3, "page_size": 4})
+    assert status == 404
+    assert get(views.BookList, {"page": "x"})[0] == 404
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+def test_estimated_count_pagination(books, generate_views):
+    views = generate_views(paginations={"Book": "estimated"}, page_size=2, count_threshold=3)
+    assert not hasattr(views, "AuthorEstimatedCountPagination")
+    pagination_class = views.BookList.pagination_class
+    # SQLite counts exactly
+    status, data = get(views.BookList)
+    assert status == 200
+    assert data["count"] == 5 and data["count_estimated"] is False
+    assert data["next"].endswith("page=2")
+    with patch.object(pagination_class, "estimated_count_vendors", {connection.vendor}), \
+            patch.object(pagination_class, "get_estimated_count", return_value=4800) as get_estimated_count:
+        with CaptureQueriesContext(connection) as ctx:
+            status, data = get(views.BookList)
+        assert data["count"] == 4800 and data["count_estimated"] is True
+        assert not any("COUNT" in q["sql"].upper() for q in ctx.captured_queries)
+        # below the threshold the rows are counted
+        get_estimated_count.return_value = 2
+        status, data = get(views.BookList)
+        assert data["count"] == 5 and data["count_estimated"] is False
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+def test_count_free_pagination_fast_list(books, generate_views):
+    views = generate_views(pagination="nocount", page_size=2, fast_list=True)
+    fast = get(views.BookList, {"page": 2})[1]
+    with patch.object(views.BookList, "values_list_enabled", False):
+        slow = get(views.BookList, {"page": 2})[1]
+    assert fast == slow
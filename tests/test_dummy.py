@@ -0,0 +1,87 @@
+import os
+from django.db import connection, models as django_models
+from django.test.utils import CaptureQueriesContext, isolate_apps
+from testapp import models
+from testapp.models import Author, Book, Event, Publisher, Tag
+from django_rest_gen.apigen import get_classes, get_dummy_models, write_dummy
+from django_rest_gen.introspect import get_dependency_order
+
+
+def test_get_dependency_order():
+    assert get_dependency_order([Book, Author, Tag, Publisher]) == [Tag, Publisher, Author, Book]
+    assert get_dependency_order([Event, Tag]) == [Event, Tag]
+
+
+def test_get_dummy_models():
+    assert get_dummy_models(get_classes(models), "testapp", dummy_counts={"Book": 1000}) == [
+        ("testapp.Event", 10), ("testapp.Publisher", 10), ("testapp.Author", 10), ("testapp.Book", 1000),
+        ("testapp.Tag", 10)]
+    assert get_dummy_models([("User",), ("Book",)], "testapp", dummy_count=5) == [
+        ("auth.User", 5), ("testapp.Book", 5)]
+
+
+def test_dummygen(tmp_path, db, load_generated):
+    dummy_path = os.path.join(tmp_path, "dummygen.py")
+    write_dummy(get_classes(models), "testapp", dummy_path, overwrite=False, dummy_batch_size=10)
+    dummygen = load_generated("dummygen", dummy_path)
+    assert dummygen.DEFAULT_BATCH_SIZE == 10
+    existing = Author.objects.create(name="Existing")
+
+    with CaptureQueriesContext(connection) as ctx:
+        dummygen.run("Book=25", "count=3", "Author=2")
+    assert Publisher.objects.count() == 3
+    assert Author.objects.count() == 3
+    assert Tag.objects.count() == 3
+    assert Event.objects.count() == 3
+    assert Book.objects.count() == 25
+    # the books reference the existing authors
+    assert set(Book.objects.values_list("author_id", flat=True)) <= set(Author.objects.values_list("id", flat=True))
+    assert Author.objects.filter(publisher__isnull=False).exclude(pk=existing.pk).count() == 2
+    assert Book.tags.through.objects.exists()
+    book_inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "testapp_book"')]
+    assert len(book_inserts) == 3
+
+
+@isolate_apps("testapp")
+def test_dummygen_to_field_and_one_to_one(tmp_path, load_generated):
+    class Edition(django_models.Model):
+        isbn = django_models.CharField(max_length=13, unique=True)
+
+        class Meta:
+            app_label = "testapp"
+
+    class Copy(django_models.Model):
+        edition = django_models.ForeignKey(Edition, to_field="isbn", on_delete=django_models.CASCADE)
+
+        class Meta:
+            app_label = "testapp"
+
+    class Cover(django_models.Model):
+        edition = django_models.OneToOneField(Edition, on_delete=django_models.CASCADE)
+
+        class Meta:
+            app_label = "testapp"
+
+    dummy_path = os.path.join(tmp_path, "dummygen.py")
+    write_dummy(get_classes(models), "testapp", dummy_path, overwrite=False)
+    dummygen = load_generated("dummygen", dummy_path)
+    with connection.schema_editor() as editor:
+        for model in [Edition, Copy, Cover]:
+            editor.create_model(model)
+    try:
+        cache = dict()
+        assert dummygen.create_rows(Edition, 5, 2, cache) == 5
+        # the foreign key references the isbn of the existing editions
+        assert dummygen.create_rows(Copy, 4, 2, cache) == 4
+        assert set(Copy.objects.values_list("edition_id", flat=True)) <= set(
+            Edition.objects.values_list("isbn", flat=True))
+        # each edition gets a single cover across the batches, then there are no editions left
+        with CaptureQueriesContext(connection) as ctx:
+            assert dummygen.create_rows(Cover, 10, 2, cache) == 5
+        assert Cover.objects.values("edition").distinct().count() == 5
+        used_queries = [q for q in ctx.captured_queries if 'FROM "testapp_cover"' in q["sql"]]
+        assert len(used_queries) == 1
+    finally:
+        with connection.schema_editor() as editor:
+            for model in [Cover, Copy, Edition]:
+                editor.delete_model(model)
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.db import models as django_models
+from django.test.utils import isolate_apps
+from django.utils.text import capfirst
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from testapp import models
+from testapp.models import Author, Book, Publisher, Tag
+from django_rest_gen.apigen import get_class_serializer
+from django_rest_gen.declarations import get_serializer_fields
+
+
+def get_model_serializer(model):
+    class Serializer(serializers.ModelSerializer):
+        class Meta:
+            fields = "__all__"
+
+    Serializer.Meta.model = model
+    return Serializer
+
+
+def test_get_serializer_fields():
+    assert get_serializer_fields(Book) == [
+        ("id", "serializers.IntegerField(label='ID', read_only=True)"),
+        ("title", "serializers.CharField(max_length=200)"),
+        ("summary", "serializers.CharField(allow_blank=True, required=False, "
+                    "style={'base_template': 'textarea.html'})"),
+        ("price", "serializers.DecimalField(decimal_places=2, max_digits=8, required=False)"),
+        ("created", "serializers.DateTimeField(read_only=True)"),
+        ("updated", "serializers.DateTimeField(read_only=True)"),
+        ("author", "serializers.PrimaryKeyRelatedField(queryset=Author.objects)"),
+        ("tags", "serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects, required=False)"),
+    ]
+    assert ("name", "serializers.CharField(max_length=100, validators=[UniqueValidator("
+                    "queryset=Publisher.objects, message='publisher with this name already exists.')])"
+            ) in get_serializer_fields(Publisher)
+    # a validator that can not be declared and static (or missing) models
+    assert get_serializer_fields(User) is None
+    assert get_serializer_fields(None) is None
+
+
+@isolate_apps("testapp")
+def test_get_serializer_fields_lazy_text():
+    class Note(django_models.Model):
+        text = django_models.CharField(_("note text"), max_length=10, help_text=_("Some help"))
+
+        class Meta:
+            app_label = "testapp"
+
+    code = dict(get_serializer_fields(Note))["text"]
+    # the translations are read from the model field when the serializer is imported
+    assert code == "serializers.CharField(help_text=Note._meta.get_field('text').help_text, " \
+                   "label=capfirst(Note._meta.get_field('text').verbose_name), max_length=10)"
+    field = eval(code, {"serializers": serializers, "capfirst": capfirst, "Note": Note})
+    assert repr(field) == repr(get_model_serializer(Note)().fields["text"])
+
+
+def test_get_class_serializer_explicit_fields():
+    content = get_class_serializer("Author", model=Author, explicit_fields=True, sparse=True)
+    assert "class AuthorSerializer(SparseFieldsMixin, serializers.ModelSerializer):\n" \
+           "    id = serializers.IntegerField(label='ID', read_only=True)\n" in content
+    assert "        fields = ['id', 'name', 'publisher']\n" in content
+    assert "        return serializers.Serializer.get_fields(self)\n" in content
+    assert "fields = '__all__'" in get_class_serializer("User", model=User, explicit_fields=True)
+    assert "fields = '__all__'" in get_class_serializer("Author", explicit_fields=True)
+
+
+def test_explicit_fields_same_fields(generate_views):
+    generated = generate_views(explicit_fields=True)
+    for model in [Author, Book, Publisher, Tag, models.Event]:
+        expected = get_model_serializer(model)().fields
+        serializer_class = getattr(generated, f"{model.__name__}Serializer")
+        with patch("rest_framework.serializers.model_meta.get_field_info") as get_field_info:
+            fields = serializer_class().fields
+        # the model is not introspected
+        get_field_info.assert_not_called()
+        assert list(fields) == list(expected)
+        assert [repr(f) for f in fields.values()] == [repr(f) for f in expected.values()]
+
+
+def test_explicit_fields_validation(db, generate_views):
+    generated = generate_views(explicit_fields=True)
+    Publisher.objects.create(name="Taken")
+    tag = Tag.objects.create(label="tag")
+    data = {"name": "Taken", "version": "x"}
+    serializer = generated.PublisherSerializer(data=data)
+    assert not serializer.is_valid()
+    expected = get_model_serializer(Publisher)(data=data)
+    expected.is_valid()
+    assert serializer.errors == expected.errors
+
+    author = Author.objects.create(name="Someone")
+    serializer = generated.BookSerializer(data={"title": "Book", "author": author.id, "tags": [tag.id]})
+    assert serializer.is_valid(), serializer.errors
+    book = serializer.save()
+    assert list(book.tags.all()) == [tag]
+    assert generated.BookSerializer(book).data == get_model_serializer(Book)(book).data
@@ -0,0 +1,79 @@
+import json
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book, Tag
+from django_rest_gen.apigen import get_class_url, get_class_view
+
+
+def export(view_class, params=None):
+    response = view_class.as_view()(APIRequestFactory().get("/items/export/", params or {}))
+    assert response.status_code == 200
+    return response, b"".join(response.streaming_content).decode()
+
+
+def create_books(count):
+    author = Author.objects.create(name="Someone")
+    tags = [Tag.objects.create(label=f"tag{i}") for i in range(3)]
+    for i in range(count):
+        book = Book.objects.create(title=f"Book {i}", price=Decimal("1.5") * i, author=author)
+        book.tags.set(tags[:i % 4])
+
+
+def test_get_class_view_export():
+    content = get_class_view("Book", model=Book, export=True, export_chunk_size=50)
+    assert "class BookExport(ExportMixin, generics.GenericAPIView):" in content
+    assert "queryset = Book.objects.prefetch_related('tags')" in content
+    assert "    export_chunk_size = 50\n" in content
+    assert "BookExport" not in get_class_view("Book", model=Book)
+
+
+def test_get_class_url_export():
+    content = get_class_url(("Book", "Books", "Book"), export=True)
+    # before the detail url, which would match export/ for str primary keys
+    assert content.index("name='book-export'") < content.index("name='book-detail'")
+    assert "\tpath('books/export/', views.BookExport.as_view(), name='book-export'),\n" in content
+    assert "export" not in get_class_url(("Book", "Books", "Book"))
+
+
+def test_export_formats(db, generate_views):
+    views = generate_views(export=True, export_chunk_size=2)
+    create_books(5)
+    listed = json.loads(json.dumps(views.BookList.as_view()(APIRequestFactory().get("/books/")).data))
+    listed.sort(key=lambda b: b["id"])
+
+    response, content = export(views.BookExport)
+    assert response["Content-Type"] == "application/json"
+    assert response["Content-Disposition"] == 'attachment; filename="book.json"'
+    assert json.loads(content) == listed
+
+    response, content = export(views.BookExport, {"as": "ndjson"})
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in content.splitlines()] == listed
+
+    # tables without prefetched relations are read with iterator()
+    response, content = export(views.AuthorExport, {"as": "ndjson"})
+    assert [json.loads(line)["name"] for line in content.splitlines()] == ["Someone"]
+
+
+def test_export_empty(db, generate_views):
+    views = generate_views(export=True)
+    assert json.loads(export(views.BookExport)[1]) == []
+    assert export(views.BookExport, {"as": "ndjson"})[1] == ""
+
+
+def test_export_num_queries(db, generate_views):
+    views = generate_views(export=True, export_chunk_size=2)
+    create_books(5)
+    with CaptureQueriesContext(connection) as ctx:
+        export(views.BookExport)
+    # the books and their tags for each of the 3 chunks
+    assert len(ctx.captured_queries) == 6
+
+
+def test_export_unknown_format(db, generate_views):
+    views = generate_views(export=True)
+    response = views.BookExport.as_view()(APIRequestFactory().get("/books/export/", {"as": "csv"}))
+    assert response.status_code == 400
+    assert "as" in response.data
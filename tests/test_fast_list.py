@@ -0,0 +1,98 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book, Event, Tag
+from django_rest_gen.apigen import get_class_view, get_class_tests
+from test_query_tests import run_generated_tests
+
+
+def get_json(view_class, params=None, fast=True):
+    with patch.object(view_class, "values_list_enabled", fast):
+        response = view_class.as_view()(APIRequestFactory().get("/items/", params or {}))
+    response.render()
+    assert response.status_code == 200, response.content
+    return json.loads(response.content)
+
+
+@pytest.fixture
+def books(db):
+    author = Author.objects.create(name="Someone")
+    tags = [Tag.objects.create(label=f"tag{i}") for i in range(3)]
+    books = []
+    for i in range(5):
+        book = Book.objects.create(title=f"Book {i}", summary="", price=Decimal("10.5") * i, author=author)
+        book.tags.set(tags[:i % 4])
+        books.append(book)
+    Event.objects.create(name="event", payload={"a": [1, 2]})
+    return books
+
+
+def test_get_class_view_fast_list():
+    content = get_class_view("Book", model=Book, fast_list=True, cache=True)
+    assert "class BookList(CacheResponseMixin, ValuesListMixin, generics.ListCreateAPIView):" in content
+    assert "class BookDetail(CacheResponseMixin, generics.RetrieveUpdateDestroyAPIView):" in content
+    assert "class BookQueryCountTests(ValuesListTestMixin, QueryCountTestMixin, APITestCase):" in get_class_tests(
+        ("Book", "Books", "Book"), fast_list=True)
+
+
+def test_fast_list_same_json(books, generate_views):
+    views = generate_views(fast_list=True)
+    for view_class in [views.BookList, views.AuthorList, views.EventList, views.TagList]:
+        assert get_json(view_class) == get_json(view_class, fast=False)
+    data = get_json(views.BookList)
+    assert data[2]["price"] == "21.00"
+    assert data[2]["tags"] == [t.pk for t in Tag.objects.filter(label__in=["tag0", "tag1"]).order_by("pk")]
+    assert list(data[0].keys()) == ["id", "title", "summary", "price", "created", "updated", "author", "tags"]
+
+
+def test_fast_list_num_queries(books, generate_views):
+    views = generate_views(fast_list=True)
+    with CaptureQueriesContext(connection) as ctx:
+        get_json(views.BookList)
+    # the books and the primary keys of their tags
+    assert len(ctx.captured_queries) == 2
+    assert "testapp_author" not in ctx.captured_queries[0]["sql"]
+
+
+def test_fast_list_sparse(books, generate_views):
+    views = generate_views(fast_list=True, sparse=True)
+    for params in [{"fields": "id,price"}, {"omit": "tags,summary"}]:
+        assert get_json(views.BookList, params) == get_json(views.BookList, params, fast=False)
+    with CaptureQueriesContext(connection) as ctx:
+        get_json(views.BookList, {"omit": "tags"})
+    assert len(ctx.captured_queries) == 1
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+def test_fast_list_cursor_pagination(books, generate_views):
+    views = generate_views(fast_list=True, pagination="cursor", page_size=2)
+    fast, slow = get_json(views.BookList), get_json(views.BookList, fast=False)
+    assert fast == slow
+    assert fast["next"] is not None
+    cursor = fast["next"].split("cursor=")[1]
+    assert get_json(views.BookList, {"cursor": cursor}) == get_json(views.BookList, {"cursor": cursor}, fast=False)
+
+
+class TwoPerPage(PageNumberPagination):
+    page_size = 2
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+def test_fast_list_page_number_pagination(books, generate_views):
+    views = generate_views(fast_list=True)
+    views.BookList.pagination_class = TwoPerPage
+    fast = get_json(views.BookList, {"page": 2})
+    assert fast == get_json(views.BookList, {"page": 2}, fast=False)
+    assert fast["count"] == 5 and len(fast["results"]) == 2
+
+
+def test_generated_fast_list_tests_pass(tmp_path, db, load_generated):
+    result = run_generated_tests(tmp_path, load_generated, fast_list=True)
+    assert result.testsRun == 15
+    assert result.wasSuccessful(), result.failures + result.errors
@@ -0,0 +1,72 @@
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book, Event, Publisher
+from django_rest_gen.apigen import get_class_view
+from django_rest_gen.introspect import get_filter_fields
+
+
+def test_get_filter_fields():
+    assert get_filter_fields(Book) == ["id", "author"]
+    assert get_filter_fields(Author) == ["id", "name", "publisher"]
+    assert get_filter_fields(Event) == ["id", "created"]
+    assert get_filter_fields(None) == []
+
+
+def test_get_class_view_filters():
+    content = get_class_view("Publisher", model=Publisher, filters=True)
+    assert "class PublisherList(IndexedFilterMixin, generics.ListCreateAPIView):" in content
+    assert "    filter_fields = ['id', 'name']" in content
+    assert "class PublisherDetail(generics.RetrieveUpdateDestroyAPIView):" in content
+    assert "IndexedFilterMixin" not in get_class_view("Publisher", filters=True)
+
+
+def test_filters(db, generate_views):
+    views = generate_views(filters=True)
+    author = Author.objects.create(name="Someone")
+    other = Author.objects.create(name="Other")
+    books = [Book.objects.create(title=f"Book {i}", author=author if i < 3 else other) for i in range(5)]
+    view = views.BookList.as_view()
+
+    response = view(APIRequestFactory().get("/books/", {"author": author.id}))
+    assert response.status_code == 200
+    assert {b["id"] for b in response.data} == {b.id for b in books[:3]}
+    response = view(APIRequestFactory().get("/books/", {"id__gte": books[1].id, "id__lt": books[4].id}))
+    assert {b["id"] for b in response.data} == {b.id for b in books[1:4]}
+    response = view(APIRequestFactory().get("/books/", {"id__range": f"{books[3].id},{books[4].id}",
+                                                        "format": "json"}))
+    assert {b["id"] for b in response.data} == {b.id for b in books[3:]}
+
+    response = views.AuthorList.as_view()(APIRequestFactory().get("/authors/", {"name": "Other"}))
+    assert [a["id"] for a in response.data] == [other.id]
+
+
+def test_filters_rejected(db, generate_views):
+    views = generate_views(filters=True)
+    view = views.BookList.as_view()
+    # not indexed
+    response = view(APIRequestFactory().get("/books/", {"title": "Book 1"}))
+    assert response.status_code == 400
+    assert "title" in response.data
+    # not an exact or a range lookup
+    assert view(APIRequestFactory().get("/books/", {"author__name": "Someone"})).status_code == 400
+    assert view(APIRequestFactory().get("/books/", {"id__icontains": "1"})).status_code == 400
+    # invalid values
+    assert view(APIRequestFactory().get("/books/", {"id": "abc"})).status_code == 400
+    assert view(APIRequestFactory().get("/books/", {"id__range": "1"})).status_code == 400
+    # writes are not filtered
+    response = views.AuthorList.as_view()(APIRequestFactory().post("/authors/?title=x", {"name": "New"}))
+    assert response.status_code == 201
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+def test_filters_with_cursor_pagination(db, generate_views):
+    views = generate_views(filters=True, pagination="cursor", page_size=2)
+    author = Author.objects.create(name="Someone")
+    for i in range(3):
+        Book.objects.create(title=f"Book {i}", author=author)
+    response = views.BookList.as_view()(APIRequestFactory().get("/books/", {"author": author.id}))
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 2
+    response = views.BookList.as_view()(APIRequestFactory().get(response.data["next"]))
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 1
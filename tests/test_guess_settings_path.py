@@ -1,51 +1,44 @@
 import os
 import pytest
-from unittest.mock import Mock
-from django_rest_gen.apigen import guess_settings_path  # Adjust the import according to your package structure
+from django_rest_gen.apigen import guess_settings_path
 
 
-# Mock the get_curr_path function if it's not directly related to filesystem functions
-def mock_get_curr_path():
-    return "/fake/directory"
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    # Mock get_curr_path to return the temporary project directory
+    monkeypatch.setattr('django_rest_gen.apigen.get_curr_path', lambda: str(tmp_path))
+    return tmp_path
 
 
-@pytest.fixture
-def mock_filesystem(monkeypatch):
-    # Mock os.listdir to control directory listing
-    monkeypatch.setattr(os, 'listdir', Mock())
-    # Mock os.path.join to behave normally
-    monkeypatch.setattr(os.path, 'join', os.path.join)
-    # Mock os.path.isdir to identify directories
-    monkeypatch.setattr(os.path, 'isdir', Mock())
-    # Mock os.path.isfile to identify files
-    monkeypatch.setattr(os.path, 'isfile', Mock())
-    # Mock get_curr_path to return a fixed directory path
-    monkeypatch.setattr('django_rest_gen.apigen.get_curr_path', mock_get_curr_path)
-
-
-def test_no_settings_file_found(mock_filesystem):
-    os.listdir.return_value = ["file1.txt", "file2.log"]
-    os.path.isdir.side_effect = lambda x: "dir" in x.split("/")[-1]
-    os.path.isfile.return_value = False
-
-    result = guess_settings_path()
+def test_no_settings_file_found(project):
+    (project / "file1.txt").write_text("")
+    (project / "file2.log").write_text("")
+
+    result = guess_settings_path(use_cache=False)
     assert result is None
 
 
-def test_settings_file_in_current_directory(mock_filesystem):
-    os.listdir.return_value = ["settings.py", "file1.txt"]
-    os.path.isdir.return_value = False
-    os.path.isfile.side_effect = lambda x: x.endswith("settings.py")
+def test_settings_file_in_current_directory(project):
+    (project / "settings.py").write_text("")
+    (project / "file1.txt").write_text("")
+
+    result = guess_settings_path(use_cache=False)
+    assert result == os.path.join(str(project), "settings.py")
+
+
+def test_settings_file_in_subdirectory(project):
+    (project / "dir1").mkdir()
+    (project / "dir1" / "settings.py").write_text("")
 
-    result = guess_settings_path()
-    assert result == "/fake/directory/settings.py"
+    result = guess_settings_path(use_cache=False)
+    assert result == os.path.join(str(project), "dir1", "settings.py")
 
 
-def test_settings_file_in_subdirectory(mock_filesystem):
-    os.listdir.side_effect = [["dir1"], ["settings.py"]]
-    os.path.isdir.side_effect = lambda x: "dir" in x.split("/")[-1]
-    # os.path.isdir.side_effect = lambda x: "dir" in x
-    os.path.isfile.side_effect = lambda x: x.endswith("settings.py")
+def test_settings_file_shallowest_first(project):
+    (project / "a" / "b").mkdir(parents=True)
+    (project / "a" / "b" / "settings.py").write_text("")
+    (project / "z").mkdir()
+    (project / "z" / "settings.py").write_text("")
 
-    result = guess_settings_path()
-    assert result == "/fake/directory/dir1/settings.py"
+    result = guess_settings_path(use_cache=False)
+    assert result == os.path.join(str(project), "z", "settings.py")
@@ -0,0 +1,133 @@
+import os
+from testapp import models
+from django_rest_gen import incremental, static
+from django_rest_gen.apigen import get_classes, generate_app, generate_app_incremental
+
+SOURCE = '''
+from django.db import models
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=50)
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=50)
+
+
+class Tag(models.Model):
+    label = models.CharField(max_length=50)
+'''
+
+
+def read(app_path, fname):
+    with open(os.path.join(app_path, fname)) as f:
+        return f.read()
+
+
+def generate_static(app_path, source, **options):
+    models_path = os.path.join(app_path, "models.py")
+    with open(models_path, "w") as f:
+        f.write(source)
+    classes = static.get_static_classes(models_path)
+    return generate_app_incremental(classes, app_path, overwrite=False, app_name="blog", **options)
+
+
+def test_merge_regions():
+    regions = [("@header", lambda: "header"), ("A", lambda: "a = 1"), ("B", lambda: "b = 2")]
+    text = incremental.mark_region("@header", "old header") + "\n# mine\n\n" + incremental.mark_region("C", "c = 3")
+    content, updated = incremental.merge_regions(text, regions, {"@header", "A", "B"})
+    assert updated == ["@header", "C", "A", "B"]
+    assert content == (incremental.mark_region("@header", "header") + "\n" + incremental.mark_region("A", "a = 1") +
+                       "\n" + incremental.mark_region("B", "b = 2") + "\n# mine\n\n")
+    assert [name for name, _ in incremental.parse_regions(content)] == ["@header", None, "A", None, "B", None]
+
+
+def test_incremental_first_run(tmp_path, db, load_generated):
+    app_path = str(tmp_path)
+    generate_app(get_classes(models), app_path, overwrite=False, dummy=False, app_name="testapp", incremental=True)
+    manifest = incremental.load_manifest(app_path)
+    assert sorted(manifest["models"]) == ["Author", "Book", "Event", "Publisher", "Tag"]
+    views_content = read(app_path, "views.py")
+    assert "# django-rest-gen: begin Book\nclass BookList(generics.ListCreateAPIView):" in views_content
+    assert "# django-rest-gen: end @footer\n" in read(app_path, "urls.py")
+    load_generated("serializers", os.path.join(app_path, "serializers.py"))
+    views = load_generated("views", os.path.join(app_path, "views.py"))
+    assert views.BookList.queryset.model is models.Book
+
+
+def test_incremental_keeps_hand_written_code(tmp_path):
+    app_path = str(tmp_path)
+    generate_static(app_path, SOURCE, relation_depth=1)
+    views_path = os.path.join(app_path, "views.py")
+    with open(views_path) as f:
+        content = f.read()
+    # hand-written code outside the regions and a manual edit inside an unchanged region
+    content = content.replace("TagList(generics.ListCreateAPIView):\n",
+                              "TagList(generics.ListCreateAPIView):\n    throttle_scope = 'tags'\n")
+    with open(views_path, "w") as f:
+        f.write(content + "\n\ndef healthcheck(request):\n    pass\n")
+
+    result = generate_static(app_path, SOURCE, relation_depth=1)
+    assert result["views.py"] == []
+    assert read(app_path, "views.py") == content + "\n\ndef healthcheck(request):\n    pass\n"
+
+    changed_source = SOURCE.replace("    title = models.CharField(max_length=50)\n",
+                                    "    title = models.CharField(max_length=50)\n"
+                                    "    author = models.ForeignKey(Author, on_delete=models.CASCADE)\n")
+    result = generate_static(app_path, changed_source, relation_depth=1)
+    assert result["views.py"] == ["Book"]
+    views_content = read(app_path, "views.py")
+    assert "Book.objects.select_related('author')" in views_content
+    assert "throttle_scope = 'tags'" in views_content
+    assert views_content.endswith("\n\ndef healthcheck(request):\n    pass\n")
+
+
+def test_incremental_added_and_removed_models(tmp_path):
+    app_path = str(tmp_path)
+    generate_static(app_path, SOURCE)
+    source = SOURCE.replace("class Author(models.Model):\n    name = models.CharField(max_length=50)\n", "")
+    source = source.replace("class Tag(", "class Shelf(models.Model):\n    label = models.CharField(max_length=50)\n\n\n"
+                                          "class Tag(")
+    result = generate_static(app_path, source)
+    assert result["urls.py"] == ["Author", "Shelf"]
+    assert result["views.py"] == ["@api_root", "Author", "Shelf"]
+    urls_content = read(app_path, "urls.py")
+    assert "author" not in urls_content
+    assert urls_content.index("views.BookList") < urls_content.index("views.ShelfList") < \
+        urls_content.index("views.TagList") < urls_content.index("views.api_root")
+    assert sorted(incremental.load_manifest(app_path)["models"]) == ["Book", "Shelf", "Tag"]
+
+
+def test_fingerprint_many_to_many(tmp_path):
+    models_path = os.path.join(tmp_path, "models.py")
+    fingerprints = []
+    for label in ["CharField(max_length=50)", "SlugField()"]:
+        with open(models_path, "w") as f:
+            f.write(SOURCE.replace("title = models.CharField(max_length=50)",
+                                   "title = models.CharField(max_length=50)\n    tags = models.ManyToManyField('Tag')")
+                    .replace("label = models.CharField(max_length=50)", f"label = models.{label}"))
+        classes = {c[0]: c for c in static.get_static_classes(models_path)}
+        fingerprints.append(incremental.get_model_fingerprint(classes["Book"], relation_depth=1))
+    # the model of the many-to-many relation is part of the fingerprint
+    assert fingerprints[0] != fingerprints[1]
+
+
+def test_incremental_options_change(tmp_path):
+    app_path = str(tmp_path)
+    generate_static(app_path, SOURCE)
+    result = generate_static(app_path, SOURCE, sparse=True)
+    assert result["serializers.py"] == ["@header", "Author", "Book", "Tag"]
+    assert "class BookSerializer(SparseFieldsMixin, serializers.ModelSerializer):" in read(app_path, "serializers.py")
+
+
+def test_incremental_unmarked_file(tmp_path):
+    app_path = str(tmp_path)
+    with open(os.path.join(app_path, "admin.py"), "w") as f:
+        f.write("from django.contrib import admin\n")
+    generate_static(app_path, SOURCE)
+    assert read(app_path, "admin.py") == "from django.contrib import admin\n"
+    models_path = os.path.join(app_path, "models.py")
+    generate_app(static.get_static_classes(models_path), app_path, overwrite=True, dummy=False, app_name="blog",
+                 incremental=True)
+    assert "# django-rest-gen: begin Author\nadmin.site.register(Author)\n" in read(app_path, "admin.py")
@@ -0,0 +1,137 @@
+import importlib
+import os
+import sys
+import pytest
+from django.core.management import call_command
+from django.db import models as django_models
+from django.test import override_settings
+from django.test.utils import isolate_apps
+from testapp import models
+from testapp.models import Author, Book, Event
+from django_rest_gen import indexes
+from django_rest_gen.apigen import get_classes, generate_app
+from django_rest_gen.introspect import get_index_prefixes, get_indexed_field_names
+
+INITIAL_MIGRATION = """from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    initial = True
+    dependencies = []
+    operations = []
+"""
+
+
+def test_get_index_prefixes():
+    assert get_index_prefixes(Book) == [("id",), ("author",)]
+    assert get_indexed_field_names(Author) == {"id", "name", "publisher"}
+    assert get_indexed_field_names(None) == set()
+
+
+def test_is_covered():
+    assert indexes.is_covered(["title"], [("title", "created")])
+    assert not indexes.is_covered(["created"], [("title", "created")])
+    assert indexes.is_covered(["-created", "title"], [("-created", "title", "id")])
+    # an index can be scanned backwards but not in mixed directions
+    assert indexes.is_covered(["created", "-title"], [("-created", "title")])
+    assert not indexes.is_covered(["-created", "title"], [("created", "title")])
+
+
+def test_get_missing_indexes():
+    assert indexes.get_missing_indexes(Book) == [(["-created", "title"], ["ordering"])]
+    assert indexes.get_missing_indexes(Book, conditional=True) == [
+        (["-created", "title"], ["ordering"]), (["updated"], ["conditional GET"])]
+    assert indexes.get_missing_indexes(Event, pagination="cursor") == []
+    assert indexes.get_missing_indexes(Author) == []
+
+
+@isolate_apps("testapp")
+def test_get_missing_indexes_merges_candidates():
+    class Review(django_models.Model):
+        id = django_models.UUIDField(primary_key=True)
+        book = django_models.ForeignKey(Book, db_index=False, on_delete=django_models.CASCADE)
+        rating = django_models.IntegerField()
+        created = django_models.DateTimeField(auto_now_add=True)
+
+        class Meta:
+            app_label = "testapp"
+            ordering = ["-created"]
+
+    # the cursor pagination and the ordering share a single index
+    assert indexes.get_missing_indexes(Review, pagination="cursor") == [
+        (["-created"], ["ordering", "cursor pagination"]), (["book"], ["join"])]
+
+
+def test_report(tmp_path, capsys):
+    generate_app(get_classes(models), str(tmp_path), overwrite=False, dummy=False, app_name="testapp",
+                 index_advisor=True)
+    out = capsys.readouterr().out
+    assert "testapp.Book (testapp_book):\n  - -created, title: ordering\n" in out
+    assert "models.Index(fields=['-created', 'title'], name='testapp_boo_created_c60958_idx')," in out
+    assert "testapp.Author" not in out
+    assert not os.path.exists(os.path.join(tmp_path, "migrations"))
+
+
+def test_migration_without_migrations(tmp_path, capsys):
+    generate_app(get_classes(models), str(tmp_path), overwrite=False, dummy=False, app_name="testapp",
+                 index_migration=True)
+    assert "The app testapp has no migrations" in capsys.readouterr().out
+
+
+def test_migration(tmp_path, capsys):
+    migrations_path = os.path.join(tmp_path, "testapp_migrations")
+    os.makedirs(migrations_path)
+    for fname, content in [("__init__.py", ""), ("0001_initial.py", INITIAL_MIGRATION)]:
+        with open(os.path.join(migrations_path, fname), "w") as f:
+            f.write(content)
+    sys.path.insert(0, str(tmp_path))
+    try:
+        with override_settings(MIGRATION_MODULES={"testapp": "testapp_migrations"}):
+            migration_name, content = indexes.get_migration("testapp", [(Book, indexes.get_missing_indexes(Book))])
+            generate_app(get_classes(models), str(tmp_path), overwrite=False, dummy=False, app_name="testapp",
+                         index_migration=True)
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("testapp_migrations", None)
+        sys.modules.pop("testapp_migrations.0001_initial", None)
+    assert migration_name == "0002_indexes"
+    assert "('testapp', '0001_initial')" in content
+    assert "migrations.AddIndex(" in content
+    assert "model_name='book'" in content
+    assert "index=models.Index(fields=['-created', 'title'], name='testapp_boo_created_c60958_idx')" in content
+    namespace = dict()
+    exec(compile(content, migration_name, "exec"), namespace)
+    assert len(namespace["Migration"].operations) == 1
+    # the migration of the app is written in its migrations module
+    with open(os.path.join(migrations_path, "0002_indexes.py")) as f:
+        assert "name='testapp_boo_created_c60958_idx'" in f.read()
+
+
+def test_migration_makemigrations_check(tmp_path, capsys, monkeypatch):
+    migrations_path = os.path.join(tmp_path, "testapp_migrations")
+    os.makedirs(migrations_path)
+    with open(os.path.join(migrations_path, "__init__.py"), "w") as f:
+        f.write("")
+    sys.path.insert(0, str(tmp_path))
+    try:
+        with override_settings(MIGRATION_MODULES={"testapp": "testapp_migrations"}):
+            call_command("makemigrations", "testapp", verbosity=0)
+            importlib.invalidate_caches()
+            missing_indexes = indexes.write_indexes(get_classes(models), str(tmp_path), migration=True)
+            assert indexes.META_INDEXES_NOTE in capsys.readouterr().out
+            importlib.invalidate_caches()
+            # the migration alone is reverted by the next makemigrations
+            with pytest.raises(SystemExit):
+                call_command("makemigrations", "testapp", check=True, dry_run=True, verbosity=0)
+            # the Meta indexes of the report applied to the models
+            for model, missing in missing_indexes:
+                meta_indexes = model._meta.indexes + [indexes.get_index(model, fields) for fields, _ in missing]
+                monkeypatch.setattr(model._meta, "indexes", meta_indexes)
+                monkeypatch.setitem(model._meta.original_attrs, "indexes", meta_indexes)
+            call_command("makemigrations", "testapp", check=True, dry_run=True, verbosity=0)
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in [name for name in sys.modules if name.startswith("testapp_migrations")]:
+            sys.modules.pop(name)
+    with open(os.path.join(migrations_path, "0002_indexes.py")) as f:
+        assert f.read().startswith("# The migration only adds the indexes to the database.")
@@ -0,0 +1,38 @@
+from unittest.mock import patch
+from testapp.models import Author, Book, Publisher, Tag
+from django_rest_gen.introspect import get_select_related, get_prefetch_related, get_queryset_relations
+from django_rest_gen.apigen import write_class_view
+
+
+def test_select_related_follows_forward_relations():
+    assert get_select_related(Book) == ["author"]
+    assert get_select_related(Book, max_depth=2) == ["author__publisher"]
+    assert get_select_related(Book, max_depth=0) == []
+    assert get_select_related(Tag) == []
+
+
+def test_prefetch_related_many_to_many():
+    assert get_prefetch_related(Book) == ["tags"]
+    # Reverse relations are only prefetched if the serializer exposes them
+    assert get_prefetch_related(Author) == []
+    assert get_prefetch_related(Author, fields=["id", "name", "books"]) == ["books"]
+    assert get_prefetch_related(Publisher, fields=["id", "name"]) == []
+
+
+def test_queryset_relations_without_model():
+    assert get_queryset_relations(None) == ([], [])
+    # the serializer lists the ids of the tags of each book, so they are prefetched whatever the depth
+    assert get_queryset_relations(Book, max_depth=0) == ([], ["tags"])
+
+
+def test_write_class_view_with_relations():
+    with patch("builtins.print") as mock_print:
+        write_class_view("Book", "views.py", write=False, model=Book)
+        content = mock_print.call_args[0][0]
+    # the serializer only reads author_id, so the author is not joined by default
+    assert "queryset = Book.objects.prefetch_related('tags')" in content
+    with patch("builtins.print") as mock_print:
+        write_class_view("Book", "views.py", write=False, model=Book, relation_depth=1)
+        content = mock_print.call_args[0][0]
+    assert "queryset = Book.objects.select_related('author').prefetch_related('tags')" in content
+    assert "Book.objects.all()" not in content
@@ -0,0 +1,56 @@
+import asyncio
+import os
+from django.test import Client
+from django.test.utils import override_settings
+from testapp import models
+from testapp.models import Author, Book
+from django_rest_gen.apigen import get_classes, generate_app, get_class_load_routes
+
+
+def test_get_class_load_routes():
+    content = get_class_load_routes(("Book", "Books", "Book"))
+    assert content == '    ("book-list", None),\n    ("book-detail", "Book"),\n'
+
+
+def test_loadtest(tmp_path, db, load_generated, capsys):
+    app_path = str(tmp_path)
+    generate_app(get_classes(models), app_path, overwrite=False, dummy=False, app_name="testapp", loadtest=True)
+    for name in ["serializers", "views", "urls"]:
+        load_generated(name, os.path.join(app_path, f"{name}.py"))
+    loadtest = load_generated("loadtest", os.path.join(app_path, "loadtest.py"))
+    assert ("event-detail", "Event") in loadtest.ROUTES
+    assert loadtest.get_percentile([1, 2, 3, 4], 50) == 2
+    assert loadtest.get_percentile(list(range(1, 101)), 99) == 99
+    assert loadtest.get_histogram([0.5, 3, 3, 9000])[:3] == [(1, 1), (2, 0), (5, 2)]
+    assert loadtest.get_histogram([9000])[-1] == (None, 1)
+
+    author = Author.objects.create(name="Someone")
+    Book.objects.bulk_create([Book(title=f"Book {i}", author=author) for i in range(3)])
+    client = Client()
+    sent = []
+
+    async def send(path):
+        sent.append(path)
+        await asyncio.sleep(0)
+        return 500 if path == "/books/" else 200
+
+    routes = [("book-list", None), ("book-detail", "Book"), ("tag-detail", "Tag"), ("unknown-list", None)]
+    with override_settings(ROOT_URLCONF="testapp.urls", ALLOWED_HOSTS=["testserver"]):
+        routes_paths = loadtest.get_routes_paths(routes)
+        assert routes_paths[1] == ("book-detail", [f"/books/{b.pk}/" for b in Book.objects.order_by("pk")])
+        for _, paths in routes_paths:
+            assert client.get(paths[0]).status_code == 200
+    results = loadtest.asyncio.run(loadtest.run_load_test(send, routes_paths, requests=20, concurrency=4, warmup=1))
+    assert list(results) == ["book-list", "book-detail"]
+    # the warmup requests are not measured
+    assert len(sent) == 42
+    assert results["book-list"]["errors"] == 20
+    assert results["book-detail"]["requests"] == 20
+    assert results["book-detail"]["errors"] == 0
+    assert sent[22:25] == routes_paths[1][1]
+    assert results["book-list"]["p50"] <= results["book-list"]["p99"] <= results["book-list"]["max"]
+    out = capsys.readouterr().out
+    assert "tag-detail: no rows to request" in out
+    assert "unknown-list: the url is not included in the project urls" in out
+    loadtest.print_results(results)
+    assert "book-detail: 20 requests, 0 errors" in capsys.readouterr().out
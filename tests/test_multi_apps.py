@@ -0,0 +1,43 @@
+import os
+import pytest
+from unittest.mock import patch
+from testapp.models import Book
+from django_rest_gen.apigen import get_app_configs, get_app_classes, generate_app, workflow
+
+TESTS_PATH = os.path.abspath(os.path.dirname(__file__))
+
+
+def test_get_app_configs():
+    assert [c.label for c in get_app_configs(TESTS_PATH)] == ["testapp"]
+    assert [c.label for c in get_app_configs(TESTS_PATH, app_labels=["auth", "testapp"])] == ["auth", "testapp"]
+    assert [c.label for c in get_app_configs(TESTS_PATH, app_labels=["django.contrib.auth"])] == ["auth"]
+    with pytest.raises(Exception):
+        get_app_configs(TESTS_PATH, app_labels=["unknown"])
+
+
+def test_get_app_classes():
+    classes = get_app_classes(get_app_configs(TESTS_PATH, app_labels=["testapp"])[0])
+    assert ("Book", "Books", "Book", Book) in classes
+
+
+def test_generate_app(tmp_path):
+    config = get_app_configs(TESTS_PATH, app_labels=["auth"])[0]
+    generate_app(get_app_classes(config), str(tmp_path), overwrite=False, dummy=False, app_name=config.name,
+                 app_label=config.label, relation_depth=1)
+    with open(os.path.join(tmp_path, "views.py")) as f:
+        content = f.read()
+    assert content.startswith("from django.contrib.auth.models import *\n")
+    assert "class PermissionList(generics.ListCreateAPIView):" in content
+    assert "Permission.objects.select_related('content_type')" in content
+
+
+def test_workflow_all_apps_sets_up_django_once():
+    with patch("django_rest_gen.apigen.setup_django") as mock_setup, \
+            patch("django_rest_gen.apigen.generate_app") as mock_generate:
+        workflow(python_path=TESTS_PATH, app_path=None, settings_fpath="proj/settings.py", overwrite=False,
+                 dummy=False, apps=["auth", "testapp"], sparse=True)
+        mock_setup.assert_called_once_with(python_path=TESTS_PATH, settings_fpath="proj/settings.py")
+        assert mock_generate.call_count == 2
+        args, kwargs = mock_generate.call_args
+        assert kwargs["app_name"] == "testapp"
+        assert kwargs["sparse"] is True
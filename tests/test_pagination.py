@@ -0,0 +1,29 @@
+from unittest.mock import patch
+from testapp.models import Book, Event, Tag
+from django_rest_gen.introspect import get_cursor_ordering
+from django_rest_gen.apigen import write_class_view, get_class_pagination
+
+
+def test_cursor_ordering():
+    assert get_cursor_ordering(None) == "-pk"
+    assert get_cursor_ordering(Book) == "-pk"
+    assert get_cursor_ordering(Tag) == "-pk"
+    # UUID primary keys are not monotonic
+    assert get_cursor_ordering(Event) == "-created"
+
+
+def test_get_class_pagination():
+    content = get_class_pagination("Event", model=Event, page_size=50, max_page_size=500)
+    assert "class EventCursorPagination(pagination.CursorPagination):" in content
+    assert "ordering = '-created'" in content
+    assert "page_size = 50" in content
+    assert "max_page_size = 500" in content
+
+
+def test_write_class_view_cursor_pagination():
+    with patch("builtins.print") as mock_print:
+        write_class_view("Book", "views.py", write=False, model=Book, pagination="cursor")
+        content = mock_print.call_args[0][0]
+    assert "class BookCursorPagination(pagination.CursorPagination):" in content
+    assert content.count("pagination_class = BookCursorPagination") == 1
+    assert content.index("BookCursorPagination") < content.index("class BookList")
@@ -0,0 +1,50 @@
+import io
+import os
+import unittest
+from django.test.utils import override_settings
+from testapp import models
+from django_rest_gen.apigen import get_classes, get_class_url, get_class_tests, generate_app
+
+
+def test_get_class_tests():
+    content = get_class_tests(("Book", "Books", "Book"))
+    assert "class BookQueryCountTests(QueryCountTestMixin, APITestCase):" in content
+    assert 'url_name = "book"' in content
+
+
+def test_get_class_url_pk_converter():
+    assert "<uuid:pk>" in get_class_url(("Event", "Events", "Event", models.Event))
+    assert "<int:pk>" in get_class_url(("Book", "Books", "Book", models.Book))
+
+
+def run_generated_tests(tmp_path, load_generated, edit_views=None, **options):
+    app_path = str(tmp_path)
+    generate_app(get_classes(models), app_path, overwrite=False, dummy=False, app_name="testapp", tests=True,
+                 **options)
+    if edit_views:
+        views_path = os.path.join(app_path, "views.py")
+        with open(views_path) as f:
+            content = edit_views(f.read())
+        with open(views_path, "w") as f:
+            f.write(content)
+    for name in ["serializers", "views", "urls"]:
+        load_generated(name, os.path.join(app_path, f"{name}.py"))
+    tests = load_generated("tests_api", os.path.join(app_path, "tests_api.py"))
+    suite = unittest.defaultTestLoader.loadTestsFromModule(tests)
+    with override_settings(ROOT_URLCONF="testapp.urls"):
+        return unittest.TextTestRunner(stream=io.StringIO()).run(suite)
+
+
+def test_generated_tests_pass(tmp_path, db, load_generated):
+    result = run_generated_tests(tmp_path, load_generated)
+    assert result.testsRun == 10
+    assert result.wasSuccessful(), result.failures + result.errors
+
+
+def test_generated_tests_catch_n_plus_one(tmp_path, db, load_generated):
+    result = run_generated_tests(tmp_path, load_generated,
+                                 edit_views=lambda content: content.replace(".prefetch_related('tags')", ".all()"))
+    failed = sorted(test.id().split(".")[-2:][0] for test, _ in result.failures)
+    # Without prefetch_related the list of books queries the tags of each book
+    assert "BookQueryCountTests" in failed
+    assert not result.errors
@@ -0,0 +1,57 @@
+import os
+import pytest
+from unittest.mock import patch
+from testapp import models
+from django_rest_gen import render
+from django_rest_gen.apigen import get_classes, generate_app
+
+
+def test_atomic_write(tmp_path):
+    fpath = os.path.join(tmp_path, "views.py")
+    render.atomic_write(fpath, "old\n")
+    with patch("os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            render.atomic_write(fpath, "new\n")
+    # the file is left as is and the temporary file is removed
+    with open(fpath) as f:
+        assert f.read() == "old\n"
+    assert os.listdir(tmp_path) == ["views.py"]
+    render.atomic_write(fpath, "new\n")
+    with open(fpath) as f:
+        assert f.read() == "new\n"
+
+
+def test_get_diff(tmp_path):
+    fpath = os.path.join(tmp_path, "urls.py")
+    with open(fpath, "w") as f:
+        f.write("a\nb\n")
+    diff = render.get_diff(fpath, "a\nc\n")
+    assert f"--- a/{fpath}\n+++ b/{fpath}\n" in diff
+    assert "-b\n+c\n" in diff
+    assert render.get_diff(fpath, "a\nb\n") == ""
+
+
+def test_generate_app_writes_each_file_once(tmp_path):
+    app_path = str(tmp_path)
+    with patch("django_rest_gen.render.atomic_write", wraps=render.atomic_write) as mock_write:
+        generate_app(get_classes(models), app_path, overwrite=False, dummy=True, app_name="testapp", cache=True)
+    written = sorted(os.path.basename(c.args[0]) for c in mock_write.call_args_list)
+    assert written == ["admin.py", "dummygen.py", "serializers.py", "signals.py", "urls.py", "views.py"]
+
+
+def test_generate_app_diff(tmp_path, capsys):
+    app_path = str(tmp_path)
+    generate_app(get_classes(models), app_path, overwrite=False, dummy=False, app_name="testapp")
+    with open(os.path.join(app_path, "views.py")) as f:
+        views_content = f.read()
+    capsys.readouterr()
+
+    generate_app(get_classes(models), app_path, overwrite=True, dummy=False, app_name="testapp", sparse=True,
+                 diff=True)
+    out = capsys.readouterr().out
+    assert "+class BookSerializer(SparseFieldsMixin, serializers.ModelSerializer):" in out
+    assert "-class BookSerializer(serializers.ModelSerializer):" in out
+    assert "urls.py" not in out
+    # nothing is written
+    with open(os.path.join(app_path, "views.py")) as f:
+        assert f.read() == views_content
@@ -0,0 +1,109 @@
+import os
+import pytest
+from django.db import connections, transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book
+from django_rest_gen.apigen import get_class_view, get_routers_code, get_views_helpers, write_routers
+
+
+@pytest.fixture(scope="session")
+def replica_tables(django_db_tables):
+    from django.apps import apps
+    with connections["replica"].schema_editor() as editor:
+        for app_label in ["contenttypes", "auth", "testapp"]:
+            for model in apps.get_app_config(app_label).get_models():
+                editor.create_model(model)
+
+
+@pytest.fixture
+def replica_db(db, replica_tables):
+    atomic = transaction.atomic(using="replica")
+    atomic.__enter__()
+    yield
+    transaction.set_rollback(True, using="replica")
+    atomic.__exit__(None, None, None)
+
+
+@pytest.fixture
+def routers(tmp_path, load_generated):
+    routers_path = os.path.join(tmp_path, "routers.py")
+    write_routers("testapp", routers_path, replicas=["replica"])
+    return load_generated("routers", routers_path)
+
+
+@pytest.fixture
+def views(generate_views, routers):
+    views = generate_views(replica=True, batch=True, bulk=True)
+    with override_settings(DATABASE_ROUTERS=[routers.ReplicaRouter()]):
+        yield views
+
+
+def test_get_class_view_replica():
+    content = get_class_view("Book", model=Book, replica=True, cache=True, batch=True, bulk=True)
+    assert "class BookList(ReplicaReadMixin, CacheResponseMixin, generics.ListCreateAPIView):" in content
+    assert "class BookDetail(ReplicaReadMixin, CacheResponseMixin, generics.RetrieveUpdateDestroyAPIView):" in content
+    assert "class BookBatch(ReplicaReadMixin, CacheResponseMixin, BatchRetrieveMixin, " in content
+    assert "class BookBulk(Bulk" in content
+    assert "ReplicaReadMixin" not in get_class_view("Book", model=Book)
+    imports, _ = get_views_helpers("testapp", replica=True)
+    assert "from testapp.routers import replica_reads" in imports
+    # the async views do not read from the replicas
+    assert get_views_helpers("testapp", replica=True, async_views=True)[0] == get_views_helpers(
+        "testapp", async_views=True)[0]
+
+
+def test_get_routers_code():
+    content = get_routers_code("shop", replicas=["replica1", "replica2"])
+    assert 'DATABASE_ROUTERS = ["shop.routers.ReplicaRouter"]' in content
+    assert "REPLICA_DATABASES = ['replica1', 'replica2']\n" in content
+    content = get_routers_code("shop", replicas=["replica1"], replica_weights={"replica2": 3})
+    assert "REPLICA_DATABASES = {'replica1': 1, 'replica2': 3}\n" in content
+    compile(content, "routers.py", "exec")
+
+
+def test_choose_replica(routers):
+    # the aliases that are not in DATABASES are ignored
+    with override_settings(REPLICA_DATABASES=["replica", "default", "unknown"]):
+        chosen = [routers.choose_replica() for _ in range(4)]
+    # round-robin
+    assert set(chosen[:2]) == {"replica", "default"} and chosen[2:] == chosen[:2]
+    with override_settings(REPLICA_DATABASES={"replica": 2, "default": 0, "unknown": 1}):
+        assert {routers.choose_replica() for _ in range(10)} == {"replica"}
+    with override_settings(REPLICA_DATABASES=["unknown"]):
+        assert routers.choose_replica() is None
+    assert routers.choose_replica() == "replica"
+
+
+def test_router_read_your_writes(replica_db, routers):
+    router = routers.ReplicaRouter()
+    assert router.db_for_read(Author) is None
+    with routers.replica_reads():
+        assert router.db_for_read(Author) == "replica"
+        assert router.db_for_write(Author) is None
+        assert router.db_for_read(Author) is None
+    assert router.db_for_read(Author) is None
+
+
+def test_replica_reads(replica_db, views):
+    factory = APIRequestFactory()
+    replica = Author.objects.using("replica").create(pk=100, name="On the replica")
+    primary = Author.objects.create(name="On the primary")
+
+    response = views.AuthorList.as_view()(factory.get("/authors/"))
+    assert [a["name"] for a in response.data] == ["On the replica"]
+    response = views.AuthorDetail.as_view()(factory.get("/authors/"), pk=replica.pk)
+    assert response.data["name"] == "On the replica"
+
+    # writes and their reads go to the primary
+    response = views.AuthorList.as_view()(factory.post("/authors/", {"name": "New"}, format="json"))
+    assert response.status_code == 201
+    assert Author.objects.using("default").filter(name="New").exists()
+    assert not Author.objects.using("replica").filter(name="New").exists()
+    response = views.AuthorDetail.as_view()(factory.patch("/authors/", {"name": "Renamed"}, format="json"),
+                                            pk=primary.pk)
+    assert response.status_code == 200
+    assert Author.objects.using("default").get(pk=primary.pk).name == "Renamed"
+
+    response = views.AuthorBatch.as_view()(factory.get("/authors/batch/", {"ids": f"{primary.pk},{replica.pk}"}))
+    assert response.data["missing"] == [primary.pk]
@@ -0,0 +1,42 @@
+import os
+from unittest.mock import patch
+from django_rest_gen import scanner
+
+
+def test_scan_project_single_walk(tmp_path):
+    (tmp_path / "proj").mkdir()
+    (tmp_path / "proj" / "settings.py").write_text("")
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "models.py").write_text("x" * 100)
+
+    with patch("django_rest_gen.scanner.os.scandir", wraps=os.scandir) as mock_scandir:
+        result = scanner.scan_project(str(tmp_path), use_cache=False)
+    assert result["settings"] == [os.path.join(str(tmp_path), "proj", "settings.py")]
+    assert result["apps"] == [os.path.join(str(tmp_path), "app")]
+    assert mock_scandir.call_count == 3
+
+
+def test_scan_project_cache(tmp_path):
+    project = tmp_path / "project"
+    (project / "app").mkdir(parents=True)
+    (project / "app" / "models.py").write_text("x" * 100)
+    cache_path = str(tmp_path / "cache" / "scan.json")
+
+    result = scanner.scan_project(str(project), cache_path=cache_path)
+    assert os.path.exists(cache_path)
+    with patch("django_rest_gen.scanner.walk_project") as mock_walk:
+        assert scanner.scan_project(str(project), cache_path=cache_path)["apps"] == result["apps"]
+        mock_walk.assert_not_called()
+
+    # Adding a directory invalidates the cache
+    (project / "app2").mkdir()
+    (project / "app2" / "models.py").write_text("x" * 100)
+    result = scanner.scan_project(str(project), cache_path=cache_path)
+    assert result["apps"] == [os.path.join(str(project), "app"), os.path.join(str(project), "app2")]
+
+    # Editing a models.py in place does not change the mtime of its directory
+    (project / "app3").mkdir()
+    (project / "app3" / "models.py").write_text("")
+    assert os.path.join(str(project), "app3") not in scanner.scan_project(str(project), cache_path=cache_path)["apps"]
+    (project / "app3" / "models.py").write_text("x" * 100)
+    assert os.path.join(str(project), "app3") in scanner.scan_project(str(project), cache_path=cache_path)["apps"]
@@ -1,6 +1,8 @@
+import os
 import pytest
-from unittest.mock import mock_open, patch, call
-from django_rest_gen.apigen import write_class_serializer, write_serializers, add_serializers_imports, get_app_name
+from unittest.mock import mock_open, patch
+from django_rest_gen.apigen import write_class_serializer, write_serializers, get_app_name, get_class_serializer, \
+    get_serializers_imports
 
 
 def test_write_class_serializer_prints_correctly():
@@ -54,8 +56,7 @@ def app_path():
 # Test the function with typical inputs
 def test_write_serializers(classes, serializers_path, app_path):
     with patch('django_rest_gen.utils.empty_fpath') as mock_empty, \
-            patch('django_rest_gen.apigen.add_serializers_imports') as mock_add_imports, \
-            patch('django_rest_gen.apigen.write_class_serializer') as mock_write_serializer:
+            patch('django_rest_gen.render.write_file') as mock_write_file:
         # Setup mock returns
         mock_empty.return_value = True
 
@@ -65,32 +66,27 @@ def test_write_serializers(classes, serializers_path, app_path):
         # Check if empty_fpath was called correctly
         mock_empty.assert_called_once_with(serializers_path)
 
-        # Check if imports were added correctly
-        mock_add_imports.assert_called_once_with(serializers_path=serializers_path, app_name=get_app_name(app_path),
-                                                 write=True)
-
-        # Ensure that write_class_serializer was called for each class
-        assert mock_write_serializer.call_count == len(classes)
-        calls = [call(class_name=cls[0], fpath=serializers_path, write=True) for cls in classes]
-        mock_write_serializer.assert_has_calls(calls, any_order=True)
+        # The whole file is written at once
+        expected_content = get_serializers_imports(get_app_name(app_path))
+        expected_content += "".join([get_class_serializer(cls[0]) for cls in classes])
+        mock_write_file.assert_called_once_with(serializers_path, expected_content, write=True, diff=False)
 
 
 # Test with no classes
 def test_write_serializers_empty(classes, serializers_path, app_path):
-    with patch('django_rest_gen.utils.empty_fpath') as mock_empty, \
-            patch('django_rest_gen.apigen.add_serializers_imports') as mock_add_imports, \
-            patch('django_rest_gen.apigen.write_class_serializer') as mock_write_serializer:
+    with patch('django_rest_gen.apigen.get_class_serializer') as mock_class_serializer, \
+            patch('django_rest_gen.render.write_file') as mock_write_file:
         # Setup the scenario where no classes are provided
         write_serializers([], serializers_path, app_path)
 
-        # Check that class serializer writer was not called
-        mock_write_serializer.assert_not_called()
+        # Check that class serializer was not rendered
+        mock_class_serializer.assert_not_called()
+        mock_write_file.assert_called_once()
 
 
 # Test the function with typical inputs
 def test_add_serializers_imports_without_writing(monkeypatch, capfd):
-    with patch('django_rest_gen.utils.empty_fpath') as mock_empty, \
-            patch('django_rest_gen.apigen.write_class_serializer') as mock_write_serializer:
+    with patch('django_rest_gen.utils.empty_fpath') as mock_empty:
         # Setup mock returns
         mock_empty.return_value = False
 
@@ -112,25 +108,15 @@ def test_add_serializers_imports_without_writing(monkeypatch, capfd):
         assert "from rest_framework import serializers" in out
 
 
-def test_add_serializers_imports_with_writing(monkeypatch):
-    with patch('django_rest_gen.utils.empty_fpath') as mock_empty, \
-            patch('django_rest_gen.apigen.write_class_serializer') as mock_write_serializer:
-        app_path = "/path/to/my_app"
-        serializers_path = "/path/to/my_app/serializers.py"
-
-        # Setup a mock for the open function
-        m = mock_open()
-        monkeypatch.setattr("builtins.open", m)
-
-        # Call the function with `write` set to True
-        write_serializers([], serializers_path, app_path)
+def test_add_serializers_imports_with_writing(tmp_path):
+    app_path = os.path.join(tmp_path, "my_app")
+    os.mkdir(app_path)
+    serializers_path = os.path.join(app_path, "serializers.py")
 
-        # Ensure that open was called correctly
-        m.assert_called_once_with(serializers_path, "a")
+    # Call the function with an empty file
+    write_serializers([], serializers_path, app_path)
 
-        # Ensure the write function was called with the correct content
-        handle = m()
-        handle.write.assert_called_once_with(
-            "from my_app.models import *\n"
-            "from rest_framework import serializers\n\n"
-        )
+    with open(serializers_path) as f:
+        assert f.read() == "from my_app.models import *\nfrom rest_framework import serializers\n\n"
+    # The temporary file replaced the target
+    assert os.listdir(app_path) == ["serializers.py"]
@@ -0,0 +1,41 @@
+from rest_framework.test import APIRequestFactory
+from testapp.models import Author, Book, Tag
+from django_rest_gen.apigen import write_class_serializer
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def test_write_class_serializer_sparse(capsys):
+    write_class_serializer("Book", "serializers.py", write=False, sparse=True)
+    out, err = capsys.readouterr()
+    assert "class BookSerializer(SparseFieldsMixin, serializers.ModelSerializer):" in out
+
+
+def test_sparse_fields_list(db, generate_views):
+    views = generate_views(sparse=True)
+    author = Author.objects.create(name="Someone")
+    book = Book.objects.create(title="A book", summary="Long text", author=author)
+    book.tags.add(Tag.objects.create(label="tag"))
+
+    view = views.BookList.as_view()
+    response = view(APIRequestFactory().get("/books/", {"fields": "id,title"}))
+    assert response.status_code == 200
+    assert response.data[0] == {"id": book.id, "title": "A book"}
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = view(APIRequestFactory().get("/books/", {"omit": "summary,tags"}))
+        response.render()
+    assert "summary" not in response.data[0] and "tags" not in response.data[0]
+    assert response.data[0]["author"] == author.id
+    # Omitted columns and relations are neither selected nor prefetched
+    assert len(ctx.captured_queries) == 1
+    assert "summary" not in ctx.captured_queries[0]["sql"]
+
+
+def test_sparse_fields_detail_without_params(db, generate_views):
+    views = generate_views(sparse=True)
+    author = Author.objects.create(name="Someone")
+    book = Book.objects.create(title="A book", author=author)
+    response = views.BookDetail.as_view()(APIRequestFactory().get(f"/books/{book.id}/"), pk=book.id)
+    assert response.status_code == 200
+    assert set(response.data.keys()) == {"id", "title", "summary", "price", "author", "tags", "created", "updated"}
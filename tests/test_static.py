@@ -0,0 +1,84 @@
+import os
+from unittest.mock import patch
+import testapp
+from django_rest_gen import static
+from django_rest_gen.apigen import get_classes, write_views, workflow
+from django_rest_gen.introspect import get_queryset_relations, get_cursor_ordering, get_last_modified_field
+
+TESTAPP_MODELS = os.path.join(os.path.dirname(testapp.__file__), "models.py")
+
+SOURCE = '''
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class TimeStamped(models.Model):
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        abstract = True
+
+
+class Category(TimeStamped):
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        verbose_name = _("category")
+        verbose_name_plural = _("categories")
+        ordering = ["name"]
+        indexes = [models.Index(fields=["name", "created"], name="cat_idx")]
+
+
+class Article(TimeStamped):
+    category = models.ForeignKey("Category", on_delete=models.CASCADE, related_name="articles")
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    parent = models.ForeignKey("self", null=True, on_delete=models.SET_NULL)
+
+
+class Status(models.TextChoices):
+    DRAFT = "draft"
+'''
+
+
+def test_parse_models_source():
+    models = static.resolve_models(static.parse_models_source(SOURCE, "blog"))
+    assert [m.__name__ for m in models] == ["Category", "Article"]
+    category, article = models
+    assert category._meta.verbose_name_plural == "categories"
+    assert category._meta.ordering == ["name"]
+    assert category._meta.indexes[0].fields == ["name", "created"]
+    assert [f.name for f in category._meta.concrete_fields] == ["id", "created", "name"]
+    assert article._meta.verbose_name == "article"
+    assert article._meta.get_field("category").related_model is category
+    assert article._meta.get_field("owner").related_model.__name__ == "AUTH_USER_MODEL"
+    assert article._meta.get_field("parent").related_model is article
+    assert [r.get_accessor_name() for r in category._meta.related_objects] == ["articles"]
+
+
+def test_static_classes_match_get_classes():
+    static_classes = static.get_static_classes(TESTAPP_MODELS)
+    assert [c[:3] for c in static_classes] == [c[:3] for c in get_classes(testapp.models)]
+    book = [c[3] for c in static_classes if c[0] == "Book"][0]
+    event = [c[3] for c in static_classes if c[0] == "Event"][0]
+    assert get_queryset_relations(book) == (["author"], ["tags"])
+    assert get_queryset_relations(book, max_depth=2) == (["author__publisher"], ["tags"])
+    assert get_cursor_ordering(event) == "-created"
+    assert get_last_modified_field(book) == "updated"
+
+
+def test_write_views_static(tmp_path):
+    views_path = os.path.join(tmp_path, "views.py")
+    write_views(static.get_static_classes(TESTAPP_MODELS), views_path, "testapp", relation_depth=1)
+    with open(views_path) as f:
+        assert "queryset = Book.objects.select_related('author').prefetch_related('tags')" in f.read()
+
+
+def test_workflow_static_does_not_setup_django(tmp_path):
+    with open(os.path.join(tmp_path, "models.py"), "w") as f:
+        f.write(SOURCE)
+    with patch("django_rest_gen.apigen.setup_django") as mock_setup:
+        workflow(python_path=str(tmp_path), app_path=str(tmp_path), settings_fpath=None, overwrite=False,
+                 dummy=False, static=True)
+        mock_setup.assert_not_called()
+    with open(os.path.join(tmp_path, "urls.py")) as f:
+        assert "path('categories/', views.CategoryList.as_view(), name='category-list')" in f.read()
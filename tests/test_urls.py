@@ -19,22 +19,21 @@ def test_write_urls_empty_true(mock_dependencies):
     app_path = "/path/to/app"
     urls_path = "/path/to/app/urls.py"
 
-    with patch('builtins.open', mock_open()) as mocked_file:
+    with patch('django_rest_gen.render.write_file') as mock_write_file:
         django_rest_gen.utils.empty_fpath.return_value = True
         write_urls(classes, app_path, urls_path)
 
-        # Ensure the file is opened correctly for appending
-        mocked_file.assert_called_once_with(urls_path, "a")
-        handle = mocked_file()
-
-        # Verify content written to the file
+        # Verify the whole content is written to the file at once
         expected_content = (
+            "from app.models import *\n"
+            "from app import views\n"
+            "from django.urls import path, re_path, include\n\n"
             "urlpatterns = [\n"
             "path('url/', views.view_name),\n"
             "\tpath('', views.api_root)\n"
             "]"
         )
-        handle.write.assert_called_once_with(expected_content)
+        mock_write_file.assert_called_once_with(urls_path, expected_content, write=True, diff=False)
 
 
 def test_write_urls_empty_false(mock_dependencies, capsys):
@@ -1,6 +1,7 @@
+import os
 import pytest
 from unittest.mock import mock_open, patch, call
-from django_rest_gen.apigen import write_class_view, write_views, add_views_imports, get_app_name
+from django_rest_gen.apigen import write_class_view, write_views, get_app_name, get_views_imports, get_root_view
 
 
 def test_write_class_view_prints_correctly():
@@ -72,9 +73,8 @@ def app_path():
 # Test the function with typical inputs
 def test_write_views(classes, views_path, app_path):
     with (patch('django_rest_gen.utils.empty_fpath') as mock_empty,
-          patch('django_rest_gen.apigen.write_root_view') as mock_write_root_view,
-          patch('django_rest_gen.apigen.add_views_imports') as mock_add_imports,
-          patch('django_rest_gen.apigen.write_class_view') as mock_write_view):
+          patch('django_rest_gen.apigen.get_class_view', return_value="") as mock_class_view,
+          patch('django_rest_gen.render.write_file') as mock_write_file):
 
         # Setup mock returns
         mock_empty.return_value = True
@@ -85,32 +85,35 @@ def test_write_views(classes, views_path, app_path):
         # Check if empty_fpath was called correctly
         mock_empty.assert_called_once_with(fpath=views_path)
 
-        # Check if imports were added correctly
-        # mock_add_imports.assert_called_once_with(views_path=views_path, app_path=app_path, write=True)
-        mock_add_imports.assert_called_once_with(views_path=views_path, app_name=get_app_name(app_path), write=True)
+        assert mock_class_view.call_count == len(classes)
+        calls = [call(cls[0], model=None, relation_depth=0, pagination=None, page_size=100, max_page_size=1000,
+                      sparse=False, conditional=False, cache=False, cache_ttl=60, bulk=False, bulk_batch_size=500,
+                      filters=False, async_views=False, fast_list=False, export=False, export_chunk_size=2000,
+                      count_threshold=10000, batch=False, batch_max_size=100, replica=False)
+                 for cls in classes]
+        mock_class_view.assert_has_calls(calls, any_order=True)
 
-        assert mock_write_view.call_count == len(classes)
-        calls = [call(class_name=cls[0], fpath=views_path, write=True) for cls in classes]
-        mock_write_view.assert_has_calls(calls, any_order=True)
+        # The imports and the root view are written with the views at once
+        expected_content = get_views_imports(get_app_name(app_path), imports=[]) + get_root_view(classes)
+        mock_write_file.assert_called_once_with(views_path, expected_content, write=True, diff=False)
 
 
 # Test with no classes
 def test_write_view_empty(classes, views_path, app_path):
     with patch('django_rest_gen.utils.empty_fpath') as mock_empty, \
-            patch('django_rest_gen.apigen.add_views_imports') as mock_add_imports, \
-            patch('django_rest_gen.apigen.write_class_view') as mock_write_view:
+            patch('django_rest_gen.apigen.get_class_view') as mock_class_view, \
+            patch('django_rest_gen.render.write_file'):
         mock_empty.return_value = False
 
         # Setup the scenario where no classes are provided
         write_views([], views_path, app_path)
 
-        mock_write_view.assert_not_called()
+        mock_class_view.assert_not_called()
 
 
 # Test the function with typical inputs
 def test_add_views_imports_without_writing(monkeypatch, capfd):
-    with patch('django_rest_gen.utils.empty_fpath') as mock_empty, \
-            patch('django_rest_gen.apigen.write_class_view') as mock_write_view:
+    with patch('django_rest_gen.utils.empty_fpath') as mock_empty:
         # Setup mock returns
         mock_empty.return_value = False
 
@@ -131,36 +134,23 @@ def test_add_views_imports_without_writing(monkeypatch, capfd):
         assert "from my_app.serializers import *" in out
 
 
-def test_add_views_imports_with_writing(monkeypatch):
-    with patch('django_rest_gen.utils.empty_fpath') as mock_empty, \
-            patch('django_rest_gen.apigen.write_root_view') as mock_root, \
-            patch('django_rest_gen.apigen.write_class_view') as mock_write_view:
-        app_path = "/path/to/my_app"
-        views_path = "/path/to/my_app/views.py"
+def test_add_views_imports_with_writing(tmp_path):
+    app_path = os.path.join(tmp_path, "my_app")
+    os.mkdir(app_path)
+    views_path = os.path.join(app_path, "views.py")
 
-        # Setup a mock for the open function
-        m = mock_open(read_data="Existing content")
-        monkeypatch.setattr("builtins.open", m)
+    # Call the function with an empty file
+    write_views([], views_path, app_path)
 
-        # Call the function with `write` set to True
-        write_views([], views_path, app_path)
-
-        # Check if open was called correctly
-        m.assert_called_with(views_path, "a")  # If open could be called multiple times, use assert_called_with
-
-        # Get the mock file handle
-        handle = m()
-        expected_output = (
-            "from my_app.models import *\n"
-            "from my_app.serializers import *\n"
-            "from rest_framework.decorators import api_view\n"
-            "from rest_framework.response import Response\n"
-            "from rest_framework.reverse import reverse\n"
-            "from rest_framework import generics\n\n"
-        )
-        # Check the actual arguments passed to handle.write()
-        actual_write_calls = handle.write.call_args_list
-        assert actual_write_calls == [call(expected_output)]
-
-        # Optionally, check for the number of write operations
-        assert handle.write.call_count == 1
+    expected_output = (
+        "from my_app.models import *\n"
+        "from my_app.serializers import *\n"
+        "from rest_framework.decorators import api_view\n"
+        "from rest_framework.response import Response\n"
+        "from rest_framework.reverse import reverse\n"
+        "from rest_framework import generics\n\n"
+    )
+    with open(views_path) as f:
+        assert f.read() == expected_output + get_root_view([])
+    # The temporary file replaced the target
+    assert os.listdir(app_path) == ["views.py"]